@@ -1,16 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.services.video2audio import process_youtube_video
-from app.services.audio2text import AudioTranslator, process_audio_from_videos
-from app.services.summarize import summarizer
-from app.services.TextViz import generate_wordcloud, extract_nouns_from_text, generate_treemap_with_squarify
-from app.services.comment_analyzer import visualize_sentiment_analysis, get_sentiment_df
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session, joinedload
+from app.services.comment_analyzer import get_video_id, sentiment_chart_spec
+from app.services.comment_store import load_sentiment_df
+from app.services.result_cache import lookup_cached_result, serialize_result
+from app.services.analysis_store import analysis_blob_path, analysis_etag, content_hash, read_analysis_image
+from app.services.chart_cache import chart_cache
+from app.services.jobs import job_manager, QueueFullError
+from app.services.pipeline import run_comment_refresh
+from app.services.renderer import render_charts
+from app.services.model_registry import whisper_registry
+from app.services.sentiment_cache import sentiment_cache
+from app.services.TextViz import generate_treemap_with_squarify, generate_wordcloud
+from app.core.config import settings
 from app.models import schemas
-from app.core.database import get_db
+from app.core.database import run_read
 from app.models.models import Video, Analysis
 import sys
 import os
-import openai
 import base64
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
@@ -33,139 +42,314 @@ verify_environment()
 
 router = APIRouter()
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+def _load_cached_result(youtube_id: str):
+    def load(db: Session):
+        cached = lookup_cached_result(db, youtube_id, settings.RESULT_CACHE_TTL_SECONDS)
+        return serialize_result(cached, cached=True) if cached is not None else None
+    return load
+
+
+async def _submit_job(url: str, force: bool):
+    youtube_id = get_video_id(url)
+    if not youtube_id:
+        raise HTTPException(status_code=400, detail="올바른 YouTube URL이 아닙니다.")
+
+    if not force:
+        cached = await run_read(_load_cached_result(youtube_id))
+        if cached is not None:
+            logger.info(f"Cache hit for video {youtube_id}")
+            return job_manager.complete(url, youtube_id, cached)
 
-@router.get("/summarize")
-async def get_summary(url: str, db:Session = Depends(get_db)):
     try:
-        logger.info(f"Processing URL: {url}")
+        job = job_manager.submit(url, youtube_id)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    logger.info(f"Queued job {job.id} for video {youtube_id}")
+    return job
 
-        backend_dir = os.path.normpath(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-        video_dir = os.path.normpath(os.path.join(backend_dir, "video"))
+@router.post("/jobs", status_code=202)
+async def create_job(request: schemas.JobRequest):
+    job = await _submit_job(request.url, request.force)
+    return job.to_dict()
 
-        os.makedirs(video_dir, exist_ok=True)
 
-        audio_file_path = await process_youtube_video(url)
-        print(f"Video processed successfully: {audio_file_path}")
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없음")
+    return job.to_dict()
 
-        audio_path = os.path.normpath(os.path.join(backend_dir, audio_file_path))
-        print(f"Using audio path: {audio_path}")
 
-        if not os.path.exists(audio_path):
-            print(f"File not found at: {audio_path}")
-            print(f"Directory contents: {os.listdir(os.path.dirname(audio_path))}")
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+@router.get("/metrics/models")
+async def get_model_metrics():
+    return whisper_registry.metrics()
 
-        await process_audio_from_videos([audio_path])
-        print("Audio translated successfully")
 
-        text_path = os.path.normpath(os.path.join(video_dir, "all_text.txt"))
-        with open(text_path, "r", encoding="utf-8") as f:
-            text = f.readline()
+@router.get("/metrics/sentiment-cache")
+async def get_sentiment_cache_metrics():
+    return sentiment_cache.stats()
 
-        model = summarizer()
-        query = """당신은 동영상의 Script를 읽고 요약문을 작성하는 Agent입니다. 주어지는 text를 읽고 동영상의 내용을 500자 이내로 요약하세요.
-                                출력 형식은
-                                [간단 요약]
-                                [핵심 내용]
-                                [중요 포인트]
-                                입니다."""
-        simple, core, point = await model.generate(text, query)
 
-        video = Video(
-            youtube_link=url,
-            simple_summary=simple,
-            core_summary=core,
-            point_summary=point
-        )
-        db.add(video)
-        db.commit()
-        db.refresh(video)
-
-        text_path = os.path.normpath(os.path.join(video_dir, "all_text.txt"))
-        nouns = extract_nouns_from_text(text_path)
-        sentiment_df = get_sentiment_df(url)
-
-        visualizations = {
-            'wordcloud': generate_wordcloud(nouns),
-            'tree': generate_treemap_with_squarify(nouns),
-            'sentiment': visualize_sentiment_analysis(sentiment_df),
-        }
+@router.get("/metrics/chart-cache")
+async def get_chart_cache_metrics():
+    return chart_cache.stats()
 
-        for viz_type, image_data in visualizations.items():
-            if not image_data:
-                logger.warning(f"No image data generated for {viz_type}")
-                continue
 
-            analysis = Analysis(
-                video_id=video.id,
-                analysis_type=viz_type,
-                image_data=image_data,
-                image_format='png'
-            )
-            db.add(analysis)
+@router.post("/videos/{video_id}/comments/refresh")
+async def refresh_comments(video_id: int):
+    """마지막 수집 이후 새로 달린 댓글만 가져와 분류하고 감정 집계와 차트를 갱신합니다."""
+    try:
+        result = await run_in_threadpool(run_comment_refresh, video_id)
+    except Exception as e:
+        logger.error(f"Error refreshing comments for video {video_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="영상을 찾을 수 없음")
+    return result
 
-        db.commit()
 
-        print("Summary and visualizations generated successfully")
+@router.get("/summarize")
+async def get_summary(url: str, force: bool = False):
+    """기존 클라이언트 호환용: 작업을 제출하고 완료될 때까지 이벤트 루프를 막지 않고 기다립니다."""
+    job = await _submit_job(url, force)
+    if job.future is None:
+        return job.result
 
-        return {"simple": simple, "core": core, "point": point, "video_id": video.id}
+    try:
+        return await asyncio.wrap_future(job.future)
     except Exception as e:
         logger.error(f"Error processing URL {url}: {str(e)}")
-        print(f"Current working directory: {os.getcwd()}")
-        print(f"Error details: {str(e)}")
-        print(f"Video directory exists: {os.path.exists(video_dir)}")
-        if os.path.exists(video_dir):
-            print(f"Video directory contents: {os.listdir(video_dir)}")
         raise HTTPException(
             status_code=500, 
             detail=str(e)
         )
 
+ANALYSIS_TYPES = ["wordcloud", "sentiment", "tree"]
+
+
+@router.get("/videos/{video_id}/analysis/{analysis_type}.png")
+async def get_analysis_image(video_id: int, analysis_type: str, request: Request, v: str = None):
+    """
+    분석 이미지를 PNG 바이트 그대로 내려줍니다. ETag로 304 재검증을 지원하며,
+    ?v=<content hash>로 버전이 고정된 URL은 immutable로 캐시할 수 있습니다.
+    """
+    if analysis_type not in ANALYSIS_TYPES:
+        raise HTTPException(status_code=400, detail="유효하지 않은 분석 타입")
+
+    def load(db: Session):
+        analysis = db.query(Analysis)\
+            .filter(Analysis.video_id == video_id, Analysis.analysis_type == analysis_type)\
+            .order_by(Analysis.id.desc())\
+            .first()
+        if not analysis:
+            return None
+        blob_path = analysis_blob_path(analysis)
+        content = None if blob_path is not None else read_analysis_image(analysis)
+        return analysis_etag(analysis), analysis.image_format, blob_path, content
+
+    found = await run_read(load)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"{analysis_type}를 찾을 수 없음")
+    content_hash, image_format, blob_path, content = found
+
+    etag = f'"{content_hash}"'
+    if v is not None and f'"{v}"' == etag:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        # 버전 없는 URL은 같은 주소에서 이미지가 다시 생성될 수 있으므로 매번 재검증합니다
+        cache_control = "no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    media_type = f"image/{image_format}"
+    if blob_path is not None:
+        # 파일 응답은 서버가 지원하면 sendfile(zero-copy)로 전송됩니다
+        return FileResponse(blob_path, media_type=media_type, headers=headers)
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get("/videos/{video_id}/bundle")
+async def get_video_bundle(video_id: int):
+    """
+    한 영상의 요약 3종과 분석 이미지 메타데이터/URL을 한 번의 조회로 반환합니다.
+    analysis는 idx_video_analysis를 타는 JOIN으로 함께 읽고, 이미지 본문 열은 읽지 않습니다.
+    """
+    def load(db: Session):
+        video = db.query(Video)\
+            .options(joinedload(Video.analysis).defer(Analysis.image_data))\
+            .filter(Video.id == video_id)\
+            .first()
+        if not video:
+            return None
+
+        analysis = {}
+        for item in sorted(video.analysis, key=lambda item: item.id):
+            analysis_type = getattr(item.analysis_type, "value", item.analysis_type)
+            url = f"/videos/{video.id}/analysis/{analysis_type}.png"
+            analysis[analysis_type] = {
+                "url": f"{url}?v={item.content_hash}" if item.content_hash else url,
+                "format": item.image_format,
+                "content_hash": item.content_hash,
+                "size": item.size,
+                "created_at": item.created_at,
+            }
+
+        return {
+            "video_id": video.id,
+            "youtube_id": video.youtube_id,
+            "url": video.youtube_link,
+            "summaries": {
+                "simple": video.simple_summary,
+                "core": video.core_summary,
+                "point": video.point_summary,
+            },
+            "sentiment_counts": video.sentiment_counts,
+            "analysis": analysis,
+            "updated_at": video.updated_at or video.created_at,
+        }
+
+    bundle = await run_read(load)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="영상을 찾을 수 없음")
+    return bundle
+
+
+async def _render_from_noun_counts(video_id: int, chart: str, request: Request, render, *params):
+    """
+    저장된 명사 빈도표로 차트를 다시 그립니다. 결과는 (영상, 차트, 빈도표 버전, 파라미터) 키로 LRU 캐시에 두며
+    영상이 다시 분석되면 summarized_at이 바뀌어 새 키로 그려집니다.
+    """
+    def load(db: Session):
+        return db.query(Video.noun_counts, Video.summarized_at, Video.created_at)\
+            .filter(Video.id == video_id)\
+            .first()
+
+    found = await run_read(load)
+    if found is None:
+        raise HTTPException(status_code=404, detail="영상을 찾을 수 없음")
+    noun_counts, summarized_at, created_at = found
+    if not noun_counts:
+        raise HTTPException(status_code=404, detail="명사 빈도표를 찾을 수 없음")
+
+    version = (summarized_at or created_at).isoformat()
+    key = (video_id, chart, version) + params
+    image = chart_cache.get(key)
+    if image is None:
+        counts = {noun: count for noun, count in noun_counts}
+        image = (await run_in_threadpool(render_charts, {chart: (render, counts, *params)}))[chart]
+        if not image:
+            raise HTTPException(status_code=404, detail=f"{chart}를 그릴 명사가 없음")
+        chart_cache.put(key, image)
+
+    # 같은 URL이라도 재분석 후에는 내용이 바뀌므로 매번 ETag로 재검증합니다
+    headers = {"ETag": f'"{content_hash(image)}"', "Cache-Control": "no-cache"}
+    if headers["ETag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=image, media_type="image/png", headers=headers)
+
+
+@router.get("/videos/{video_id}/wordcloud")
+async def get_wordcloud(
+    video_id: int,
+    request: Request,
+    w: int = Query(480, ge=64, le=2048),
+    h: int = Query(480, ge=64, le=2048),
+    top: int = Query(100, ge=1, le=500),
+):
+    """저장된 명사 빈도표로 요청한 크기/단어 수의 워드클라우드를 그립니다. NLP는 다시 실행하지 않습니다."""
+    return await _render_from_noun_counts(video_id, "wordcloud", request, generate_wordcloud, w, h, top)
+
+
+@router.get("/videos/{video_id}/treemap")
+async def get_treemap(video_id: int, request: Request, top: int = Query(20, ge=1, le=100)):
+    """저장된 명사 빈도표로 상위 top개 명사의 트리맵을 그립니다."""
+    return await _render_from_noun_counts(video_id, "tree", request, generate_treemap_with_squarify, top)
+
+
+@router.get("/videos/{video_id}/sentiment/spec")
+async def get_sentiment_spec(video_id: int):
+    """저장된 댓글로 감정 산점도의 Plotly JSON spec을 만들어 반환합니다. 프론트엔드가 직접 렌더링합니다."""
+    def load(db: Session):
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if not video:
+            return None
+        try:
+            return load_sentiment_df(db, video)
+        except ValueError:
+            return None
+
+    df = await run_read(load)
+    if df is None:
+        raise HTTPException(status_code=404, detail="댓글을 찾을 수 없음")
+    return await run_in_threadpool(sentiment_chart_spec, df)
+
+
 @router.get("/more/{analysis_type}")
-async def get_analysis(analysis_type: str, db:Session = Depends(get_db)):
-    valid_types = ["wordcloud", "sentiment", "treemap"]
+async def get_analysis(analysis_type: str, video_id: int = None):
+    """호환용 JSON 경로: 분석 이미지를 data URL로 반환합니다. video_id가 없으면 가장 최근 영상의 결과입니다."""
+    valid_types = ANALYSIS_TYPES + ["treemap"]
     if analysis_type not in valid_types:
         raise HTTPException(status_code=400, detail="유효하지 않은 분석 타입")
+    if analysis_type == "treemap":
+        analysis_type = "tree"
     
+    def load(db: Session):
+        query = db.query(Analysis).filter(Analysis.analysis_type == analysis_type)
+        if video_id is not None:
+            query = query.filter(Analysis.video_id == video_id)
+        analysis = query.order_by(Analysis.video_id.desc()).first()
+        if not analysis:
+            return None
+        return analysis.image_format, read_analysis_image(analysis)
+
     try:
-        analysis = db.query(Analysis)\
-            .filter(Analysis.analysis_type == analysis_type)\
-            .order_by(Analysis.video_id.desc())\
-            .first()
+        found = await run_read(load)
     
-        if not analysis:
+        if not found:
             raise HTTPException(status_code=404, detail=f"{analysis_type}를 찾을 수 없음")
         
-        image_base64 = base64.b64encode(analysis.image_data).decode('utf-8')
+        image_format, image_data = found
+        image_base64 = base64.b64encode(image_data).decode('utf-8')
 
         return {
-            "image_data": f"data:image/{analysis.image_format};base64, {image_base64}"
+            "image_data": f"data:image/{image_format};base64,{image_base64}"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.get("/more/summary/{summary_type}")
-async def get_summary_by_type(summary_type:str, db: Session = Depends(get_db)):
+async def get_summary_by_type(summary_type:str, video_id: int = None):
+    def load(db: Session):
+        query = db.query(Video)
+        if video_id is not None:
+            query = query.filter(Video.id == video_id)
+        video = query.order_by(Video.id.desc()).first()
+        if not video:
+            return None
+        return {"summary": getattr(video, f"{summary_type}_summary")}
+
     try:
         if summary_type not in ["simple", "core", "point"]:
             raise HTTPException(status_code=400, detail="Unvalid summary type")
         
-        video = db.query(Video)\
-            .order_by(Video.id.desc())\
-            .first()
+        summary = await run_read(load)
         
-        if not video:
+        if not summary:
             raise HTTPException(status_code=404, detail="Cannot find summary information")
         
-        summary_field = f"{summary_type}_summary"
-
-        if not hasattr(video, summary_field):
-            raise HTTPException(status_code=404, detail=f"{summary_type} type is not found")
-        
-        return {
-            "summary": getattr(video, summary_field)
-        }
+        return summary
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -5,15 +5,127 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:5173"
     API_V1_STR: str = "/api/v1"
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+
+    # 공유 LLM 클라이언트: 연결 풀 크기, 동시 요청 수 제한, 요청별 타임아웃(초)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_TIMEOUT_SECONDS: float = 60.0
 
     DB_USER: str = "postgres"
-    DB_PASSWORD: str
+    DB_PASSWORD: str = ""
     DB_HOST: str = "localhost"
     DB_PORT: str = "5432"
     DB_NAME: str = "youtube_analysis"
+    # 설정하면 DB_* 대신 이 URL을 사용 (예: 테스트용 sqlite:///./test.db)
+    SQLALCHEMY_DATABASE_URL: Optional[str] = None
+
+    # 커넥션 풀 (SQLite에는 적용하지 않음)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 30 * 60
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+    # 조회 API에 async 엔진(asyncpg/aiosqlite) 사용
+    DB_ASYNC_READS: bool = False
+
+    # 결과 캐시: 같은 YouTube 영상에 대한 요청은 저장된 결과를 재사용 (초 단위, 0이면 만료 없음)
+    RESULT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+    # 작업 디렉토리: 요청마다 WORKSPACE_ROOT 아래에 독립된 디렉토리를 만들고 작업 후 삭제
+    WORKSPACE_ROOT: Optional[str] = None
+    KEEP_WORKSPACE: bool = False
+
+    # 시각화 이미지 blob 저장소 경로 (기본: backend/blobs)
+    BLOB_STORE_ROOT: Optional[str] = None
+    # 참조되지 않는 blob 정리: 작업 저장 후 이 간격(초)마다 한 번 스윕(0이면 끔),
+    # 최근 grace 초 안에 쓰이거나 재사용된 파일은 아직 커밋되지 않은 행의 것일 수 있으므로 남김
+    BLOB_GC_INTERVAL_SECONDS: int = 60 * 60
+    BLOB_GC_GRACE_SECONDS: int = 60 * 60
+
+    # 작업 큐: 파이프라인은 워커 풀(thread 또는 process)에서 실행되며 대기열이 가득 차면 429를 반환
+    JOB_EXECUTOR: str = "thread"
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_SIZE: int = 8
+    JOB_RETENTION_SECONDS: int = 60 * 60
+    # 캐시 적중으로 바로 완료된 작업은 응답 직후 한 번 조회되는 정도이므로 짧게 보관
+    JOB_CACHED_RETENTION_SECONDS: int = 5 * 60
+
+    # 프레임 분석이 필요할 때만 영상 전체를 받고, 기본은 오디오 스트림만 받음
+    EXTRACT_FRAMES: bool = False
+    # 디코딩한 PCM이 이 길이(초)를 넘으면 작업 디렉토리의 raw PCM 파일로 넘겨 메모리 매핑
+    AUDIO_SPILL_AFTER_SECONDS: float = 20 * 60
+    # ffmpeg 디코딩 제한 시간(초). 손상된 입력에서 워커가 무한히 멈추지 않도록 합니다
+    AUDIO_DECODE_TIMEOUT_SECONDS: float = 30 * 60
+
+    # 키프레임 추출: 초당 샘플링 수, 장면 전환 임계값(0~1, 미설정 시 단순 샘플링), 최대 저장 수
+    FRAME_SAMPLE_FPS: float = 1.0
+    FRAME_SCENE_THRESHOLD: Optional[float] = None
+    FRAME_MAX_COUNT: int = 300
+
+    # Whisper 모델 레지스트리: 프로세스당 모델 크기별로 한 번 로드해 최대 WHISPER_POOL_SIZE개 인스턴스를 공유
+    WHISPER_MODEL: str = "base"
+    WHISPER_DEVICE: Optional[str] = None
+    WHISPER_POOL_SIZE: int = 1
+    WHISPER_WARMUP: bool = False
+
+    # 무거운 의존성은 단계별로 처음 쓸 때 import합니다. 시작 시 미리 불러올 단계 (예: "transcribe,analyze" 또는 "all")
+    WARMUP_STAGES: str = ""
+
+    # 전사 방식: single(파일 전체를 한 번에) 또는 chunked(무음 기준으로 나눠 프로세스 풀에서 병렬 전사)
+    TRANSCRIBE_MODE: str = "single"
+    TRANSCRIBE_WORKERS: Optional[int] = None
+    VAD_CHUNK_SECONDS: float = 60.0
+    VAD_MAX_CHUNK_SECONDS: float = 120.0
+    VAD_MIN_SILENCE_MS: int = 300
+    VAD_MIN_CHUNK_SECONDS: float = 5.0
+
+    # 자막 우선 전사: 업로드/자동 생성 자막이 있고 품질 기준을 통과하면 Whisper를 건너뜀
+    CAPTIONS_ENABLED: bool = True
+    CAPTION_LANGUAGES: str = "ko"
+    CAPTION_MIN_CHARS_PER_MINUTE: int = 60
+
+    # 긴 Script 요약: 청크당 최대 토큰 수를 넘으면 map-reduce로 나눠 동시에 요약
+    SUMMARY_CHUNK_TOKENS: int = 6000
+    SUMMARY_CONCURRENCY: int = 4
+
+    # 댓글 감정 분석 배치: 요청 하나에 담을 최대 토큰/댓글 수, 누락 항목 재시도 횟수
+    SENTIMENT_BATCH_TOKENS: int = 3000
+    SENTIMENT_BATCH_SIZE: int = 50
+    SENTIMENT_MAX_RETRIES: int = 2
+
+    # 감정 분석 백엔드: llm, local(로컬 TF-IDF 모델), hybrid(로컬 신뢰도가 낮은 댓글만 LLM으로)
+    SENTIMENT_BACKEND: str = "llm"
+    SENTIMENT_MODEL_PATH: Optional[str] = None
+    SENTIMENT_CONFIDENCE_THRESHOLD: float = 0.6
+    # 댓글 텍스트 해시 기준 감정 분석 결과 캐시 (sentiment_cache 테이블 + 프로세스 내 LRU)
+    SENTIMENT_CACHE_ENABLED: bool = True
+
+    # 댓글 수집: 페이지를 따라가며 최대 COMMENT_LIMIT개, COMMENT_BATCH_SIZE개씩 감정 분석
+    COMMENT_LIMIT: int = 1000
+    COMMENT_INCLUDE_REPLIES: bool = False
+    COMMENT_BATCH_SIZE: int = 200
+
+    # 차트 렌더링 프로세스 수 (Agg 백엔드, 한 영상의 차트를 병렬로 그림). 0이면 작업 스레드에서 차례로 렌더링
+    RENDER_WORKERS: int = 3
+
+    # 감정 산점도 PNG 렌더러: matplotlib(Agg, 기본) 또는 plotly(kaleido 내보내기)
+    SENTIMENT_CHART_RENDERER: str = "matplotlib"
+
+    # Kiwi 형태소 분석 스레드 수 (0이면 CPU 코어 수만큼)
+    KIWI_WORKERS: int = 0
+    # 영상마다 저장하는 명사 빈도표 크기 (상위 N개)
+    NOUN_TABLE_SIZE: int = 500
+
+    # 저장된 빈도표로 다시 그린 차트(크기/top 별 변형)의 프로세스 내 LRU 캐시 한도
+    CHART_CACHE_MAX_ENTRIES: int = 256
+    CHART_CACHE_MAX_MB: int = 64
 
     @property
     def DATABASE_URL(self) -> str:
+        if self.SQLALCHEMY_DATABASE_URL:
+            return self.SQLALCHEMY_DATABASE_URL
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     class Config:
@@ -1,15 +1,79 @@
+import logging
+from typing import Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def engine_options(url) -> dict:
+    """URL 종류에 맞는 create_engine 옵션. SQLite는 풀 설정 대신 스레드 간 공유만 허용합니다."""
+    options = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def async_database_url(url):
+    """동기 드라이버 URL을 async 드라이버(asyncpg/aiosqlite) URL로 바꿉니다."""
+    drivers = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+    return url.set(drivername=drivers.get(url.get_backend_name(), url.drivername))
+
+
+database_url = make_url(settings.DATABASE_URL)
+logger.info(f"Using database {database_url.render_as_string(hide_password=True)}")
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(database_url, **engine_options(database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = None
+if settings.DB_ASYNC_READS:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_url = async_database_url(database_url)
+    options = engine_options(async_url)
+    options.pop("connect_args", None)
+    async_engine = create_async_engine(async_url, **options)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
-        print(f"Connecting to database: {settings.DATABASE_URL}")
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def run_read(fn: Callable[[Session], T]) -> T:
+    """
+    조회 함수 fn(session)을 이벤트 루프를 막지 않고 실행합니다. DB_ASYNC_READS가 켜져 있으면
+    async 엔진 위에서(AsyncSession.run_sync), 아니면 스레드 풀에서 동기 세션으로 실행합니다.
+    fn은 세션이 닫힌 뒤에도 쓸 수 있는 값(dict, 튜플 등)을 반환해야 합니다.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(fn)
+
+    def run_sync():
+        db = SessionLocal()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(run_sync)
@@ -5,6 +5,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.core.config import settings
 from app.api.endpoints import router
+from app.services.audio2text import shutdown_chunk_pool
+from app.services.jobs import job_manager
+from app.services.llm_client import llm_client
+from app.services.model_registry import warm_whisper_models
+from app.services.renderer import shutdown_render_pool
+from app.services.warmup import warm_configured_imports
 
 app = FastAPI(title="Sumclip API")
 
@@ -16,4 +22,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(router=router)
\ No newline at end of file
+app.include_router(router=router)
+
+@app.on_event("startup")
+def warm_models():
+    # process executor의 워커는 각자 initializer에서 모델을 로드합니다
+    if job_manager.executor_kind == "thread":
+        warm_configured_imports()
+        warm_whisper_models()
+
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    job_manager.shutdown()
+    shutdown_chunk_pool()
+    shutdown_render_pool()
+    llm_client.close()
@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, LargeBinary, Text, DateTime, ForeignKey, Enum\
-                        ,Index
+                        ,Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+import enum
 
 Base = declarative_base()
 
@@ -11,14 +12,23 @@ class Video(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     youtube_link = Column(String, unique=True, index=True, nullable=False)
+    youtube_id = Column(String(11), unique=True, index=True)
     created_at = Column(DateTime, default=datetime.now, index=True)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # 요약을 마지막으로 만든 시각. 댓글 갱신 등 다른 변경에도 바뀌는 updated_at 대신 결과 캐시 TTL의 기준이 됩니다
+    summarized_at = Column(DateTime, default=datetime.now)
     simple_summary = Column(Text)
     core_summary = Column(Text)
     point_summary = Column(Text)
     # summary = Column(Text)
+    sentiment_counts = Column(JSON)
+    # 명사 빈도표 [[명사, 빈도], ...] (빈도 내림차순, 상위 NOUN_TABLE_SIZE개). 차트를 NLP 재실행 없이 다시 그릴 때 사용
+    noun_counts = Column(JSON)
+    comments_refreshed_at = Column(DateTime)
     analysis = relationship("Analysis", back_populates="video")
+    comments = relationship("Comment", back_populates="video")
 
-class AnalysisType(str, Enum):
+class AnalysisType(str, enum.Enum):
     WORDCLOUD="wordcloud"
     SENTIMENT = "sentiment"
     TREE = "tree"
@@ -28,10 +38,41 @@ class Analysis(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     video_id = Column(Integer, ForeignKey("videos.id"), nullable=False)
-    analysis_type = Column(Enum(AnalysisType), nullable=False)
-    image_data = Column(LargeBinary, nullable=False)
+    # DB에는 멤버 이름이 아닌 값("wordcloud" 등)을 저장해 문자열로 바로 조회할 수 있게 합니다
+    analysis_type = Column(
+        Enum(AnalysisType, name="analysistype", values_callable=lambda members: [member.value for member in members]),
+        nullable=False,
+    )
+    # 예전 행만 이미지를 직접 담고 있고, 새 행은 blob 저장소의 content_hash만 가집니다
+    image_data = Column(LargeBinary, nullable=True)
     image_format = Column(String, nullable=False)
+    content_hash = Column(String(64), index=True)
+    size = Column(Integer)
     created_at = Column(DateTime, default=datetime.now, index=True)
     video = relationship("Video", back_populates="analysis")
     
-Index('idx_video_analysis', Analysis.video_id, Analysis.analysis_type)
\ No newline at end of file
+Index('idx_video_analysis', Analysis.video_id, Analysis.analysis_type)
+
+class Comment(Base):
+    __tablename__ = "comments"
+
+    comment_id = Column(String, primary_key=True)
+    video_id = Column(Integer, ForeignKey("videos.id"), nullable=False)
+    parent_id = Column(String)
+    text = Column(Text, nullable=False)
+    likes = Column(Integer, default=0)
+    author = Column(String)
+    published_at = Column(DateTime, nullable=False)
+    sentiment = Column(String)
+    fetched_at = Column(DateTime, default=datetime.now)
+    video = relationship("Video", back_populates="comments")
+
+Index('idx_comment_video_published', Comment.video_id, Comment.published_at)
+
+class SentimentCache(Base):
+    __tablename__ = "sentiment_cache"
+
+    text_hash = Column(String(64), primary_key=True)
+    model_version = Column(String, primary_key=True)
+    sentiment = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
\ No newline at end of file
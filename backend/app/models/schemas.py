@@ -3,6 +3,9 @@ from pydantic import BaseModel, HttpUrl
 class VideoRequest(BaseModel):
     url: str
 
+class JobRequest(VideoRequest):
+    force: bool = False
+
 class SummaryResponse(BaseModel):
     summary: str
     status: str = "success"
\ No newline at end of file
@@ -1,93 +1,139 @@
 import re
 from collections import Counter, defaultdict
-
-import koreanize_matplotlib
-import matplotlib.pyplot as plt
-import networkx as nx
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns
+from functools import lru_cache
 import io
-import base64
 import os
-from PIL import Image
 
-from kiwipiepy import Kiwi
-from kiwipiepy.utils import Stopwords
-from wordcloud import WordCloud
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_kiwi():
+    """
+    Kiwi 형태소 분석기를 처음 사용할 때 한 번만 만들어 반환합니다.
+    여러 문장을 한 번에 넘기면 num_workers개 스레드로 분석합니다.
+    """
+    from kiwipiepy import Kiwi
+
+    return Kiwi(num_workers=settings.KIWI_WORKERS)
+
+
+@lru_cache(maxsize=None)
+def get_stopwords():
+    from kiwipiepy.utils import Stopwords
+
+    return Stopwords()
+
+
+@lru_cache(maxsize=None)
+def load_fonts():
+    """
+    matplotlib을 Agg(headless) 백엔드로 두고 FONT_PATH 글꼴을 등록해 기본 글꼴로 지정합니다.
+    프로세스당 한 번만 실행되며 등록한 글꼴 이름을 반환합니다.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+
+    font_manager.fontManager.addfont(FONT_PATH)
+    font_name = font_manager.FontProperties(fname=FONT_PATH).get_name()
+    matplotlib.rcParams["font.family"] = font_name
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    return font_name
 
 
-# Kiwi 형태소 분석기 초기화
-kiwi = Kiwi()
+NOUN_TAGS = {"NNG", "NNP"}  # 일반 명사(NNG), 고유 명사(NNP)
 
 FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'statics', 'fonts', 'NANUMGOTHIC-REGULAR.TTF')
 
 def extract_nouns_from_text(file_path):
     """
-    주어진 텍스트 파일에서 명사만 추출하여 반환하는 함수
+    주어진 텍스트 파일에서 명사 빈도표(Counter)를 만들어 반환하는 함수
     """
     with open(file_path, "r", encoding="utf-8") as file:
-        text = file.read()
+        return count_nouns(file.read())
 
-    # 텍스트에서 문장 단위로 나누기
-    sentences = text.split("\n")
 
-    # 명사 추출
-    nouns = []
-    for sentence in sentences:
-        result = kiwi.analyze(sentence)
-        for item in result:
-            for morpheme in item[0]:
-                if morpheme[1] in {"NNG", "NNP"}:  # 일반 명사(NNG), 고유 명사(NNP)
-                    nouns.append(morpheme[0])
+def iter_texts(text_or_segments):
+    """
+    텍스트는 줄 단위로, Whisper segments(text 키를 가진 dict나 문자열 목록)는 세그먼트 단위로 나눠
+    비어 있지 않은 문자열을 내보냅니다.
+    """
+    if isinstance(text_or_segments, str):
+        texts = text_or_segments.splitlines()
+    else:
+        texts = (
+            segment["text"] if isinstance(segment, dict) else segment for segment in text_or_segments
+        )
+    for text in texts:
+        text = str(text).strip()
+        if text:
+            yield text
 
-    return nouns, sentences
+
+def count_nouns(text_or_segments):
+    """
+    메모리에 있는 텍스트(또는 segments)에서 명사 빈도표를 만듭니다.
+    줄/세그먼트들을 Kiwi의 멀티스레드 tokenize에 한 번에 넘기고(문장 분리는 tokenize가 함께 처리합니다),
+    불용어를 제외한 NNG/NNP를 길이와 관계없이 바로 Counter에 셉니다.
+    """
+    counts = Counter()
+    for tokens in get_kiwi().tokenize(iter_texts(text_or_segments), stopwords=get_stopwords()):
+        counts.update(token.form for token in tokens if token.tag in NOUN_TAGS)
+    return counts
 
 
-def generate_wordcloud(nouns):
+def generate_wordcloud(nouns, width=480, height=480, max_words=100):
     """
-    명사 리스트를 기반으로 워드클라우드를 생성하는 함수
+    명사 리스트 또는 빈도표(Counter/dict)를 기반으로 워드클라우드를 생성하는 함수
+    matplotlib을 거치지 않고 WordCloud가 그린 이미지를 그대로 PNG로 저장합니다.
     """
+    from wordcloud import WordCloud
+
     word_freq = Counter(nouns)
+    if not word_freq:
+        return b""
 
     # 워드클라우드 생성
     wordcloud = WordCloud(
         font_path=FONT_PATH,
         background_color="white",
-        width=480,
-        height=480,
-        max_words=100,
+        width=width,
+        height=height,
+        max_words=max_words,
         # colormap="Blues"
     ).generate_from_frequencies(word_freq)
 
-    # 워드클라우드 시각화
     img_buffer = io.BytesIO()
-    plt.figure(figsize=(10, 8))
-    plt.imshow(wordcloud, interpolation="bilinear")
-    plt.axis("off")
-    plt.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0)
-    plt.close()
+    wordcloud.to_image().save(img_buffer, format="PNG")
+    return img_buffer.getvalue()
 
-    return base64.b64encode(img_buffer.getvalue()).decode()
 
+def generate_treemap_with_squarify(nouns, top=20, figsize=(10, 8)):
+    """트리맵 생성 및 이미지 반환 (명사 리스트 또는 빈도표)"""
+    import squarify
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Rectangle
 
-def generate_treemap_with_squarify(nouns):
-    """트리맵 생성 및 이미지 반환"""
+    load_fonts()
     word_freq = Counter(nouns)
-    top_words = word_freq.most_common(20)
+    top_words = word_freq.most_common(top)
+    if not top_words:
+        return b""
     words, freqs = zip(*top_words)
 
     normalized_sizes = squarify.normalize_sizes(freqs, 100, 100)
     rects = squarify.squarify(normalized_sizes, 0, 0, 100, 100)
 
-    img_buffer = io.BytesIO()
-    fig, ax = plt.subplots(figsize=(10, 8))
-    colors = plt.cm.tab20c(range(len(rects)))
-    
+    # 전역 pyplot 상태를 쓰지 않는 Figure 객체라 스레드/프로세스 어디서 그려도 안전합니다
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    colors = colormaps["tab20c"](range(len(rects)))
+
     for i, rect in enumerate(rects):
         x, y, w, h = rect['x'], rect['y'], rect['dx'], rect['dy']
-        ax.add_patch(plt.Rectangle((x, y), w, h, color=colors[i]))
+        ax.add_patch(Rectangle((x, y), w, h, color=colors[i]))
         ax.text(
             x + w / 2, y + h / 2, words[i],
             ha="center", va="center", fontsize=13, color="black"
@@ -97,24 +143,17 @@ def generate_treemap_with_squarify(nouns):
     ax.set_ylim(0, 100)
     ax.set_aspect("equal")
     ax.axis("off")
-    plt.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0)
-    plt.close()
 
-    return base64.b64encode(img_buffer.getvalue()).decode()
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', bbox_inches='tight', pad_inches=0)
+    return img_buffer.getvalue()
 
 
 def main(file_path):
     # 텍스트에서 명사 추출
-    nouns = extract_nouns_from_text(file_path)
-    flat_nouns = [word for sublist in nouns for word in sublist]
-
-    # # 워드클라우드 생성
-    # generate_wordcloud(flat_nouns)
-
-    # # Squarify 트리맵 생성
-    # generate_treemap_with_squarify(flat_nouns)
+    noun_counts = extract_nouns_from_text(file_path)
 
     return {
-        'wordcloud': generate_wordcloud(flat_nouns),
-        'treemap': generate_treemap_with_squarify(flat_nouns)
+        'wordcloud': generate_wordcloud(noun_counts),
+        'treemap': generate_treemap_with_squarify(noun_counts)
     }
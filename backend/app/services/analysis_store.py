@@ -0,0 +1,76 @@
+import base64
+import binascii
+import hashlib
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.models import Analysis
+from app.services.blob_store import LocalBlobStore, blob_store
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def content_hash(image_data: bytes) -> str:
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def save_analysis(db: Session, video_id: int, analysis_type: str, image_data: bytes,
+                  image_format: str = "png", store: LocalBlobStore = blob_store) -> Analysis:
+    """
+    시각화 이미지를 blob 저장소에 넣고 해시/크기/형식만 가진 Analysis 행을 추가합니다.
+    같은 영상의 같은 타입 이전 결과는 삭제합니다.
+    """
+    digest, size = store.put(image_data)
+    db.query(Analysis)\
+        .filter(Analysis.video_id == video_id, Analysis.analysis_type == analysis_type)\
+        .delete(synchronize_session=False)
+    analysis = Analysis(
+        video_id=video_id,
+        analysis_type=analysis_type,
+        image_format=image_format,
+        content_hash=digest,
+        size=size,
+    )
+    db.add(analysis)
+    return analysis
+
+
+def replace_analyses(db: Session, video_id: int, images: dict, image_format: str = "png",
+                     store: LocalBlobStore = blob_store) -> list:
+    """
+    {분석 타입: 이미지 바이트}를 save_analysis로 한 번에 저장하며 커밋은 호출한 쪽 트랜잭션에 맡깁니다.
+    지워진 이전 결과의 blob은 blob_store.sweep_unreferenced_blobs가 정리합니다.
+    """
+    return [
+        save_analysis(db, video_id, analysis_type, image_data, image_format, store)
+        for analysis_type, image_data in images.items()
+    ]
+
+
+def analysis_blob_path(analysis: Analysis, store: LocalBlobStore = blob_store) -> Optional[str]:
+    """blob 저장소에 있는 이미지의 파일 경로. 이미지를 행에 직접 담은 예전 행은 None입니다."""
+    if analysis.image_data is None and analysis.content_hash:
+        return store.path_for(analysis.content_hash)
+    return None
+
+
+def read_analysis_image(analysis: Analysis, store: LocalBlobStore = blob_store) -> bytes:
+    """
+    저장된 이미지 바이트를 반환합니다. 예전 행은 image_data에 직접, 그중에서도 더 오래된 행은
+    base64 문자열로 저장되어 있으므로 PNG 시그니처가 없으면 base64로 디코딩해 돌려줍니다.
+    """
+    if analysis.image_data is None:
+        return store.get(analysis.content_hash)
+
+    data = bytes(analysis.image_data)
+    if analysis.image_format == "png" and not data.startswith(PNG_SIGNATURE):
+        try:
+            return base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            return data
+    return data
+
+
+def analysis_etag(analysis: Analysis) -> str:
+    return analysis.content_hash or content_hash(read_analysis_image(analysis))
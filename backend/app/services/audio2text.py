@@ -1,83 +1,196 @@
+import logging
+import multiprocessing
 import os
-from glob import glob
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
-import pandas as pd
-import whisper
-from pydub import AudioSegment
+import numpy as np
+from app.core.config import settings
+from app.services.audio_decode import SAMPLE_RATE, decode_audio
+from app.services.model_registry import whisper_registry
+from app.services.vad import split_on_silence
+from app.utils.workspace import JobWorkspace
 from .summarize import summarizer
 
+logger = logging.getLogger(__name__)
+
+_chunk_pool = None
+_chunk_pool_lock = threading.Lock()
+
+
+def _init_chunk_worker(threads_per_worker: int):
+    import torch
+    torch.set_num_threads(threads_per_worker)
+
+
+def get_chunk_pool() -> ProcessPoolExecutor:
+    """
+    청크 전사에 쓰는 프로세스 풀을 반환합니다. 각 프로세스는 자신의 whisper_registry에서
+    모델을 한 번만 로드하므로 풀은 작업 간에 재사용됩니다.
+    """
+    global _chunk_pool
+    with _chunk_pool_lock:
+        if _chunk_pool is None:
+            workers = settings.TRANSCRIBE_WORKERS or os.cpu_count() or 1
+            threads_per_worker = max((os.cpu_count() or 1) // workers, 1)
+            _chunk_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(threads_per_worker,),
+            )
+        return _chunk_pool
+
+
+def shutdown_chunk_pool():
+    global _chunk_pool
+    with _chunk_pool_lock:
+        if _chunk_pool is not None:
+            _chunk_pool.shutdown(wait=False, cancel_futures=True)
+            _chunk_pool = None
+
+
+def _transcribe_chunk(model_name, samples, language):
+    with whisper_registry.acquire(model_name) as model:
+        return model.transcribe(samples, language=language)
+
+
+def stitch_segments(chunk_results: list, offsets: list) -> dict:
+    """
+    청크별 Whisper 결과를 하나로 합칩니다. 각 세그먼트의 start/end에 청크 시작 시각(초)을 더하고
+    id는 0부터 다시 매깁니다.
+    """
+    segments = []
+    texts = []
+    for result, offset in zip(chunk_results, offsets):
+        texts.append(result["text"].strip())
+        for segment in result["segments"]:
+            segments.append({
+                **segment,
+                "id": len(segments),
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+            })
+    language = chunk_results[0].get("language") if chunk_results else None
+    return {"text": " ".join(text for text in texts if text), "segments": segments, "language": language}
+
 
 class AudioTranslator:
-    def __init__(self, model_name="base"):
+    def __init__(self, model_name=None):
         """
-        Initialize the Whisper model for transcription.
+        Select the Whisper model for transcription.
+        The model itself is loaded once per process and shared through whisper_registry.
         """
-        self.model = whisper.load_model(model_name)
+        self.model_name = model_name
 
-    def mp3_to_wav(self, audio_path: str) -> str:
+    def audio_to_text(self, audio_path: str, spill_path: str = None) -> dict:
         """
-        Convert an MP3 file to WAV format.
+        Transcribe audio to text using Whisper.
+        The file is decoded in memory to 16 kHz float32 PCM and handed to Whisper directly.
         Args:
-            audio_path (str): Path to the MP3 file.
+            audio_path (str): Path to any audio or video file ffmpeg can decode.
+            spill_path (str): Optional raw PCM file used to memory-map long inputs.
         Returns:
-            str: Path to the converted WAV file.
+            dict: Whisper result with text and segments.
         """
-        wav_path = audio_path.replace(".mp3", ".wav")
-        audio = AudioSegment.from_mp3(audio_path)
-        audio.export(wav_path, format="wav")
-        print(f"Converted {audio_path} to {wav_path}")
-        return wav_path
+        samples = decode_audio(
+            audio_path,
+            SAMPLE_RATE,
+            spill_path=spill_path,
+            spill_after_seconds=settings.AUDIO_SPILL_AFTER_SECONDS,
+            timeout=settings.AUDIO_DECODE_TIMEOUT_SECONDS,
+        )
+
+        if settings.TRANSCRIBE_MODE == "chunked":
+            return self.samples_to_text_chunked(samples)
 
-    def audio_to_text(self, audio_path: str) -> str:
+        with whisper_registry.acquire(self.model_name) as model:
+            return model.transcribe(samples, language="ko")
+
+    def samples_to_text_chunked(self, samples, language: str = "ko") -> dict:
         """
-        Transcribe audio to text using Whisper.
+        Split decoded audio on silence and transcribe the chunks in parallel worker processes.
         Args:
-            audio_path (str): Path to the audio file (MP3 or WAV).
+            samples (np.ndarray): 16 kHz mono float32 PCM.
+            language (str): Transcription language.
         Returns:
-            str: Transcribed text.
+            dict: Whisper-style result with text and globally-timed segments.
         """
-        # Convert to WAV if input is MP3
-        if audio_path.endswith(".mp3"):
-            audio_path = self.mp3_to_wav(audio_path)
+        chunks = split_on_silence(
+            samples,
+            SAMPLE_RATE,
+            target_chunk_seconds=settings.VAD_CHUNK_SECONDS,
+            max_chunk_seconds=settings.VAD_MAX_CHUNK_SECONDS,
+            min_silence_ms=settings.VAD_MIN_SILENCE_MS,
+            min_chunk_seconds=settings.VAD_MIN_CHUNK_SECONDS,
+        )
+        logger.info(f"Transcribing {len(chunks)} chunks")
 
-        result = self.model.transcribe(audio_path, language="ko")
-        return result
+        if len(chunks) <= 1:
+            with whisper_registry.acquire(self.model_name) as model:
+                return model.transcribe(samples, language=language)
 
+        pool = get_chunk_pool()
+        futures = [
+            pool.submit(_transcribe_chunk, self.model_name, np.ascontiguousarray(samples[start:end]), language)
+            for start, end in chunks
+        ]
+        results = [future.result() for future in futures]
+        offsets = [start / SAMPLE_RATE for start, _ in chunks]
+        return stitch_segments(results, offsets)
 
-def process_audio_from_videos(video_audio_paths: list):
+
+def save_transcription(result: dict, workspace: JobWorkspace):
+    """
+    Save a Whisper-style transcription result (from Whisper or captions) into the workspace,
+    along with a typo-refined copy of the text. The refined copy is written one chunk per line,
+    refined chunk by chunk so long transcripts stay within the model's token limits.
+    Args:
+        result (dict): Transcription with text and segments (id/start/end/text).
+        workspace (JobWorkspace): Job workspace where transcripts are written.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(result["segments"], columns=["id", "start", "end", "text"])
+    with open(workspace.original_text_path, "w", encoding="utf-8") as f:
+        f.write(result["text"])
+    df.to_csv(workspace.segments_path, index=False)
+    refined_chunks = summarizer().refine(result["text"], result["segments"])
+    with open(workspace.refined_text_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(chunk.strip() for chunk in refined_chunks))
+
+
+def load_segments(workspace: JobWorkspace) -> list:
+    """Load the saved segments.csv of a workspace as a list of id/start/end/text dicts."""
+    import pandas as pd
+
+    df = pd.read_csv(workspace.segments_path, keep_default_na=False)
+    return df.to_dict("records")
+
+
+def process_audio_from_videos(video_audio_paths: list, workspace: JobWorkspace):
     """
     Process audio files extracted from videos and save transcriptions.
     Args:
         video_audio_paths (list): List of audio file paths.
+        workspace (JobWorkspace): Job workspace where transcripts are written.
     """
     try:
         translator = AudioTranslator()
     
         for audio_path in video_audio_paths:
-            # Get file name without extension
-            output_file = f"video/all_text_original.txt"
-            
             # Transcribe and save
-            print(f"Processing audio: {audio_path}")
-            result = translator.audio_to_text(audio_path)
-            df = pd.DataFrame(result["segments"])[["id", "start", "end", "text"]]
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(result["text"])
-            df.to_csv("video/segments.csv", index=False)
-            refiner = summarizer()
-            query = """당신은 오타를 교정하는 전문가입니다.
-                        주어진 Text의 오타를 알맞게 교정한 Text를 내보내 주세요."""
-            output_file = f"video/all_text_refined.txt"
-            response = refiner.generate(result['text'], query)
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(response)
+            logger.info(f"Processing audio: {audio_path}")
+            result = translator.audio_to_text(audio_path, spill_path=workspace.pcm_path)
+            save_transcription(result, workspace)
     except Exception as e:
         raise Exception(f"오디오 처리 중 오류 발생: {str(e)}")
 
 
 if __name__ == "__main__":
-    # video_processing.py에서 제공하는 오디오 파일 경로 리스트를 여기에 사용
-    video_audio_paths = [glob("./video/*.mp3")[0]]
-
-    process_audio_from_videos(video_audio_paths)
-    print("\nAll audio files have been transcribed and saved.")
+    # 사용법: python -m app.services.audio2text <audio file>
+    logging.basicConfig(level=logging.INFO)
+    workspace = JobWorkspace(keep=True)
+    process_audio_from_videos([sys.argv[1]], workspace)
+    logger.info(f"All audio files have been transcribed and saved to {workspace.path}.")
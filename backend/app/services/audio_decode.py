@@ -0,0 +1,80 @@
+import subprocess
+import tempfile
+import threading
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = np.dtype(np.float32).itemsize
+READ_BLOCK_BYTES = 1 << 20
+
+
+def decode_audio(path: str, sample_rate: int = SAMPLE_RATE, spill_path: Optional[str] = None,
+                 spill_after_seconds: Optional[float] = None, timeout: Optional[float] = None) -> np.ndarray:
+    """
+    ffmpeg로 오디오/영상 컨테이너를 디코딩해 float32 mono PCM NumPy 배열로 반환합니다.
+
+    중간 MP3/WAV 파일 없이 ffmpeg의 stdout을 바로 읽습니다. spill_path가 주어지고 디코딩한 길이가
+    spill_after_seconds를 넘으면 이후 데이터는 raw PCM 파일에 이어 쓰고, 결과는 그 파일을
+    메모리 매핑한 배열로 반환하므로 긴 입력에서도 메모리 사용량이 일정하게 유지됩니다.
+    timeout(초)을 넘기면 ffmpeg를 종료하고 TimeoutError를 냅니다.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-loglevel", "error",
+        "-i", path,
+        "-f", "f32le", "-ac", "1", "-ar", str(sample_rate),
+        "-",
+    ]
+    spill_bytes = None
+    if spill_path is not None and spill_after_seconds is not None:
+        spill_bytes = int(spill_after_seconds * sample_rate) * BYTES_PER_SAMPLE
+
+    buffer = bytearray()
+    spill_file = None
+    timed_out = threading.Event()
+    # 손상된 스트림은 stderr에 오류를 많이 남기므로, 파이프가 차서 ffmpeg가 멈추지 않도록 파일로 받습니다
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        watchdog = None
+        if timeout is not None:
+            watchdog = threading.Timer(timeout, lambda: (timed_out.set(), process.kill()))
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            while True:
+                block = process.stdout.read(READ_BLOCK_BYTES)
+                if not block:
+                    break
+                if spill_file is not None:
+                    spill_file.write(block)
+                    continue
+                buffer += block
+                if spill_bytes is not None and len(buffer) > spill_bytes:
+                    spill_file = open(spill_path, "wb")
+                    spill_file.write(buffer)
+                    buffer = bytearray()
+
+            returncode = process.wait()
+            if timed_out.is_set():
+                raise TimeoutError(f"오디오 디코딩이 {timeout}초 안에 끝나지 않았습니다: {path}")
+            if returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+                raise RuntimeError(f"오디오 디코딩 실패: {stderr.decode(errors='ignore').strip()}")
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            if spill_file is not None:
+                spill_file.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+    if spill_file is not None:
+        # copy-on-write 모드라 torch.from_numpy가 읽기 전용 경고 없이 사용할 수 있습니다
+        return np.memmap(spill_path, dtype=np.float32, mode="c")
+
+    # 버퍼를 복사하지 않고 그대로 감싸며, 끝에 남은 4바이트 미만 조각은 버립니다
+    return np.frombuffer(buffer, dtype=np.float32, count=len(buffer) // BYTES_PER_SAMPLE)
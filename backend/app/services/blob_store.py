@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.utils.workspace import BACKEND_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOB_ROOT = os.path.join(BACKEND_DIR, "blobs")
+
+
+class LocalBlobStore:
+    """
+    로컬 디스크의 content-addressed 저장소. 파일 이름은 내용의 SHA-256이며
+    root/ab/cd/abcd... 형태로 나눠 저장합니다. 같은 내용은 한 번만 저장됩니다.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.BLOB_STORE_ROOT or DEFAULT_BLOB_ROOT
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """
+        data를 저장하고 (SHA-256, 크기)를 반환합니다. 이미 있으면 쓰지 않고 수정 시각만 갱신해
+        커밋 전인 행이 참조할 파일을 sweep_unreferenced_blobs가 지우지 않게 합니다.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        try:
+            os.utime(path)
+            return digest, len(data)
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 rename하므로 읽는 쪽은 완성된 파일만 보게 됩니다
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest, len(data)
+
+    def remove(self, digest: str) -> bool:
+        try:
+            os.remove(self.path_for(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get(self, digest: str) -> bytes:
+        with open(self.path_for(digest), "rb") as f:
+            return f.read()
+
+
+blob_store = LocalBlobStore()
+
+_last_sweep = 0.0
+_sweep_lock = threading.Lock()
+
+
+def sweep_unreferenced_blobs(db: Session, store: LocalBlobStore = blob_store,
+                             grace_seconds: Optional[float] = None) -> int:
+    """
+    어떤 Analysis.content_hash도 가리키지 않는 blob 파일(중단된 쓰기의 임시 파일 포함)을 지우고 지운 개수를 반환합니다.
+    재분석, force 갱신, 댓글 갱신으로 지워진 Analysis 행의 이미지가 여기서 정리됩니다.
+    put 후 아직 커밋되지 않은 행의 파일을 지우지 않도록 최근 grace_seconds 안에 쓰이거나 재사용된 파일은 남깁니다.
+    """
+    from app.models.models import Analysis
+
+    grace_seconds = settings.BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    # 참조 목록을 먼저 읽으므로, 그 뒤에 저장된 파일은 수정 시각이 새로워 grace 기간으로 보호됩니다
+    referenced = {
+        digest for (digest,) in db.query(Analysis.content_hash).filter(Analysis.content_hash.isnot(None)).distinct()
+    }
+    cutoff = time.time() - grace_seconds
+
+    removed = 0
+    for directory, _, files in os.walk(store.root):
+        for name in files:
+            if name in referenced:
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+    if removed:
+        logger.info(f"Removed {removed} unreferenced blobs from {store.root}")
+    return removed
+
+
+def sweep_if_due(store: LocalBlobStore = blob_store) -> int:
+    """
+    마지막 스윕 후 BLOB_GC_INTERVAL_SECONDS가 지났으면 새 세션으로 sweep_unreferenced_blobs를 실행합니다.
+    정리 실패는 호출한 작업을 실패시키지 않도록 로그만 남깁니다.
+    """
+    global _last_sweep
+    interval = settings.BLOB_GC_INTERVAL_SECONDS
+    if interval <= 0:
+        return 0
+    with _sweep_lock:
+        if time.time() - _last_sweep < interval:
+            return 0
+        _last_sweep = time.time()
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return sweep_unreferenced_blobs(db, store)
+    except Exception as e:
+        logger.warning(f"Blob garbage collection failed: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+def migrate_inline_images(db: Session, store: LocalBlobStore = blob_store, batch_size: int = 100) -> int:
+    """
+    image_data에 이미지를 직접 담고 있는 기존 Analysis 행을 blob 저장소로 옮기고
+    content_hash/size만 남깁니다. 옮긴 행 수를 반환합니다.
+
+    실행 전 스키마를 alembic 리비전 0005_analysis_blob_store 이상으로 올려야 합니다 (alembic upgrade head).
+    """
+    # 순환 import를 피하려고 여기서 가져옵니다 (analysis_store가 이 모듈을 사용)
+    from app.models.models import Analysis
+    from app.services.analysis_store import read_analysis_image
+
+    migrated = 0
+    while True:
+        rows = db.query(Analysis)\
+            .filter(Analysis.image_data.isnot(None))\
+            .order_by(Analysis.id)\
+            .limit(batch_size)\
+            .all()
+        if not rows:
+            return migrated
+
+        for analysis in rows:
+            analysis.content_hash, analysis.size = store.put(read_analysis_image(analysis))
+            analysis.image_data = None
+        db.commit()
+        migrated += len(rows)
+        logger.info(f"Moved {migrated} analysis images to {store.root}")
+
+
+if __name__ == "__main__":
+    # 사용법: alembic upgrade head 후 python -m app.services.blob_store
+    #         참조되지 않는 blob 정리: python -m app.services.blob_store gc
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        if sys.argv[1:] == ["gc"]:
+            print(f"Removed {sweep_unreferenced_blobs(session)} unreferenced blobs from {blob_store.root}")
+        else:
+            print(f"Migrated {migrate_inline_images(session)} analysis images to {blob_store.root}")
+    finally:
+        session.close()
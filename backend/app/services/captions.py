@@ -0,0 +1,154 @@
+import html
+import logging
+import os
+import re
+from glob import escape, glob
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_PATTERN = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})")
+CUE_TIMING_PATTERN = re.compile(r"^\s*(\S+)\s+-->\s+(\S+)")
+INLINE_TAG_PATTERN = re.compile(r"<[^>]+>")
+# [음악], [박수], (웃음) 처럼 발화가 아닌 효과음 표기
+NON_SPEECH_PATTERN = re.compile(r"^[\[\(].*[\]\)]$")
+# 단어별 타이밍 태그(<00:00:00.640>)는 YouTube 자동 생성 자막에만 있습니다
+WORD_TIMING_PATTERN = re.compile(r"<\d{2}:\d{2}:\d{2}\.\d{3}>")
+
+
+def parse_timestamp(value: str) -> float:
+    """'00:01:02.345' 또는 '01:02,345' 형태의 타임스탬프를 초 단위로 변환합니다."""
+    match = TIMESTAMP_PATTERN.search(value)
+    if not match:
+        raise ValueError(f"잘못된 타임스탬프: {value}")
+    hours, minutes, seconds, millis = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def clean_caption_line(line: str) -> str:
+    return html.unescape(INLINE_TAG_PATTERN.sub("", line)).strip()
+
+
+def parse_cues(content: str, rolling: Optional[bool] = None) -> List[dict]:
+    """
+    WebVTT/SRT 내용을 Whisper segments와 같은 형태(id/start/end/text)로 변환합니다.
+
+    YouTube 자동 생성 자막은 이전 줄을 다음 큐에서 한 번 더 보여주므로, 이런 롤링 자막이거나
+    앞 큐와 시간이 겹치는 큐에서만 직전에 내보낸 줄과 같은 줄을 건너뜁니다. 직접 올린 자막에서
+    일부러 반복한 줄(후렴, 대답 등)은 그대로 둡니다. rolling이 None이면 단어별 타이밍 태그로 판단합니다.
+    """
+    if rolling is None:
+        rolling = WORD_TIMING_PATTERN.search(content) is not None
+    segments = []
+    last_line = None
+    last_end = None
+    # 큐 구분은 완전히 빈 줄만 인정합니다. YouTube 자동 자막은 큐 본문이 공백 한 칸짜리 줄로 시작하므로
+    # 공백만 있는 줄에서 나누면 첫 줄의 텍스트가 타이밍과 분리됩니다
+    blocks = re.split(r"\r?\n\r?\n", content.lstrip("\ufeff"))
+
+    for block in blocks:
+        lines = block.strip("\r\n").splitlines()
+        timing_index = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if timing_index is None:
+            continue
+
+        timing = CUE_TIMING_PATTERN.match(lines[timing_index])
+        if not timing:
+            continue
+        start, end = parse_timestamp(timing.group(1)), parse_timestamp(timing.group(2))
+        dedupe = rolling or (last_end is not None and start < last_end)
+        last_end = end
+
+        texts = []
+        for line in lines[timing_index + 1:]:
+            line = clean_caption_line(line)
+            if not line or (dedupe and line == last_line):
+                continue
+            texts.append(line)
+            last_line = line
+
+        if texts:
+            segments.append({"id": len(segments), "start": start, "end": end, "text": " ".join(texts)})
+
+    return segments
+
+
+def parse_caption_file(path: str) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_cues(f.read())
+
+
+def is_usable_caption(segments: List[dict], min_segments: int = 3, min_chars_per_minute: int = 60,
+                      max_non_speech_ratio: float = 0.5) -> bool:
+    """
+    자막 품질 휴리스틱: 세그먼트 수, 분당 글자 수, 효과음 표기 비율을 확인합니다.
+    """
+    if len(segments) < min_segments:
+        return False
+
+    duration_minutes = max(segments[-1]["end"] - segments[0]["start"], 1.0) / 60
+    chars = sum(len(segment["text"]) for segment in segments)
+    if chars / duration_minutes < min_chars_per_minute:
+        return False
+
+    non_speech = sum(1 for segment in segments if NON_SPEECH_PATTERN.match(segment["text"]))
+    return non_speech / len(segments) <= max_non_speech_ratio
+
+
+def download_captions(url: str, output_dir: str, languages: List[str]) -> Optional[str]:
+    """
+    yt-dlp로 영상은 받지 않고 자막만 받습니다. 업로드된 자막을 우선하고 없으면 자동 생성 자막을 사용합니다.
+    받은 자막 파일 경로를 반환하며, 자막이 없으면 None을 반환합니다.
+    """
+    ydl_opts = {
+        "skip_download": True,
+        "writesubtitles": True,
+        "writeautomaticsub": True,
+        "subtitleslangs": languages,
+        "subtitlesformat": "vtt/srt/best",
+        "outtmpl": os.path.join(output_dir, "captions.%(ext)s"),
+        "quiet": True,
+        "no_warnings": True,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([url])
+
+    for language in languages:
+        for ext in ("vtt", "srt"):
+            files = glob(os.path.join(escape(output_dir), f"captions.{language}*.{ext}"))
+            if files:
+                return files[0]
+    return None
+
+
+def fetch_caption_transcript(url: str, output_dir: str) -> Optional[dict]:
+    """
+    사용 가능한 자막이 있으면 Whisper 결과와 같은 형태의 dict를 반환하고, 없거나 품질이 낮으면 None을 반환합니다.
+    """
+    languages = [language.strip() for language in settings.CAPTION_LANGUAGES.split(",") if language.strip()]
+    try:
+        caption_path = download_captions(url, output_dir, languages)
+    except Exception as e:
+        logger.warning(f"자막을 불러오는 중에 오류 발생: {str(e)}")
+        return None
+
+    if caption_path is None:
+        return None
+
+    segments = parse_caption_file(caption_path)
+    if not is_usable_caption(segments, min_chars_per_minute=settings.CAPTION_MIN_CHARS_PER_MINUTE):
+        logger.info(f"자막 품질이 낮아 사용하지 않습니다: {caption_path}")
+        return None
+
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": languages[0] if languages else None,
+        "source": "captions",
+    }
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.core.config import settings
+
+
+class RenderedChartCache:
+    """
+    저장된 빈도표로 다시 그린 차트 PNG의 프로세스 내 LRU 캐시.
+    키는 (영상 id, 차트 종류, 데이터 버전, 렌더링 파라미터...)이며 항목 수와 전체 바이트 수로 크기를 제한합니다.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key: Hashable, image: bytes):
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = image
+            self._bytes += len(image)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+chart_cache = RenderedChartCache(
+    max_entries=settings.CHART_CACHE_MAX_ENTRIES,
+    max_bytes=settings.CHART_CACHE_MAX_MB * 1024 * 1024,
+)
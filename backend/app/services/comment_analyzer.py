@@ -1,115 +1,310 @@
+import asyncio
+import io
+import json
+import logging
 import os
+import re
 from urllib.parse import parse_qs, urlparse
 
-import koreanize_matplotlib
-import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
-import plotly.express as px
-import io
-import base64
-from PIL import Image
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
-from openai import OpenAI
+
+from app.core.config import settings
+from app.services.llm_client import llm_client
+from app.services.summarize import count_tokens
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com")
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
 
 def get_video_id(url):
-    """YouTube URL에서 비디오 ID를 추출하는 함수"""
-    parsed_url = urlparse(url)
-    if parsed_url.hostname == "youtu.be":
-        return parsed_url.path[1:]
-    if parsed_url.hostname in ("www.youtube.com", "youtube.com"):
+    """YouTube URL에서 비디오 ID를 추출하는 함수
+
+    youtu.be 단축 링크, /watch?v=, /shorts/, /embed/, /live/ 형태를 모두 지원하며
+    t=, si=, list= 등의 부가 쿼리 파라미터는 무시합니다.
+    """
+    parsed_url = urlparse(url.strip())
+    hostname = (parsed_url.hostname or "").lower()
+    video_id = None
+
+    if hostname == "youtu.be":
+        video_id = parsed_url.path.lstrip("/").split("/")[0]
+    elif hostname in YOUTUBE_HOSTS:
         if parsed_url.path == "/watch":
-            return parse_qs(parsed_url.query)["v"][0]
+            video_id = parse_qs(parsed_url.query).get("v", [None])[0]
+        else:
+            parts = parsed_url.path.strip("/").split("/")
+            if len(parts) >= 2 and parts[0] in ("shorts", "embed", "live", "v"):
+                video_id = parts[1]
+
+    if video_id and VIDEO_ID_PATTERN.match(video_id):
+        return video_id
     return None
 
 
-def get_comments(youtube, video_id, max_results=10):
-    """YouTube 동영상의 인기 댓글을 가져오는 함수"""
-    comments = []
+def comment_row(snippet, comment_id, parent_id=None):
+    return {
+        "comment_id": comment_id,
+        "parent_id": parent_id,
+        "text": snippet["textDisplay"],
+        "likes": snippet["likeCount"],
+        "author": snippet["authorDisplayName"],
+        "published_at": snippet["publishedAt"],
+    }
 
-    try:
-        request = youtube.commentThreads().list(
+
+def iter_replies(youtube, parent_id, page_size=100):
+    """댓글 스레드의 답글을 페이지 단위로 모두 가져오는 제너레이터"""
+    page_token = None
+    while True:
+        response = youtube.comments().list(
             part="snippet",
+            parentId=parent_id,
+            textFormat="plainText",
+            maxResults=page_size,
+            pageToken=page_token,
+        ).execute()
+
+        for item in response.get("items", []):
+            yield comment_row(item["snippet"], item["id"], parent_id)
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def iter_comments(youtube, video_id, limit=None, include_replies=False, order="relevance", page_size=100):
+    """
+    YouTube 동영상의 댓글을 nextPageToken을 따라가며 하나씩 내보내는 제너레이터.
+    limit개(답글 포함)에 도달하면 멈추며, 페이지 하나 이상을 메모리에 들고 있지 않습니다.
+    API 오류는 삼키지 않고 그대로 전파하므로, 중간에 실패한 수집이 성공처럼 저장되지 않습니다.
+    """
+    page_token = None
+    count = 0
+
+    while True:
+        response = youtube.commentThreads().list(
+            part="snippet,replies" if include_replies else "snippet",
             videoId=video_id,
             textFormat="plainText",
-            maxResults=max_results,
-            order="relevance",  # 인기 댓글 순으로 정렬
-        )
+            maxResults=page_size,
+            order=order,
+            pageToken=page_token,
+        ).execute()
+
+        for item in response.get("items", []):
+            top_level = item["snippet"]["topLevelComment"]
+            yield comment_row(top_level["snippet"], top_level["id"])
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+            if include_replies and item["snippet"].get("totalReplyCount", 0) > 0:
+                inline = item.get("replies", {}).get("comments", [])
+                if len(inline) >= item["snippet"]["totalReplyCount"]:
+                    replies = (comment_row(reply["snippet"], reply["id"], top_level["id"]) for reply in inline)
+                else:
+                    replies = iter_replies(youtube, top_level["id"], page_size)
+                for reply in replies:
+                    yield reply
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
 
-        response = request.execute()
-
-        for item in response["items"]:
-            comment = item["snippet"]["topLevelComment"]["snippet"]
-            comments.append(
-                {
-                    "text": comment["textDisplay"],
-                    "likes": comment["likeCount"],
-                    "author": comment["authorDisplayName"],
-                    "published_at": comment["publishedAt"],
-                }
-            )
 
+def get_comments(youtube, video_id, max_results=10):
+    """YouTube 동영상의 인기 댓글을 가져오는 함수"""
+    try:
+        return list(iter_comments(youtube, video_id, limit=max_results))
     except Exception as e:
-        print(f"댓글을 불러오는 중에 오류 발생: {str(e)}")
-
-    return comments
-
-
-def analyze_sentiment(client, text):
-    """OpenAI API를 사용하여 텍스트의 감정을 분석하는 함수"""
+        logger.error(f"Failed to fetch comments for video {video_id}: {str(e)}")
+        return []
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def classify_comment_stream(comments, backend, batch_size=200):
+    """
+    댓글 이터레이터를 batch_size개씩 묶어 분류하고 sentiment가 채워진 댓글을 순서대로 내보냅니다.
+    한 번에 한 배치만 메모리에 올라갑니다.
+    """
+    for batch in batched(comments, batch_size):
+        sentiments = backend.classify([comment["text"] for comment in batch])
+        for comment, sentiment in zip(batch, sentiments):
+            comment["sentiment"] = sentiment
+            yield comment
+
+
+SENTIMENT_LABELS = ("긍정", "부정", "중립")
+SENTIMENT_FAILED = "분석 실패"
+
+BATCH_SENTIMENT_PROMPT = """당신은 Youtube 영상의 댓글 감정 분류 전문가입니다.
+                번호가 붙은 댓글 목록이 JSON으로 주어집니다. 각 댓글의 감정을 '긍정', '부정', '중립' 중 하나로 분류하세요.
+                반드시 {"results": {"<번호>": "<감정>", ...}} 형식의 JSON 객체로만 답변하고, 모든 번호를 포함하세요."""
+
+# 한 댓글이 배치 하나를 독차지하지 않도록 길이를 제한합니다
+MAX_COMMENT_CHARS = 500
+
+
+def make_sentiment_batches(items, max_tokens, max_items):
+    """
+    (번호, 댓글) 목록을 토큰 예산과 최대 개수 안에서 순서대로 묶습니다.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for index, text in items:
+        tokens = count_tokens(text) + 8
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append((index, text))
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(content, expected_indices):
+    """
+    배치 응답 JSON에서 요청한 번호에 대한 유효한 감정만 골라 {번호: 감정}으로 반환합니다.
+    형식이 잘못되었거나 빠진 항목은 결과에 포함되지 않습니다.
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 Youtube 영상의 댓글 감정 분류 전문가입니다. 다음 댓글의 감정을 분석하세요. 반드시 '긍정', '부정', '중립' 중 하나로만 답변하세요.",
-                },
-                {"role": "user", "content": text},
+        payload = json.loads(content)
+    except (TypeError, ValueError):
+        return {}
+    results = payload.get("results", payload) if isinstance(payload, dict) else {}
+    if not isinstance(results, dict):
+        return {}
+
+    parsed = {}
+    for index in expected_indices:
+        label = results.get(str(index))
+        if isinstance(label, str) and label.strip() in SENTIMENT_LABELS:
+            parsed[index] = label.strip()
+    return parsed
+
+
+async def classify_sentiment_batch(client, batch):
+    """댓글 배치 하나를 한 번의 요청으로 분류합니다. 실패하면 빈 dict를 반환합니다."""
+    comments = {str(index): text for index, text in batch}
+    try:
+        content = await client.chat(
+            [
+                {"role": "system", "content": BATCH_SENTIMENT_PROMPT},
+                {"role": "user", "content": json.dumps(comments, ensure_ascii=False)},
             ],
+            model="gpt-4o-mini",
             temperature=0,
+            response_format={"type": "json_object"},
         )
-        sentiment = response.choices[0].message.content.strip()
-        return sentiment
-
     except Exception as e:
-        print(f"감정 분석 중 오류 발생: {str(e)}")
-        return "분석 실패"
-    
-def get_sentiment_df(video_url):
-    """YouTube 댓글의 감정 분석 결과를 DataFrame으로 반환하는 함수"""
+        logger.warning(f"Batch sentiment request for {len(batch)} comments failed: {str(e)}")
+        return {}
+    return parse_batch_response(content, [index for index, _ in batch])
+
+
+async def analyze_sentiments(client, texts, batch_tokens=None, batch_size=None, max_retries=None):
+    """
+    여러 댓글을 배치 단위로 묶어 분류합니다. 배치들은 동시에 요청되며, 응답에서 빠졌거나 잘못된 항목만
+    더 작은 배치로 나눠 다시 요청합니다. 재시도 후에도 분류되지 않은 댓글은 '분석 실패'가 됩니다.
+    """
+    batch_tokens = batch_tokens or settings.SENTIMENT_BATCH_TOKENS
+    batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+    max_retries = settings.SENTIMENT_MAX_RETRIES if max_retries is None else max_retries
+
+    pending = [(index, str(text)[:MAX_COMMENT_CHARS]) for index, text in enumerate(texts)]
+    labels = {}
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+        batches = make_sentiment_batches(pending, batch_tokens, batch_size)
+        for result in await asyncio.gather(*(classify_sentiment_batch(client, batch) for batch in batches)):
+            labels.update(result)
+
+        pending = [(index, text) for index, text in pending if index not in labels]
+        if pending:
+            logger.info(f"Sentiment retry {attempt + 1}: {len(pending)} comments missing")
+            # 실패한 항목은 더 작은 배치로 나눠 다시 요청합니다
+            batch_tokens = max(batch_tokens // 2, 1)
+            batch_size = max(batch_size // 2, 1)
+
+    return [labels.get(index, SENTIMENT_FAILED) for index in range(len(texts))]
+
+
+def build_youtube_client():
+    from googleapiclient.discovery import build
+
     youtube_api_key = os.getenv("YOUTUBE_API_KEY")
-    openai_api_key = os.getenv("OPENAI_API_KEY")
 
-    if not youtube_api_key or not openai_api_key:
+    if not youtube_api_key:
         raise ValueError("API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
 
-    # API 클라이언트 초기화
-    youtube = build("youtube", "v3", developerKey=youtube_api_key)
-    openai_client = OpenAI(api_key=openai_api_key)
+    return build("youtube", "v3", developerKey=youtube_api_key)
+
+
+def default_sentiment_backend():
+    # sentiment_backends가 이 모듈을 import하므로 순환 import를 피하려고 여기서 가져옵니다
+    from app.services.sentiment_backends import get_sentiment_backend
+    return get_sentiment_backend()
+
+
+def get_sentiment_df(video_url, backend=None):
+    """YouTube 댓글의 감정 분석 결과를 DataFrame으로 반환하는 함수"""
+    youtube = build_youtube_client()
+    backend = backend or default_sentiment_backend()
 
     video_id = get_video_id(video_url)
     if not video_id:
         raise ValueError("올바른 YouTube URL이 아닙니다.")
 
-    # 댓글 가져오기
-    comments = get_comments(youtube, video_id)
-    if not comments:
+    # 댓글을 페이지 단위로 가져오면서 배치별로 감정 분석 (차트에 필요한 열만 남김)
+    comments = iter_comments(
+        youtube,
+        video_id,
+        limit=settings.COMMENT_LIMIT,
+        include_replies=settings.COMMENT_INCLUDE_REPLIES,
+    )
+    rows = [
+        (row["text"], row["likes"], row["author"], row["published_at"], row["sentiment"])
+        for row in classify_comment_stream(comments, backend, settings.COMMENT_BATCH_SIZE)
+    ]
+    if not rows:
         raise ValueError("댓글을 가져올 수 없습니다.")
 
-    # DataFrame 생성 및 감정 분석
-    df = pd.DataFrame(comments)
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=["text", "likes", "author", "published_at", "sentiment"])
     df = df.sort_values("likes", ascending=False)
-    df["sentiment"] = df["text"].apply(lambda x: analyze_sentiment(openai_client, x))
 
     return df
 
 
-def visualize_sentiment_analysis(df):
+SENTIMENT_COLORS = {"긍정": "skyblue", "부정": "pink", "중립": "gray"}
+
+
+def build_sentiment_figure(df):
+    """댓글 감정 산점도를 Plotly Figure로 만듭니다 (PNG 내보내기 또는 클라이언트 렌더링용 JSON spec)."""
+    import plotly.express as px
+
     df = df.sort_values(by="published_at", ascending=False)
 
     fig = px.scatter(
@@ -117,7 +312,7 @@ def visualize_sentiment_analysis(df):
         x="published_at",
         y="likes",
         color="sentiment",
-        color_discrete_map={"긍정": "skyblue", "부정": "pink", "중립": "gray"},
+        color_discrete_map=SENTIMENT_COLORS,
         hover_data={
             "text": True,
             "author": True,
@@ -132,7 +327,7 @@ def visualize_sentiment_analysis(df):
     fig.update_traces(marker=dict(size=15), selector=dict(mode="markers"))
 
     for sentiment in df["sentiment"].unique():
-        sentiment_color = {"긍정": "skyblue", "부정": "pink", "중립": "gray"}[sentiment]
+        sentiment_color = SENTIMENT_COLORS.get(sentiment, "lightgray")
 
         fig.update_traces(
             hoverlabel=dict(bgcolor=sentiment_color),
@@ -142,23 +337,76 @@ def visualize_sentiment_analysis(df):
         xaxis_title="시간대 별 댓글",
         yaxis_title="좋아요 수",
     )
+    return fig
+
+
+def sentiment_chart_spec(df) -> dict:
+    """프론트엔드에서 Plotly로 직접 그릴 수 있도록 감정 산점도의 JSON spec을 반환합니다."""
+    return json.loads(build_sentiment_figure(df).to_json())
+
+
+def render_sentiment_scatter(df, figsize=(10, 6)) -> bytes:
+    """
+    감정 산점도를 matplotlib Figure(Agg)로 그려 PNG 바이트로 반환합니다.
+    kaleido(headless 브라우저)를 띄우지 않으므로 렌더링 워커 안에서 가볍게 반복 호출할 수 있습니다.
+    """
+    import pandas as pd
+    from matplotlib.figure import Figure
+
+    from app.services.TextViz import load_fonts
+
+    load_fonts()
+    published_at = pd.to_datetime(df["published_at"], utc=True).dt.tz_localize(None)
 
-    # 그래프 출력
-    img_bytes = fig.to_image(format="png")
-    return base64.b64encode(img_bytes).decode()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    for sentiment in df["sentiment"].unique():
+        mask = (df["sentiment"] == sentiment).to_numpy()
+        ax.scatter(
+            published_at[mask],
+            df["likes"][mask],
+            s=120,
+            alpha=0.8,
+            color=SENTIMENT_COLORS.get(sentiment, "lightgray"),
+            edgecolors="white",
+            linewidths=0.5,
+            label=sentiment,
+        )
+
+    ax.set_title("댓글 반응")
+    ax.set_xlabel("시간대 별 댓글")
+    ax.set_ylabel("좋아요 수")
+    ax.grid(alpha=0.3)
+    ax.legend(title="Sentiment")
+    fig.autofmt_xdate()
+
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format="png", bbox_inches="tight")
+    return img_buffer.getvalue()
+
+
+def visualize_sentiment_analysis(df):
+    """
+    감정 산점도 PNG를 만듭니다. SENTIMENT_CHART_RENDERER가 matplotlib(기본)이면 Agg로 바로 그리고,
+    plotly이면 기존처럼 Plotly Figure를 kaleido로 내보냅니다.
+    """
+    if settings.SENTIMENT_CHART_RENDERER == "plotly":
+        return build_sentiment_figure(df).to_image(format="png")
+    return render_sentiment_scatter(df)
 
 
 def main():
+    import pandas as pd
+    from googleapiclient.discovery import build
+
     youtube_api_key = os.getenv("YOUTUBE_API_KEY")
-    openai_api_key = os.getenv("OPENAI_API_KEY")
 
-    if not youtube_api_key or not openai_api_key:
+    if not youtube_api_key:
         print("Error: API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
         return
 
     # API 클라이언트 초기화
     youtube = build("youtube", "v3", developerKey=youtube_api_key)
-    openai_client = OpenAI(api_key=openai_api_key)
 
     video_url = input("분석할 YouTube 영상의 URL을 입력하세요: ")
     video_id = get_video_id(video_url)
@@ -181,7 +429,7 @@ def main():
     df = df.sort_values("likes", ascending=False)
 
     print("댓글 감정 분석 중...")
-    df["sentiment"] = df["text"].apply(lambda x: analyze_sentiment(openai_client, x))
+    df["sentiment"] = llm_client.run(analyze_sentiments(llm_client, df["text"].tolist()))
 
     print("\n=== 인기 댓글 감정 분석 결과 ===")
     for idx, row in df.iterrows():
@@ -0,0 +1,188 @@
+import logging
+from datetime import datetime
+from itertools import takewhile
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Comment, Video
+from app.services.comment_analyzer import (
+    batched,
+    build_youtube_client,
+    classify_comment_stream,
+    default_sentiment_backend,
+    iter_comments,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def parse_published_at(value: str) -> datetime:
+    """YouTube API의 '2024-01-01T12:34:56Z' 형식을 UTC 기준 naive datetime으로 변환합니다."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+CHART_COLUMNS = ["text", "likes", "author", "published_at", "sentiment"]
+
+
+def comment_snapshot(db: Session, video_id: Optional[int]) -> Tuple[Optional[datetime], Set[str]]:
+    """
+    증분 수집에 필요한 저장 상태를 읽습니다: 가장 최근 댓글 시각과 그 시각 이후 댓글 ID.
+    저장된 댓글이 없거나 영상이 아직 없으면 (None, 빈 집합)을 반환합니다.
+    """
+    if video_id is None:
+        return None, set()
+    newest = db.query(func.max(Comment.published_at)).filter(Comment.video_id == video_id).scalar()
+    if newest is None:
+        return None, set()
+    known_ids = {
+        comment_id for (comment_id,) in db.query(Comment.comment_id)
+        .filter(Comment.video_id == video_id)
+        .filter(Comment.published_at >= newest)
+    }
+    return newest, known_ids
+
+
+def fetch_new_comments(youtube_id: str, newest: Optional[datetime] = None, known_ids: Set[str] = frozenset(),
+                       youtube=None, backend=None) -> List[dict]:
+    """
+    저장되지 않은 댓글을 가져와 감정을 분류한 행 목록을 반환합니다. DB 세션을 쓰지 않으므로
+    YouTube 페이지 조회와 LLM 분류가 오래 걸려도 트랜잭션이나 커넥션을 붙잡지 않습니다.
+
+    newest가 없으면 COMMENT_LIMIT개까지 처음부터 가져오고, 있으면 최신순(order="time")으로
+    페이지를 넘기다가 이미 본 댓글(또는 그보다 오래된 댓글)을 만나는 즉시 멈춥니다.
+    최신순은 최상위 댓글의 작성 시각 기준이므로 오래된 스레드에 새로 달린 답글은 갱신에서 가져오지 못합니다.
+    YouTube API 오류는 그대로 전파되어 일부만 가져온 결과가 저장되지 않습니다.
+    """
+    youtube = youtube or build_youtube_client()
+    backend = backend or default_sentiment_backend()
+
+    if newest is None:
+        comments = iter_comments(
+            youtube,
+            youtube_id,
+            limit=settings.COMMENT_LIMIT,
+            include_replies=settings.COMMENT_INCLUDE_REPLIES,
+        )
+    else:
+        # 최신순 목록에서 이미 본 댓글부터는 모두 저장된 댓글이므로 그 앞까지만 가져옵니다
+        comments = takewhile(
+            lambda row: row["comment_id"] not in known_ids and parse_published_at(row["published_at"]) >= newest,
+            iter_comments(
+                youtube,
+                youtube_id,
+                limit=settings.COMMENT_LIMIT,
+                include_replies=settings.COMMENT_INCLUDE_REPLIES,
+                order="time",
+            ),
+        )
+
+    rows = []
+    seen = set()
+    for batch in batched(classify_comment_stream(comments, backend, settings.COMMENT_BATCH_SIZE),
+                         settings.COMMENT_BATCH_SIZE):
+        # relevance 순 페이지는 페이지 사이에 같은 댓글이 다시 나올 수 있습니다
+        for row in batch:
+            if row["comment_id"] not in seen:
+                seen.add(row["comment_id"])
+                rows.append(row)
+    return rows
+
+
+def insert_new_comments(db: Session, values: List[dict]) -> Set[str]:
+    """
+    이미 저장된 comment_id는 건너뛰고 삽입한 뒤 실제로 삽입된 ID를 반환합니다.
+    같은 영상의 갱신이 동시에 실행되어도 IntegrityError 없이 한쪽만 행을 넣습니다.
+    """
+    if not values:
+        return set()
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(Comment).on_conflict_do_nothing(index_elements=[Comment.comment_id])
+        return {comment_id for (comment_id,) in db.execute(statement.returning(Comment.comment_id), values)}
+
+    # ON CONFLICT를 지원하지 않는 DB는 저장된 ID를 먼저 걸러 냅니다
+    ids = [value["comment_id"] for value in values]
+    stored = {comment_id for (comment_id,) in db.query(Comment.comment_id).filter(Comment.comment_id.in_(ids))}
+    fresh = [value for value in values if value["comment_id"] not in stored]
+    db.add_all([Comment(**value) for value in fresh])
+    db.flush()
+    return {value["comment_id"] for value in fresh}
+
+
+def store_comments(db: Session, video: Video, rows: List[dict]) -> int:
+    """
+    fetch_new_comments가 반환한 행을 저장하고 Video.sentiment_counts를 저장된 댓글 기준으로 다시 집계합니다.
+    새로 저장한 댓글 수를 반환하며, 커밋은 호출한 쪽에서 합니다.
+    """
+    fetched_at = datetime.now()
+    inserted = insert_new_comments(db, [
+        {
+            "comment_id": row["comment_id"],
+            "video_id": video.id,
+            "parent_id": row["parent_id"],
+            "text": row["text"],
+            "likes": row["likes"],
+            "author": row["author"],
+            "published_at": parse_published_at(row["published_at"]),
+            "sentiment": row["sentiment"],
+            "fetched_at": fetched_at,
+        }
+        for row in rows
+    ])
+
+    # 동시에 갱신한 다른 작업이 넣은 댓글까지 반영되도록 증분 합산 대신 테이블에서 집계합니다.
+    # 저장된 댓글이 하나도 없으면 빈 집계 대신 None으로 둡니다
+    video.sentiment_counts = {
+        sentiment: count for sentiment, count in
+        db.query(Comment.sentiment, func.count()).filter(Comment.video_id == video.id).group_by(Comment.sentiment)
+        if sentiment is not None
+    } or None
+    video.comments_refreshed_at = fetched_at
+    logger.info(f"Stored {len(inserted)} new comments for video {video.youtube_id}")
+    return len(inserted)
+
+
+def load_chart_rows(db: Session, video_id: Optional[int], limit=None) -> List[tuple]:
+    """저장된 댓글 중 좋아요가 많은 limit개를 차트 열(text, likes, author, published_at, sentiment) 튜플로 반환합니다."""
+    if video_id is None:
+        return []
+    limit = limit or settings.COMMENT_LIMIT
+    rows = db.query(Comment.text, Comment.likes, Comment.author, Comment.published_at, Comment.sentiment)\
+        .filter(Comment.video_id == video_id)\
+        .order_by(Comment.likes.desc())\
+        .limit(limit)\
+        .all()
+    return [tuple(row) for row in rows]
+
+
+def sentiment_frame(stored_rows: List[tuple], new_rows: List[dict] = (), limit=None) -> "pd.DataFrame":
+    """
+    저장된 차트 행과 아직 저장 전인 새 댓글을 합쳐 좋아요가 많은 limit개를 차트용 DataFrame으로 만듭니다.
+    """
+    limit = limit or settings.COMMENT_LIMIT
+    rows = list(stored_rows) + [
+        (row["text"], row["likes"], row["author"], parse_published_at(row["published_at"]), row["sentiment"])
+        for row in new_rows
+    ]
+    if not rows:
+        raise ValueError("댓글을 가져올 수 없습니다.")
+    rows.sort(key=lambda row: row[1] or 0, reverse=True)
+
+    import pandas as pd
+
+    return pd.DataFrame(rows[:limit], columns=CHART_COLUMNS)
+
+
+def load_sentiment_df(db: Session, video: Video, limit=None) -> "pd.DataFrame":
+    """저장된 댓글 중 좋아요가 많은 limit개를 차트용 DataFrame으로 반환합니다."""
+    return sentiment_frame(load_chart_rows(db, video.id, limit), limit=limit)
@@ -0,0 +1,194 @@
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.services.model_registry import warm_whisper_models
+from app.services.pipeline import run_summary_pipeline
+from app.services.warmup import warm_configured_imports
+
+logger = logging.getLogger(__name__)
+
+
+def _init_job_worker():
+    warm_configured_imports()
+    warm_whisper_models()
+
+
+class QueueFullError(Exception):
+    """작업 대기열이 가득 차서 새 작업을 받을 수 없을 때 발생"""
+
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    youtube_id: str
+    created_at: float = field(default_factory=time.time)
+    status: str = "queued"
+    stages: List[dict] = field(default_factory=list)
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "url": self.url,
+            "video": self.youtube_id,
+            "status": self.status,
+            "stage": self.stages[-1]["name"] if self.stages else None,
+            "stages": self.stages,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _run_job(job_id: str, url: str, youtube_id: str, progress) -> dict:
+    """워커에서 실행되는 작업 본체. 단계 진행 상황은 progress[job_id]에 기록합니다."""
+    def report(stage: str):
+        # Manager dict 프록시는 중첩 값의 변경을 감지하지 못하므로 매번 새 리스트를 할당
+        progress[job_id] = list(progress.get(job_id, [])) + [(stage, time.time())]
+
+    return run_summary_pipeline(url, youtube_id, report)
+
+
+class JobManager:
+    """
+    요약 파이프라인 작업을 워커 풀에서 실행하고 상태를 추적합니다.
+
+    executor는 "thread" 또는 "process"이며, 실행 중이거나 대기 중인 작업이
+    workers + queue_size개에 도달하면 submit이 QueueFullError를 발생시킵니다.
+    완료된 작업은 retention_seconds 동안, 캐시 적중으로 등록된 작업은 cached_retention_seconds 동안 보관합니다.
+    """
+
+    def __init__(self, executor: str = "thread", workers: int = 2, queue_size: int = 8,
+                 retention_seconds: int = 3600, cached_retention_seconds: int = 300):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"지원하지 않는 executor 종류: {executor}")
+        self.executor_kind = executor
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retention_seconds = retention_seconds
+        self.cached_retention_seconds = cached_retention_seconds
+        self._executor = None
+        self._progress = None
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_executor(self):
+        if self._executor is not None:
+            return
+        if self.executor_kind == "process":
+            # fork로 띄우면 부모의 DB 커넥션 풀, 잠금, LLM 루프 스레드 상태를 물려받으므로 spawn으로 새로 시작합니다
+            context = multiprocessing.get_context("spawn")
+            self._progress = context.Manager().dict()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_job_worker,
+            )
+        else:
+            self._progress = {}
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sumclip-job")
+
+    def submit(self, url: str, youtube_id: str) -> Job:
+        """
+        작업을 대기열에 넣고 즉시 반환합니다. 같은 영상에 대한 작업이 진행 중이면 그 작업을 반환합니다.
+        """
+        with self._lock:
+            self._ensure_executor()
+            self._prune()
+
+            active_id = self._active.get(youtube_id)
+            if active_id is not None:
+                return self._jobs[active_id]
+
+            if len(self._active) >= self.capacity:
+                raise QueueFullError(f"작업 대기열이 가득 찼습니다 ({self.capacity}개 처리 중)")
+
+            job = Job(id=uuid.uuid4().hex, url=url, youtube_id=youtube_id)
+            job.future = self._executor.submit(_run_job, job.id, url, youtube_id, self._progress)
+            self._jobs[job.id] = job
+            self._active[youtube_id] = job.id
+
+        job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+        return job
+
+    def complete(self, url: str, youtube_id: str, result: dict) -> Job:
+        """캐시된 결과처럼 이미 준비된 결과를 완료된 작업으로 등록합니다."""
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, url=url, youtube_id=youtube_id, created_at=now, status="succeeded",
+                  finished_at=now, result=result)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.done:
+                self._sync_stages(job)
+            return job
+
+    def _sync_stages(self, job: Job):
+        history = self._progress.get(job.id, []) if self._progress is not None else []
+        job.stages = [{"name": name, "started_at": started_at} for name, started_at in history]
+        if job.stages and job.status == "queued":
+            job.status = "running"
+
+    def _finish(self, job: Job, future: Future):
+        with self._lock:
+            self._sync_stages(job)
+            self._progress.pop(job.id, None)
+            self._active.pop(job.youtube_id, None)
+            job.finished_at = time.time()
+            try:
+                job.result = future.result()
+                job.status = "succeeded"
+            except Exception as e:
+                logger.error(f"Job {job.id} for video {job.youtube_id} failed: {str(e)}")
+                job.error = str(e)
+                job.status = "failed"
+
+    def _prune(self):
+        """보존 기간이 지난 완료 작업을 정리합니다. 호출 시 _lock을 잡고 있어야 합니다."""
+        now = time.time()
+
+        def expired_at(job: Job) -> float:
+            # 워커에서 실행되지 않은(future가 없는) 작업은 complete()로 등록된 캐시 적중 결과입니다
+            retention = self.cached_retention_seconds if job.future is None else self.retention_seconds
+            return job.finished_at + retention
+
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.done and job.finished_at is not None and expired_at(job) < now]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+job_manager = JobManager(
+    executor=settings.JOB_EXECUTOR,
+    workers=settings.JOB_WORKERS,
+    queue_size=settings.JOB_QUEUE_SIZE,
+    retention_seconds=settings.JOB_RETENTION_SECONDS,
+    cached_retention_seconds=settings.JOB_CACHED_RETENTION_SECONDS,
+)
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+
+class LLMClient:
+    """
+    프로세스 전체에서 공유하는 OpenAI 클라이언트 서비스.
+
+    하나의 AsyncOpenAI(httpx keep-alive 연결 풀)를 전용 이벤트 루프 스레드에서 사용하며,
+    동시에 진행되는 요청 수는 max_concurrency 세마포어로 제한됩니다. 요약, 오타 교정, 댓글 감정 분석 등
+    모든 LLM 호출은 이 서비스를 거칩니다. 동기 코드(작업 워커)에서는 chat_sync/run을,
+    async 코드에서는 chat을 사용합니다.
+
+    루프 스레드는 fork된 자식 프로세스로 이어지지 않으므로, 만든 프로세스(pid)와 다른 프로세스에서
+    처음 사용하면 루프와 (직접 만든) 클라이언트를 새로 만듭니다.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = 8, timeout: float = 60.0, max_connections: int = 20,
+                 client: Optional[AsyncOpenAI] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = client
+        self._owns_client = client is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _reset_after_fork(self):
+        # 부모의 루프는 이 프로세스에서 돌고 있지 않고 잠금은 잠긴 채로 복사됐을 수 있으므로 모두 버립니다
+        self._lock = threading.Lock()
+        self._loop = None
+        self._semaphore = None
+        if self._owns_client:
+            self._client = None
+        self._pid = os.getpid()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="sumclip-llm", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _ensure_client(self) -> AsyncOpenAI:
+        # 이벤트 루프 스레드 안에서만 호출되므로 별도 잠금이 필요 없습니다
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                    timeout=self.timeout,
+                ),
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _chat(self, messages: list, model: str, timeout: Optional[float], **kwargs) -> str:
+        client = self._ensure_client()
+        async with self._semaphore:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=timeout or self.timeout,
+                **kwargs,
+            )
+        return response.choices[0].message.content.strip()
+
+    def run(self, coro):
+        """코루틴을 서비스 이벤트 루프에서 실행하고 결과를 기다립니다 (동기 코드용)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def chat(self, messages: list, model: str = "gpt-4o-mini", timeout: Optional[float] = None,
+                   **kwargs) -> str:
+        """채팅 완성 응답 문자열을 반환합니다. 어느 이벤트 루프에서 호출해도 서비스 루프에서 실행됩니다."""
+        coro = self._chat(messages, model, timeout, **kwargs)
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def chat_sync(self, messages: list, model: str = "gpt-4o-mini", timeout: Optional[float] = None,
+                  **kwargs) -> str:
+        return self.run(self._chat(messages, model, timeout, **kwargs))
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None and self._owns_client:
+            asyncio.run_coroutine_threadsafe(self._client.close(), loop).result()
+            self._client = None
+        self._semaphore = None
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def create_llm_client() -> LLMClient:
+    """설정값(OPENAI_API_KEY, OPENAI_BASE_URL, LLM_*)으로 LLMClient를 만듭니다."""
+    return LLMClient(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+    )
+
+
+llm_client = create_llm_client()
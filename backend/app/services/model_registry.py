@@ -0,0 +1,130 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.utils.helpers import current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+class WhisperModelRegistry:
+    """
+    프로세스 단위로 Whisper 모델을 한 번만 로드해 작업 간에 공유하는 레지스트리.
+
+    Whisper의 디코딩은 모델 내부 상태(kv-cache hook)를 사용하므로 한 인스턴스를 동시에 쓰지 않도록
+    모델 이름마다 최대 pool_size개의 인스턴스를 두고 acquire()로 배타적으로 빌려 씁니다.
+    """
+
+    def __init__(self, pool_size: int = 1, device: Optional[str] = None, wait_poll_seconds: float = 1.0):
+        self.pool_size = max(pool_size, 1)
+        self.device = device
+        self.wait_poll_seconds = wait_poll_seconds
+        self._pools: Dict[str, queue.Queue] = {}
+        self._loaded: Dict[str, int] = {}
+        self._metrics: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, model_name: str):
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        import whisper
+
+        model = whisper.load_model(model_name, device=self.device)
+        load_seconds = time.perf_counter() - started
+        rss_delta = current_rss_mb() - rss_before
+
+        with self._lock:
+            metrics = self._metrics.setdefault(model_name, {
+                "instances": 0, "load_seconds": [], "rss_delta_mb": [], "acquires": 0, "wait_seconds": 0.0,
+            })
+            metrics["instances"] += 1
+            metrics["load_seconds"].append(round(load_seconds, 3))
+            metrics["rss_delta_mb"].append(round(rss_delta, 1))
+        logger.info(f"Loaded Whisper model '{model_name}' in {load_seconds:.2f}s (+{rss_delta:.0f} MB RSS)")
+        return model
+
+    def _pool(self, model_name: str) -> queue.Queue:
+        with self._lock:
+            if model_name not in self._pools:
+                self._pools[model_name] = queue.Queue()
+                self._loaded[model_name] = 0
+            return self._pools[model_name]
+
+    def _reserve_slot(self, model_name: str) -> bool:
+        """아직 pool_size만큼 로드하지 않았다면 새 인스턴스를 로드할 자리를 예약합니다."""
+        with self._lock:
+            if self._loaded[model_name] < self.pool_size:
+                self._loaded[model_name] += 1
+                return True
+            return False
+
+    @contextmanager
+    def acquire(self, model_name: Optional[str] = None):
+        """모델 인스턴스 하나를 빌려오고 with 블록이 끝나면 반납합니다."""
+        model_name = model_name or settings.WHISPER_MODEL
+        pool = self._pool(model_name)
+        started = time.perf_counter()
+
+        while True:
+            try:
+                model = pool.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            if self._reserve_slot(model_name):
+                try:
+                    model = self._load(model_name)
+                except Exception:
+                    with self._lock:
+                        self._loaded[model_name] -= 1
+                    raise
+                break
+            # 다른 스레드가 로드 중인 인스턴스를 기다립니다. 그 로드가 실패하면 풀에 아무것도 들어오지 않으므로
+            # 일정 간격마다 빈 자리가 생겼는지 다시 확인해 이 스레드가 직접 로드합니다
+            try:
+                model = pool.get(timeout=self.wait_poll_seconds)
+                break
+            except queue.Empty:
+                continue
+
+        with self._lock:
+            metrics = self._metrics[model_name]
+            metrics["acquires"] += 1
+            metrics["wait_seconds"] += time.perf_counter() - started
+
+        try:
+            yield model
+        finally:
+            pool.put(model)
+
+    def warm(self, model_names: Iterable[str]):
+        """지정한 모델들을 pool_size만큼 미리 로드합니다."""
+        for model_name in model_names:
+            pool = self._pool(model_name)
+            while self._reserve_slot(model_name):
+                try:
+                    pool.put(self._load(model_name))
+                except Exception:
+                    with self._lock:
+                        self._loaded[model_name] -= 1
+                    raise
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                name: {**values, "idle": self._pools[name].qsize(), "wait_seconds": round(values["wait_seconds"], 3)}
+                for name, values in self._metrics.items()
+            }
+
+
+whisper_registry = WhisperModelRegistry(pool_size=settings.WHISPER_POOL_SIZE, device=settings.WHISPER_DEVICE)
+
+
+def warm_whisper_models():
+    """설정에 따라 워커 시작 시 Whisper 모델을 미리 로드합니다."""
+    if settings.WHISPER_WARMUP:
+        whisper_registry.warm([settings.WHISPER_MODEL])
@@ -0,0 +1,196 @@
+import logging
+import os
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Video
+from app.services.analysis_store import replace_analyses, save_analysis
+from app.services.blob_store import sweep_if_due
+from app.services.audio2text import load_segments, process_audio_from_videos, save_transcription
+from app.services.captions import fetch_caption_transcript
+from app.services.comment_analyzer import visualize_sentiment_analysis
+from app.services.comment_store import (
+    comment_snapshot,
+    fetch_new_comments,
+    load_chart_rows,
+    sentiment_frame,
+    store_comments,
+)
+from app.services.renderer import render_charts
+from app.services.result_cache import find_video, get_or_reset_video, serialize_result
+from app.services.summarize import summarizer
+from app.services.TextViz import count_nouns, generate_treemap_with_squarify, generate_wordcloud
+from app.services.video2audio import process_youtube_video
+from app.utils.workspace import JobWorkspace
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_QUERY = """당신은 동영상의 Script를 읽고 요약문을 작성하는 Agent입니다. 주어지는 text를 읽고 동영상의 내용을 500자 이내로 요약하세요.
+                                출력 형식은
+                                [간단 요약]
+                                [핵심 내용]
+                                [중요 포인트]
+                                입니다."""
+
+# 작업 진행 상황 보고에 사용되는 단계 이름 (순서대로 실행됨, 자막을 쓰면 download는 생략될 수 있음)
+STAGES = ("captions", "download", "transcribe", "summarize", "analyze", "visualize", "save")
+
+
+def run_summary_pipeline(url: str, youtube_id: str, report: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    다운로드 → 전사 → 요약 → 댓글/키워드 분석 → 시각화 → 저장까지 전체 파이프라인을 동기적으로 실행합니다.
+    댓글이 없거나 가져오지 못하면 감정 차트만 빼고 요약과 키워드 분석은 그대로 저장합니다.
+
+    블로킹 라이브러리(yt-dlp, OpenCV, Whisper, OpenAI)를 직접 호출하므로 이벤트 루프가 아닌
+    작업 워커에서 실행해야 합니다. report는 각 단계 시작 시 단계 이름과 함께 호출됩니다.
+    오래 걸리는 단계는 DB 세션 없이 실행하고, Video, 댓글, Analysis 행은 마지막에
+    하나의 짧은 트랜잭션으로 한 번에 씁니다.
+    """
+    report = report or (lambda stage: None)
+    workspace = JobWorkspace()
+    try:
+        logger.info(f"Processing URL: {url} (video {youtube_id}) in {workspace.path}")
+
+        caption_transcript = None
+        if settings.CAPTIONS_ENABLED:
+            report("captions")
+            caption_transcript = fetch_caption_transcript(url, workspace.path)
+
+        # 자막을 쓰더라도 프레임 분석이 켜져 있으면 영상은 받아야 합니다
+        if caption_transcript is None or settings.EXTRACT_FRAMES:
+            report("download")
+            audio_path = process_youtube_video(url, workspace)
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        report("transcribe")
+        if caption_transcript is not None:
+            logger.info(f"Using YouTube captions for video {youtube_id}; skipping Whisper")
+            save_transcription(caption_transcript, workspace)
+        else:
+            process_audio_from_videos([audio_path], workspace)
+
+        with open(workspace.refined_text_path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        segments = load_segments(workspace)
+        report("summarize")
+        # 교정본은 교정 청크가 한 줄씩 저장되어 있으므로, 긴 글은 교정된 청크를 그대로 map 단계에 넘깁니다
+        refined_chunks = [{"text": line} for line in text.splitlines() if line.strip()]
+        simple, core, point = summarizer().generate(text, SUMMARY_QUERY, segments=refined_chunks)
+
+        report("analyze")
+        # 한 줄짜리 전체 텍스트 대신 세그먼트를 넘겨야 Kiwi가 여러 스레드로 나눠 분석합니다
+        nouns = count_nouns(segments or text)
+        # 증분 수집 기준과 기존 차트 행만 짧게 읽고 세션을 닫습니다
+        db = SessionLocal()
+        try:
+            existing = find_video(db, youtube_id, url)
+            existing_id = existing.id if existing is not None else None
+            newest, known_ids = comment_snapshot(db, existing_id)
+            stored_rows = load_chart_rows(db, existing_id)
+        finally:
+            db.close()
+        # 댓글은 선택 사항입니다. 댓글이 없거나 꺼져 있거나 API가 실패해도 이미 만든 요약은 저장합니다
+        try:
+            new_comments = fetch_new_comments(youtube_id, newest, known_ids)
+        except Exception as e:
+            logger.warning(f"Could not fetch comments for video {youtube_id}; saving without them: {str(e)}")
+            new_comments = None
+
+        report("visualize")
+        chart_tasks = {
+            'wordcloud': (generate_wordcloud, nouns),
+            'tree': (generate_treemap_with_squarify, nouns),
+        }
+        if stored_rows or new_comments:
+            chart_tasks['sentiment'] = (visualize_sentiment_analysis, sentiment_frame(stored_rows, new_comments))
+        else:
+            logger.info(f"No comments for video {youtube_id}; skipping the sentiment chart")
+        visualizations = render_charts(chart_tasks)
+
+        report("save")
+        for viz_type in [viz_type for viz_type, image_data in visualizations.items() if not image_data]:
+            logger.warning(f"No image data generated for {viz_type}")
+            del visualizations[viz_type]
+
+        db = SessionLocal()
+        try:
+            video = get_or_reset_video(db, youtube_id, url)
+            video.simple_summary = simple
+            video.core_summary = core
+            video.point_summary = point
+            video.noun_counts = [[noun, count] for noun, count in nouns.most_common(settings.NOUN_TABLE_SIZE)]
+            db.flush()
+            # 수집에 실패했으면 이전 댓글 상태와 갱신 시각을 그대로 둡니다
+            if new_comments is not None:
+                store_comments(db, video, new_comments)
+            replace_analyses(db, video.id, visualizations)
+            db.commit()
+            result = serialize_result(video, cached=False)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        logger.info(f"Summary and visualizations generated for video {youtube_id}")
+        # 재분석으로 더 이상 참조되지 않는 이전 이미지를 주기적으로 정리합니다
+        sweep_if_due()
+        return result
+    except Exception:
+        if os.path.exists(workspace.path):
+            logger.error(f"Workspace contents: {os.listdir(workspace.path)}")
+        raise
+    finally:
+        workspace.cleanup()
+
+
+def run_comment_refresh(video_id: int) -> Optional[dict]:
+    """
+    저장된 영상의 새 댓글만 가져와 분류하고 감정 차트를 다시 그립니다. 영상이 없으면 None을 반환합니다.
+    댓글 수집과 렌더링은 세션 없이 하고, 저장만 짧은 트랜잭션으로 합니다.
+    """
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video is None:
+            return None
+        youtube_id = video.youtube_id
+        newest, known_ids = comment_snapshot(db, video_id)
+        stored_rows = load_chart_rows(db, video_id)
+    finally:
+        db.close()
+
+    new_comments = fetch_new_comments(youtube_id, newest, known_ids)
+    image_data = None
+    if new_comments:
+        sentiment_df = sentiment_frame(stored_rows, new_comments)
+        image_data = render_charts({'sentiment': (visualize_sentiment_analysis, sentiment_df)})['sentiment']
+
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video is None:
+            return None
+        new_count = store_comments(db, video, new_comments)
+        if image_data:
+            save_analysis(db, video.id, 'sentiment', image_data)
+
+        db.commit()
+        result = {
+            "video_id": video.id,
+            "new_comments": new_count,
+            "sentiment_counts": video.sentiment_counts,
+            "refreshed_at": video.comments_refreshed_at,
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    # 댓글 갱신마다 새 감정 차트가 저장되므로 이전 차트 blob을 주기적으로 정리합니다
+    sweep_if_due()
+    return result
@@ -0,0 +1,64 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def _init_render_worker():
+    # 차트마다 반복하지 않도록 Agg 백엔드, 글꼴 등록, 그리기 라이브러리 import를 워커 시작 시 한 번만 합니다
+    from app.services.TextViz import load_fonts
+    import squarify  # noqa: F401
+    import wordcloud  # noqa: F401
+
+    load_fonts()
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    차트 렌더링용 프로세스 풀을 반환합니다. RENDER_WORKERS가 0이면 None을 반환하며,
+    이때 차트는 호출한 스레드에서 차례로 그려집니다.
+    """
+    global _render_pool
+    if settings.RENDER_WORKERS <= 0:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=settings.RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker,
+            )
+        return _render_pool
+
+
+def shutdown_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def render_charts(tasks: Dict[str, Tuple[Callable, ...]]) -> Dict[str, bytes]:
+    """
+    {이름: (렌더 함수, *인자)} 형태의 차트들을 렌더링 풀에서 병렬로 그려 {이름: PNG 바이트}로 반환합니다.
+    렌더 함수와 인자는 다른 프로세스로 넘어가므로 모듈 최상위 함수와 pickle 가능한 값이어야 합니다.
+    """
+    started = time.perf_counter()
+    pool = get_render_pool()
+    if pool is None:
+        images = {name: fn(*args) for name, (fn, *args) in tasks.items()}
+    else:
+        futures = {name: pool.submit(fn, *args) for name, (fn, *args) in tasks.items()}
+        images = {name: future.result() for name, future in futures.items()}
+    logger.info(f"Rendered {', '.join(images)} in {time.perf_counter() - started:.2f}s")
+    return images
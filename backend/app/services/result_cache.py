@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.models import Analysis, Video
+
+
+def is_stale(video: Video, ttl_seconds: int, now: Optional[datetime] = None) -> bool:
+    """
+    저장된 요약이 TTL을 넘겼는지 확인합니다. ttl_seconds가 0 이하이면 만료되지 않습니다.
+    댓글 갱신은 updated_at만 바꾸므로 TTL을 늘리지 않습니다.
+    """
+    if ttl_seconds <= 0:
+        return False
+    if video.summarized_at is None:
+        return True
+    now = now or datetime.now()
+    return now - video.summarized_at > timedelta(seconds=ttl_seconds)
+
+
+def lookup_cached_result(db: Session, youtube_id: str, ttl_seconds: int) -> Optional[Video]:
+    """
+    YouTube 비디오 ID로 저장된 요약 결과를 조회합니다.
+    결과가 없거나 TTL이 지난 경우 None을 반환합니다.
+    """
+    video = db.query(Video).filter(Video.youtube_id == youtube_id).first()
+    if video is None or is_stale(video, ttl_seconds):
+        return None
+    return video
+
+
+def find_video(db: Session, youtube_id: str, url: str) -> Optional[Video]:
+    """youtube_id로, 또는 youtube_id가 채워지기 전에 저장된 행이면 링크로 Video를 찾습니다."""
+    return db.query(Video)\
+        .filter(or_(Video.youtube_id == youtube_id, Video.youtube_link == url))\
+        .first()
+
+
+def get_or_reset_video(db: Session, youtube_id: str, url: str) -> Video:
+    """
+    캐시 미스(만료, force 갱신 포함) 시 결과를 저장할 Video 행을 준비합니다.
+    기존 행이 있으면 youtube_link의 unique 제약을 지키기 위해 그대로 재사용하고
+    이전 분석 결과는 삭제합니다. youtube_id가 채워지기 전에 저장된 행은 링크로 찾아 보정합니다.
+    """
+    video = find_video(db, youtube_id, url)
+    if video is None:
+        video = Video(youtube_id=youtube_id, youtube_link=url)
+        db.add(video)
+        return video
+
+    db.query(Analysis).filter(Analysis.video_id == video.id).delete(synchronize_session=False)
+    video.youtube_id = youtube_id
+    video.summarized_at = datetime.now()
+    return video
+
+
+def serialize_result(video: Video, cached: bool) -> dict:
+    return {
+        "simple": video.simple_summary,
+        "core": video.core_summary,
+        "point": video.point_summary,
+        "video_id": video.id,
+        "cached": cached,
+    }
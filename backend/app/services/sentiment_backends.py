@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.comment_analyzer import BATCH_SENTIMENT_PROMPT, SENTIMENT_FAILED, analyze_sentiments
+from app.services.llm_client import LLMClient, llm_client
+from app.services.sentiment_cache import SentimentResultCache, comment_hash, sentiment_cache
+
+# scikit-learn/joblib/numpy/pandas는 local/hybrid 백엔드에서만 필요하므로 그 경로에서 처음 쓸 때 불러옵니다.
+# 기본 LLM 백엔드만 쓰는 프로세스는 이 패키지들을 import하지 않습니다.
+if TYPE_CHECKING:
+    import numpy as np
+    from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentBackend:
+    """댓글 목록을 받아 같은 순서의 '긍정'/'부정'/'중립' 라벨 목록을 반환하는 감정 분석 백엔드"""
+
+    name = "base"
+    # 캐시 키에 포함되는 모델/프롬프트 버전. 결과가 달라질 수 있는 변경이 있으면 값도 달라져야 합니다.
+    version = "base"
+
+    def classify(self, texts: List[str]) -> List[str]:
+        raise NotImplementedError
+
+
+class LLMSentimentBackend(SentimentBackend):
+    """공유 LLM 클라이언트로 배치 분류하는 백엔드"""
+
+    name = "llm"
+    version = "llm:gpt-4o-mini:" + hashlib.sha256(BATCH_SENTIMENT_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+    def __init__(self, client: Optional[LLMClient] = None):
+        self.client = client or llm_client
+
+    def classify(self, texts: List[str]) -> List[str]:
+        if not texts:
+            return []
+        return self.client.run(analyze_sentiments(self.client, list(texts)))
+
+
+class LocalSentimentBackend(SentimentBackend):
+    """
+    CPU에서 동작하는 로컬 분류기. 문자 n-gram TF-IDF와 로지스틱 회귀로 띄어쓰기나 맞춤법이
+    불규칙한 한국어 댓글도 형태소 분석 없이 분류하며, 여러 댓글을 한 번의 predict로 처리합니다.
+    """
+
+    name = "local"
+
+    def __init__(self, model: "Pipeline", version: Optional[str] = None):
+        self.model = model
+        self.version = version or f"local:unsaved-{id(model):x}"
+
+    @staticmethod
+    def build_pipeline() -> "Pipeline":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+
+        return Pipeline([
+            ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(1, 4), sublinear_tf=True, max_features=200000)),
+            ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+        ])
+
+    @classmethod
+    def train(cls, texts: List[str], labels: List[str]) -> "LocalSentimentBackend":
+        model = cls.build_pipeline()
+        model.fit(list(texts), list(labels))
+        return cls(model)
+
+    @classmethod
+    def train_from_csv(cls, csv_path: str, text_column: str = "text",
+                       label_column: str = "sentiment") -> "LocalSentimentBackend":
+        """text/sentiment 열을 가진 라벨링된 CSV로 학습합니다. '분석 실패' 등 알 수 없는 라벨은 제외합니다."""
+        import pandas as pd
+
+        df = pd.read_csv(csv_path)
+        df = df[df[label_column].isin(["긍정", "부정", "중립"])].dropna(subset=[text_column])
+        return cls.train(df[text_column].astype(str).tolist(), df[label_column].tolist())
+
+    @classmethod
+    def load(cls, model_path: str) -> "LocalSentimentBackend":
+        import joblib
+
+        with open(model_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        return cls(joblib.load(model_path), version=f"local:{digest}")
+
+    def save(self, model_path: str):
+        import joblib
+
+        os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+        joblib.dump(self.model, model_path)
+
+    def predict_with_confidence(self, texts: List[str]) -> Tuple[List[str], "np.ndarray"]:
+        """각 댓글의 예측 라벨과 그 라벨의 확률(신뢰도)을 반환합니다."""
+        import numpy as np
+
+        if not texts:
+            return [], np.zeros(0)
+        probabilities = self.model.predict_proba(list(texts))
+        best = probabilities.argmax(axis=1)
+        labels = self.model.classes_[best].tolist()
+        return labels, probabilities[np.arange(len(best)), best]
+
+    def classify(self, texts: List[str]) -> List[str]:
+        return self.predict_with_confidence(texts)[0]
+
+
+class HybridSentimentBackend(SentimentBackend):
+    """
+    로컬 모델로 모든 댓글을 먼저 분류하고, 신뢰도가 threshold보다 낮은 댓글만 fallback(LLM)으로 보냅니다.
+    LLM이 실패한 댓글은 로컬 예측을 그대로 사용하므로 API가 느리거나 장애일 때도 결과를 냅니다.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, local: LocalSentimentBackend, fallback: SentimentBackend, threshold: float = 0.6):
+        self.local = local
+        self.fallback = fallback
+        self.threshold = threshold
+        self.version = f"hybrid:{local.version}:{fallback.version}:{threshold}"
+
+    def classify(self, texts: List[str]) -> List[str]:
+        import numpy as np
+
+        labels, confidences = self.local.predict_with_confidence(texts)
+        uncertain = np.flatnonzero(confidences < self.threshold)
+        if len(uncertain) == 0:
+            return labels
+
+        try:
+            fallback_labels = self.fallback.classify([texts[i] for i in uncertain])
+        except Exception as e:
+            logger.warning(f"Fallback sentiment backend failed, keeping local predictions: {str(e)}")
+            return labels
+
+        for i, label in zip(uncertain, fallback_labels):
+            if label != SENTIMENT_FAILED:
+                labels[i] = label
+        return labels
+
+
+class CachedSentimentBackend(SentimentBackend):
+    """
+    다른 백엔드를 감싸 캐시에 없는 댓글만 분류합니다. 같은 댓글이 여러 번 나와도 한 번만 분류하며,
+    '분석 실패'는 저장하지 않아 다음 요청에서 다시 시도됩니다.
+    """
+
+    def __init__(self, backend: SentimentBackend, cache: SentimentResultCache):
+        self.backend = backend
+        self.cache = cache
+        self.name = f"cached-{backend.name}"
+        self.version = backend.version
+
+    def classify(self, texts: List[str]) -> List[str]:
+        hashes = [comment_hash(text) for text in texts]
+        labels = self.cache.get_many(hashes, self.version)
+
+        misses = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in labels and text_hash not in misses:
+                misses[text_hash] = text
+
+        if misses:
+            predicted = dict(zip(misses, self.backend.classify(list(misses.values()))))
+            labels.update(predicted)
+            self.cache.put_many(
+                {text_hash: label for text_hash, label in predicted.items() if label != SENTIMENT_FAILED},
+                self.version,
+            )
+
+        return [labels[text_hash] for text_hash in hashes]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_sentiment_backend() -> SentimentBackend:
+    """
+    설정(SENTIMENT_BACKEND: llm/local/hybrid)에 맞는 백엔드를 프로세스당 한 번 만들어 반환합니다.
+    로컬 모델 파일이 없으면 LLM 백엔드를 사용합니다.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+
+        kind = settings.SENTIMENT_BACKEND
+        model_path = settings.SENTIMENT_MODEL_PATH
+        if kind in ("local", "hybrid") and model_path and os.path.exists(model_path):
+            local = LocalSentimentBackend.load(model_path)
+            if kind == "local":
+                _backend = local
+            else:
+                _backend = HybridSentimentBackend(local, LLMSentimentBackend(), settings.SENTIMENT_CONFIDENCE_THRESHOLD)
+        else:
+            if kind != "llm":
+                logger.warning(f"Sentiment model not found at {model_path}; using the LLM backend")
+            _backend = LLMSentimentBackend()
+
+        if settings.SENTIMENT_CACHE_ENABLED:
+            _backend = CachedSentimentBackend(_backend, sentiment_cache)
+        return _backend
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.services.sentiment_backends <labeled.csv> <model output path>
+    logging.basicConfig(level=logging.INFO)
+    backend = LocalSentimentBackend.train_from_csv(sys.argv[1])
+    backend.save(sys.argv[2])
+    logger.info(f"Saved sentiment model ({', '.join(backend.model.classes_)}) to {sys.argv[2]}")
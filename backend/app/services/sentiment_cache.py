@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database import SessionLocal
+from app.models.models import SentimentCache
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_comment(text: str) -> str:
+    """캐시 키 계산용 정규화: NFKC, 소문자, 연속 공백 축약"""
+    text = unicodedata.normalize("NFKC", str(text))
+    return WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+
+
+def comment_hash(text: str) -> str:
+    return hashlib.sha256(normalize_comment(text).encode("utf-8")).hexdigest()
+
+
+class SentimentResultCache:
+    """
+    댓글 감정 분석 결과 캐시. 프로세스 내 LRU를 먼저 보고, 없으면 sentiment_cache 테이블을 조회합니다.
+    키는 정규화한 댓글 텍스트의 해시와 모델/프롬프트 버전입니다. DB를 쓸 수 없으면 LRU만으로 동작합니다.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_entries: int = 50000):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: tuple, sentiment: str):
+        self._entries[key] = sentiment
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, hashes: Iterable[str], version: str) -> Dict[str, str]:
+        found = {}
+        remaining = []
+        with self._lock:
+            for text_hash in set(hashes):
+                key = (text_hash, version)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[text_hash] = self._entries[key]
+                else:
+                    remaining.append(text_hash)
+            self.memory_hits += len(found)
+
+        if remaining:
+            db_found = self._load(remaining, version)
+            with self._lock:
+                for text_hash, sentiment in db_found.items():
+                    self._remember((text_hash, version), sentiment)
+                self.db_hits += len(db_found)
+                self.misses += len(remaining) - len(db_found)
+            found.update(db_found)
+        return found
+
+    def _load(self, hashes: List[str], version: str) -> Dict[str, str]:
+        db = self.session_factory()
+        try:
+            rows = db.query(SentimentCache.text_hash, SentimentCache.sentiment)\
+                .filter(SentimentCache.model_version == version)\
+                .filter(SentimentCache.text_hash.in_(hashes))\
+                .all()
+            return {text_hash: sentiment for text_hash, sentiment in rows}
+        except SQLAlchemyError as e:
+            logger.warning(f"Sentiment cache lookup failed: {str(e)}")
+            return {}
+        finally:
+            db.close()
+
+    def put_many(self, results: Dict[str, str], version: str):
+        if not results:
+            return
+        with self._lock:
+            for text_hash, sentiment in results.items():
+                self._remember((text_hash, version), sentiment)
+
+        db = self.session_factory()
+        try:
+            existing = {
+                text_hash for (text_hash,) in db.query(SentimentCache.text_hash)
+                .filter(SentimentCache.model_version == version)
+                .filter(SentimentCache.text_hash.in_(list(results)))
+            }
+            db.add_all([
+                SentimentCache(text_hash=text_hash, model_version=version, sentiment=sentiment)
+                for text_hash, sentiment in results.items() if text_hash not in existing
+            ])
+            db.commit()
+        except SQLAlchemyError as e:
+            # 다른 워커가 같은 키를 먼저 저장한 경우 등은 무시해도 됩니다
+            db.rollback()
+            logger.warning(f"Sentiment cache store failed: {str(e)}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+sentiment_cache = SentimentResultCache()
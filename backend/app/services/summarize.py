@@ -1,30 +1,146 @@
-import os
+import asyncio
+import logging
+import re
+from functools import lru_cache
 
-import openai
-import pandas as pd
+from app.core.config import settings
+from app.services.llm_client import LLMClient, llm_client
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_PATTERN = re.compile(r"[^.!?。\n]+[.!?。]?")
+
+CHUNK_QUERY = """당신은 긴 동영상 Script의 일부를 읽고 요약하는 Agent입니다.
+                주어지는 text는 전체 Script 중 한 부분입니다. 이 부분의 주요 내용과 중요한 사실, 수치, 고유명사를
+                빠짐없이 담아 300자 이내로 요약하세요."""
+
+REFINE_QUERY = """당신은 오타를 교정하는 전문가입니다.
+                주어진 Text의 오타를 알맞게 교정한 Text를 내보내 주세요."""
+
+REDUCE_PREFIX = "다음은 하나의 동영상 Script를 구간별로 요약한 내용입니다. 구간 요약을 모두 종합해 답하세요.\n\n"
+
+
+@lru_cache(maxsize=None)
+def get_encoding():
+    """
+    tiktoken 인코딩을 처음 토큰을 셀 때 한 번만 불러옵니다. 인코딩 파일을 내려받을 수 있어
+    import 시점에는 불러오지 않으며, tiktoken이 없거나 불러올 수 없으면 None을 반환합니다.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:  # tiktoken이 없거나 인코딩을 받을 수 없는 환경
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    text의 토큰 수를 셉니다. tiktoken이 없으면 UTF-8 바이트 수로 근사합니다
+    (한글 한 글자 ≈ 3바이트 ≈ 1토큰, 영문 약 4글자 ≈ 1토큰).
+    """
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def split_sentences(text: str) -> list:
+    """Whisper segments가 없을 때 텍스트를 문장 단위 pseudo-segment로 나눕니다."""
+    return [{"text": sentence.strip()} for sentence in SENTENCE_PATTERN.findall(text) if sentence.strip()]
+
+
+def chunk_segments(segments: list, max_tokens: int) -> list:
+    """
+    segments(각각 text 키를 가진 dict)를 순서대로 이어 붙여 max_tokens를 넘지 않는 텍스트 청크로 나눕니다.
+    한 세그먼트가 max_tokens보다 길면 그 세그먼트만으로 청크를 만듭니다.
+    """
+    chunks = []
+    current, current_tokens = [], 0
+    for segment in segments:
+        text = str(segment["text"]).strip()
+        if not text:
+            continue
+        tokens = count_tokens(text)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def build_messages(text, query):
+    return [
+        {
+            "role": "system",
+            "content": query,
+        },
+        {
+            "role": "user",
+            "content": f"""{text}
+                        """,
+        },
+    ]
 
 
 class summarizer:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.client = openai.OpenAI(api_key=api_key)
-
-    def generate(self, text, query):
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": query,
-                },
-                {
-                    "role": "user",
-                    "content": f"""{text}
-                                """,
-                },
-            ],
-        )
-        response = response.choices[0].message.content.strip()
+    def __init__(self, client: LLMClient = None):
+        self.client = client or llm_client
+
+    def complete(self, text, query):
+        """query를 system 프롬프트로 하여 text에 대한 응답 문자열을 그대로 반환합니다."""
+        return self.client.chat_sync(build_messages(text, query))
+
+    async def acomplete(self, text, query):
+        return await self.client.chat(build_messages(text, query))
+
+    async def _complete_chunks(self, chunks, query):
+        # 요약 한 건이 공유 클라이언트의 동시 요청 한도를 독차지하지 않도록 별도로 제한합니다
+        semaphore = asyncio.Semaphore(settings.SUMMARY_CONCURRENCY)
+
+        async def complete_chunk(chunk):
+            async with semaphore:
+                return await self.acomplete(chunk, query)
+
+        return await asyncio.gather(*(complete_chunk(chunk) for chunk in chunks))
+
+    def refine(self, text, segments=None):
+        """
+        text의 오타를 교정해 교정된 청크 목록을 순서대로 반환합니다.
+        segments(없으면 문장 단위로 나눈 text)를 SUMMARY_CHUNK_TOKENS 이하 청크로 묶어 청크마다 따로 요청하므로
+        긴 영상도 한 번의 요청이 컨텍스트/출력 토큰 한도를 넘지 않으며, 결과 청크는 generate의 map 단계에 그대로 쓰입니다.
+        """
+        chunks = chunk_segments(segments if segments else split_sentences(text), settings.SUMMARY_CHUNK_TOKENS)
+        if len(chunks) <= 1:
+            return [self.complete(chunk, REFINE_QUERY) for chunk in chunks]
+        logger.info(f"Refining {len(chunks)} chunks")
+        return self.client.run(self._complete_chunks(chunks, REFINE_QUERY))
+
+    def map_reduce(self, chunks, query):
+        """
+        청크별 요약(map)을 동시에 요청한 뒤, 구간 요약들을 query로 한 번 더 요약(reduce)합니다.
+        """
+        partials = self.client.run(self._complete_chunks(chunks, CHUNK_QUERY))
+        sections = "\n\n".join(f"[구간 {i + 1}]\n{partial}" for i, partial in enumerate(partials))
+        return self.complete(REDUCE_PREFIX + sections, query)
+
+    def generate(self, text, query, segments=None):
+        """
+        text를 query 형식([간단 요약]/[핵심 내용]/[중요 포인트])으로 요약합니다.
+        text가 SUMMARY_CHUNK_TOKENS를 넘으면 segments(없으면 문장 단위로 나눈 text)를
+        청크로 묶어 map-reduce로 요약합니다.
+        """
+        max_tokens = settings.SUMMARY_CHUNK_TOKENS
+        if count_tokens(text) <= max_tokens:
+            response = self.complete(text, query)
+        else:
+            chunks = chunk_segments(segments if segments else split_sentences(text), max_tokens)
+            logger.info(f"Summarizing {len(chunks)} chunks with map-reduce")
+            response = self.map_reduce(chunks, query)
+
         simple = response.find('[간단 요약]')
         core = response.find('[핵심 내용]')
         point = response.find('[중요 포인트]')
@@ -36,6 +152,8 @@ class summarizer:
 
 
 if __name__ == "__main__":
+    import pandas as pd
+
     basepath = "./video/"
     df = pd.read_csv(basepath + "segments.csv")
     # txt파일의 경로를 바탕으로 요약합니다.
@@ -0,0 +1,74 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+def frame_energy(samples: np.ndarray, sample_rate: int, frame_ms: int = 30) -> np.ndarray:
+    """
+    오디오를 frame_ms 길이의 프레임으로 나눠 프레임별 RMS 에너지를 계산합니다.
+    """
+    frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def silent_runs(silent: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    True/False 배열에서 연속된 True 구간의 시작 인덱스와 끝 인덱스(미포함)를 반환합니다.
+    """
+    padded = np.concatenate(([False], silent, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def split_on_silence(samples: np.ndarray, sample_rate: int, target_chunk_seconds: float = 60.0,
+                     max_chunk_seconds: float = 120.0, min_silence_ms: int = 300,
+                     frame_ms: int = 30, threshold_ratio: float = 0.1,
+                     min_chunk_seconds: float = 5.0) -> List[Tuple[int, int]]:
+    """
+    에너지 기반 VAD로 무음 구간을 찾아 오디오를 청크로 나눕니다.
+
+    각 청크는 target_chunk_seconds 이상이 된 뒤 처음 만나는 무음 구간의 가운데에서 잘리며,
+    무음이 없으면 max_chunk_seconds에서 강제로 자릅니다. 무음 판정 임계값은
+    프레임 에너지 중앙값의 threshold_ratio배입니다.
+    마지막 청크가 min_chunk_seconds보다 짧으면(예: 끝부분의 짧은 무음) 따로 내보내지 않고
+    앞 청크에 붙이므로, 마지막 청크는 max_chunk_seconds를 그만큼 넘을 수 있습니다.
+    반환값은 (시작 샘플, 끝 샘플) 튜플의 리스트입니다.
+    """
+    total = len(samples)
+    if total == 0:
+        return []
+
+    energy = frame_energy(samples, sample_rate, frame_ms)
+    frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+    threshold = max(float(np.median(energy)) * threshold_ratio, 1e-4) if len(energy) else 0.0
+    starts, ends = silent_runs(energy < threshold)
+
+    min_silence_frames = max(int(min_silence_ms / frame_ms), 1)
+    long_enough = (ends - starts) >= min_silence_frames
+    cut_candidates = ((starts[long_enough] + ends[long_enough]) // 2) * frame_length
+
+    target = int(target_chunk_seconds * sample_rate)
+    max_length = int(max_chunk_seconds * sample_rate)
+    min_length = int(min_chunk_seconds * sample_rate)
+
+    chunks = []
+    chunk_start = 0
+    for cut in cut_candidates:
+        while cut - chunk_start > max_length:
+            chunks.append((chunk_start, chunk_start + max_length))
+            chunk_start += max_length
+        if cut - chunk_start >= target and total - cut >= max(min_length, 1):
+            chunks.append((chunk_start, int(cut)))
+            chunk_start = int(cut)
+
+    while total - chunk_start > max_length:
+        chunks.append((chunk_start, chunk_start + max_length))
+        chunk_start += max_length
+    if chunks and total - chunk_start < min_length:
+        chunk_start = chunks.pop()[0]
+    chunks.append((chunk_start, total))
+    return chunks
@@ -1,24 +1,30 @@
+import logging
 import os
-from glob import glob
+from typing import Optional
 
-import cv2
-import yt_dlp
-from moviepy import VideoFileClip
+import numpy as np
 
+from app.core.config import settings
+from app.utils.workspace import JobWorkspace
 
-def download_video_from_url(url: str):
+logger = logging.getLogger(__name__)
+
+
+def download_video_from_url(url: str, output_dir: str):
     """
-    Download a YouTube video from the given URL and save it locally.
+    Download a YouTube video from the given URL into output_dir.
     """
     ydl_opts = {
         "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-        "outtmpl": "video/%(title)s.%(ext)s",
+        "outtmpl": os.path.join(output_dir, "%(id)s.%(ext)s"),
         "quiet": True,
         "no_warnings": True,
         "extract_audio": True
     }
-    os.makedirs("video", exist_ok=True)
-    
+    os.makedirs(output_dir, exist_ok=True)
+
+    import yt_dlp
+
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         try:
             ydl.download([url])
@@ -26,67 +32,132 @@ def download_video_from_url(url: str):
             raise Exception(f"동영상 다운로드 실패: {str(e)}")
 
 
-def extract_frames(video_path: str, output_folder: str):
+def download_audio_from_url(url: str, output_dir: str) -> str:
     """
-    Extract frames from a video and save them as images.
+    Download only the best audio stream of a YouTube video as-is (no re-encoding).
+    The video stream is never fetched or muxed; decoding happens later in memory.
+    Returns the path of the downloaded audio file.
     """
-    os.makedirs(output_folder, exist_ok=True)
-    cap = cv2.VideoCapture(video_path)
-    success, frame = cap.read()
-    frame_count = 0
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "outtmpl": os.path.join(output_dir, "audio.%(ext)s"),
+        "quiet": True,
+        "no_warnings": True,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+
+    import yt_dlp
 
-    while success:
-        frame_count += 1
-        frame_file = f"{output_folder}/frame_{frame_count}.jpg"
-        cv2.imwrite(frame_file, frame)
-        success, frame = cap.read()
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        try:
+            info = ydl.extract_info(url, download=True)
+            return ydl.prepare_filename(info)
+        except Exception as e:
+            raise Exception(f"오디오 다운로드 실패: {str(e)}")
+
+
+def frame_signature(frame: np.ndarray, size=(64, 36)) -> np.ndarray:
+    """
+    Downscale a BGR frame to a small grayscale float array used for scene-change comparison.
+    """
+    import cv2
 
-    cap.release()
-    print(f"Extracted {frame_count} frames to {output_folder}.")
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
 
 
-def extract_audio(video_path: str, output_audio_file: str):
+def scene_changed(previous: Optional[np.ndarray], current: np.ndarray, threshold: float) -> bool:
     """
-    Extract audio from a video file and save it as an MP3.
+    Return True when the mean absolute pixel difference (0-1 scale) between two
+    frame signatures reaches the threshold.
     """
+    if previous is None:
+        return True
+    return float(np.mean(np.abs(current - previous))) / 255.0 >= threshold
+
+
+def extract_frames(video_path: str, output_folder: str, sample_fps: float = 1.0,
+                   scene_threshold: Optional[float] = None, max_frames: int = 300):
+    """
+    Extract keyframes from a video and save them as images.
+
+    Frames are sampled at sample_fps; frames that are skipped are only grabbed, not decoded
+    into images. With scene_threshold set, a sampled frame is kept only when it differs enough
+    from the last kept keyframe. At most max_frames files are written.
+    Returns the number of saved frames.
+    """
+    import cv2
+
+    os.makedirs(output_folder, exist_ok=True)
+    cap = cv2.VideoCapture(video_path)
+    native_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(int(round(native_fps / sample_fps)), 1) if sample_fps > 0 else 1
+
+    frame_index = 0
+    frame_count = 0
+    last_signature = None
+
     try:
-        video = VideoFileClip(video_path)
-        audio = video.audio
-        audio.write_audiofile(output_audio_file, verbose=False, logger=None)
+        while frame_count < max_frames and cap.grab():
+            if frame_index % step == 0:
+                success, frame = cap.retrieve()
+                if not success:
+                    break
+
+                keep = True
+                if scene_threshold is not None:
+                    signature = frame_signature(frame)
+                    keep = scene_changed(last_signature, signature, scene_threshold)
+                    if keep:
+                        last_signature = signature
+
+                if keep:
+                    frame_count += 1
+                    timestamp = frame_index / native_fps
+                    frame_file = f"{output_folder}/frame_{frame_count:04d}_{timestamp:.2f}s.jpg"
+                    cv2.imwrite(frame_file, frame)
+            frame_index += 1
     finally:
-        if 'audio' in locals():
-            audio.close()
-        if 'video' in locals():
-            video.close()
-        print(f"Audio extracted to {output_audio_file}")
+        cap.release()
+
+    logger.info(f"Extracted {frame_count} keyframes from {frame_index} frames to {output_folder}.")
+    return frame_count
 
 
-def process_youtube_video(url: str):
+def process_youtube_video(url: str, workspace: JobWorkspace, with_frames: Optional[bool] = None):
     """
-    Main function to download a YouTube video, extract its frames, and extract audio.
+    Main function to fetch the audio of a YouTube video into the given job workspace.
+
+    By default only the audio stream is downloaded. When frame analysis is requested
+    (with_frames or settings.EXTRACT_FRAMES), the full video is downloaded and its frames
+    are extracted. Either way the returned file is decoded to PCM in memory by the
+    transcription stage, so no intermediate audio file is written.
     """
-    # Step 1: Download the video
+    if with_frames is None:
+        with_frames = settings.EXTRACT_FRAMES
+
     try:
-        print(f"Downloading video from URL: {url}")
-        download_video_from_url(url)
+        if not with_frames:
+            logger.info(f"Downloading audio from URL: {url}")
+            return download_audio_from_url(url, workspace.path)
 
-        # Step 2: Locate the downloaded video
-        video_folder = "video"
-        video_files = glob(f"{video_folder}/*.mp4")
-        if not video_files:
-            raise FileNotFoundError("No video file found after download.")
+        # Step 1: Download the video
+        logger.info(f"Downloading video from URL: {url}")
+        download_video_from_url(url, workspace.path)
 
-        video_path = video_files[0]
+        # Step 2: Locate the downloaded video
+        video_path = workspace.find_video()
 
         # Step 3: Extract frames
-        frames_folder = f"{video_folder}/frames"
-        extract_frames(video_path, frames_folder)
-
-        # Step 4: Extract audio
-        audio_file = f"{video_folder}/audio.mp3"
-        extract_audio(video_path, audio_file)
-
-        return audio_file
+        extract_frames(
+            video_path,
+            workspace.frames_dir,
+            sample_fps=settings.FRAME_SAMPLE_FPS,
+            scene_threshold=settings.FRAME_SCENE_THRESHOLD,
+            max_frames=settings.FRAME_MAX_COUNT,
+        )
+
+        return video_path
     except Exception as e:
         raise Exception(f"동영상 처리 중 오류 발생: {str(e)}")
 
@@ -94,4 +165,6 @@ def process_youtube_video(url: str):
 if __name__ == "__main__":
     # Example: Replace with the YouTube URL you want to process
     youtube_url = input("Enter the YouTube video URL: ").strip()
-    process_youtube_video(youtube_url)
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    workspace = JobWorkspace(keep=True)
+    logger.info(f"Audio saved to {process_youtube_video(youtube_url, workspace)}")
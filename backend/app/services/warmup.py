@@ -0,0 +1,75 @@
+import importlib
+import logging
+import time
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.utils.helpers import current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+# 단계별로 처음 사용할 때 불러오는 무거운 의존성.
+# API 프로세스는 import 시점에 이 모듈들을 불러오지 않으며, 필요하면 warm_imports()로 미리 올립니다.
+STAGE_MODULES = {
+    "captions": ("yt_dlp",),
+    "download": ("yt_dlp", "cv2"),
+    "transcribe": ("torch", "whisper", "pandas"),
+    "analyze": ("pandas", "googleapiclient.discovery", "kiwipiepy", "kiwipiepy.utils"),
+    "visualize": ("matplotlib.figure", "wordcloud", "squarify", "plotly.express"),
+}
+
+# API 프로세스 import 후 sys.modules에 있으면 안 되는 최상위 패키지 (import_report의 기본 검사 대상)
+HEAVY_PACKAGES = (
+    "whisper", "torch", "cv2", "moviepy", "yt_dlp", "plotly", "networkx", "seaborn",
+    "koreanize_matplotlib", "matplotlib", "googleapiclient", "pandas", "kiwipiepy",
+    "wordcloud", "squarify", "sklearn",
+)
+
+
+def parse_stages(value: str) -> list:
+    """'transcribe,analyze' 또는 'all' 형식의 설정값을 단계 이름 목록으로 바꿉니다."""
+    stages = [stage.strip() for stage in value.split(",") if stage.strip()]
+    if "all" in stages:
+        return list(STAGE_MODULES)
+    return stages
+
+
+def warm_imports(stages: Optional[Iterable[str]] = None) -> dict:
+    """
+    지정한 단계의 무거운 의존성을 미리 import하고, analyze 단계라면 Kiwi 분석기도 만들어 둡니다.
+    단계별 소요 시간(초)과 RSS 증가량(MB)을 반환합니다.
+    """
+    stages = list(STAGE_MODULES) if stages is None else list(stages)
+    report = {}
+    for stage in stages:
+        if stage not in STAGE_MODULES:
+            logger.warning(f"Unknown warm-up stage: {stage}")
+            continue
+
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        for module_name in STAGE_MODULES[stage]:
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                logger.warning(f"Warm-up import of {module_name} failed: {e}")
+        if stage == "analyze":
+            from app.services.TextViz import get_kiwi, get_stopwords
+            get_kiwi()
+            get_stopwords()
+        if stage == "visualize":
+            from app.services.TextViz import load_fonts
+            load_fonts()
+
+        report[stage] = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+        }
+        logger.info(f"Warmed {stage} imports in {report[stage]['seconds']}s (+{report[stage]['rss_delta_mb']} MB RSS)")
+    return report
+
+
+def warm_configured_imports() -> dict:
+    """WARMUP_STAGES 설정에 적힌 단계만 미리 불러옵니다. 비어 있으면 아무것도 하지 않습니다."""
+    stages = parse_stages(settings.WARMUP_STAGES)
+    return warm_imports(stages) if stages else {}
@@ -0,0 +1,104 @@
+"""
+감정 산점도 렌더링 방식 벤치마크.
+
+같은 합성 댓글 데이터로 세 가지 방식을 각각 새 인터프리터에서 실행해 첫 호출 시간(import/초기화 포함),
+이후 반복 호출의 평균 시간, 출력 크기, 프로세스 RSS 증가량을 비교합니다.
+
+    plotly-kaleido : Plotly Figure → fig.to_image(format="png") (kaleido headless 브라우저)
+    matplotlib-agg : matplotlib Figure(Agg) → PNG
+    plotly-spec    : Plotly Figure → JSON spec (프론트엔드에서 렌더링)
+
+    python -m app.utils.chart_benchmark --comments 1000 --repeat 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from app.utils.workspace import BACKEND_DIR
+
+METHODS = ("matplotlib-agg", "plotly-spec", "plotly-kaleido")
+
+
+def sample_comments(count: int, seed: int = 0):
+    """벤치마크용 합성 댓글 DataFrame (text, likes, author, published_at, sentiment)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    published_at = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 30 * 24 * 3600, count), unit="s")
+    return pd.DataFrame({
+        "text": [f"댓글 {i}" for i in range(count)],
+        "likes": rng.zipf(1.8, count).clip(max=100000),
+        "author": [f"user{i % 97}" for i in range(count)],
+        "published_at": published_at,
+        "sentiment": rng.choice(["긍정", "부정", "중립"], count, p=[0.5, 0.2, 0.3]),
+    })
+
+
+def run_method(method: str, comments: int, repeat: int) -> dict:
+    """현재 프로세스에서 한 가지 방식을 실행하고 측정값을 반환합니다."""
+    from app.services.comment_analyzer import build_sentiment_figure, render_sentiment_scatter, sentiment_chart_spec
+    from app.utils.helpers import current_rss_mb
+
+    df = sample_comments(comments)
+    render = {
+        "matplotlib-agg": render_sentiment_scatter,
+        "plotly-spec": lambda df: json.dumps(sentiment_chart_spec(df)).encode(),
+        "plotly-kaleido": lambda df: build_sentiment_figure(df).to_image(format="png"),
+    }[method]
+
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    output = render(df)
+    first_seconds = time.perf_counter() - started
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(df)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "method": method,
+        "first_seconds": round(first_seconds, 3),
+        "mean_seconds": round(sum(timings) / len(timings), 3) if timings else None,
+        "output_kb": round(len(output) / 1024, 1),
+        # kaleido는 별도 브라우저 프로세스를 띄우므로 그 메모리는 여기에 포함되지 않습니다
+        "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="감정 산점도 렌더링 방식을 비교합니다.")
+    parser.add_argument("--comments", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("--only", choices=METHODS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.only:
+        print(json.dumps(run_method(args.only, args.comments, args.repeat)))
+        return 0
+
+    print(f"{'method':<16}{'first (s)':>11}{'mean (s)':>10}{'output KB':>11}{'RSS +MB':>9}")
+    for method in args.methods:
+        # import 비용과 메모리가 서로 섞이지 않도록 방식마다 새 인터프리터에서 실행합니다
+        completed = subprocess.run(
+            [sys.executable, "-m", "app.utils.chart_benchmark", "--only", method,
+             "--comments", str(args.comments), "--repeat", str(args.repeat)],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{method:<16}failed: {completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        row = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{method:<16}{row['first_seconds']:>11}{row['mean_seconds']:>10}{row['output_kb']:>11}{row['rss_delta_mb']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import os
+import resource
+import sys
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스의 상주 메모리(RSS)를 MB 단위로 반환합니다."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # /proc이 없는 환경(macOS 등)에서는 최대 RSS로 대신합니다.
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
@@ -0,0 +1,99 @@
+"""
+API 프로세스의 import 시간/메모리 예산 검사.
+
+새 인터프리터에서 `python -X importtime`으로 대상 모듈을 import한 뒤 누적 import 시간 상위 모듈,
+전체 import 시간, import 직후 RSS, 그리고 import되지 말아야 할 무거운 패키지가 올라왔는지를 보고합니다.
+예산을 넘으면 종료 코드 1을 반환하므로 CI에서 회귀 검사로 쓸 수 있습니다.
+
+    python -m app.utils.import_report --max-seconds 1.5 --max-rss-mb 150
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from app.services.warmup import HEAVY_PACKAGES
+from app.utils.workspace import BACKEND_DIR
+
+PROBE = """
+import json, sys
+import {module}
+from app.utils.helpers import current_rss_mb
+print(json.dumps({{"rss_mb": current_rss_mb(), "modules": sorted(sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr: str) -> list:
+    """`-X importtime` 출력을 (모듈 이름, 자기 시간 us, 누적 시간 us, 깊이) 목록으로 바꿉니다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure_imports(module: str = "app.main") -> dict:
+    """새 프로세스에서 module을 import하고 import 시간, RSS, 로드된 무거운 패키지를 측정합니다."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{completed.stderr[-2000:]}")
+
+    rows = parse_importtime(completed.stderr)
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    loaded = set(probe["modules"])
+    # 최상위(깊이 0) import의 누적 시간 합이 전체 import 시간입니다
+    total_us = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+
+    return {
+        "module": module,
+        "import_seconds": round(total_us / 1e6, 3),
+        "rss_mb": round(probe["rss_mb"], 1),
+        "heavy_loaded": [name for name in HEAVY_PACKAGES if name in loaded],
+        "slowest": sorted(
+            ({"module": name, "cumulative_ms": round(cumulative / 1000, 1)} for name, _, cumulative, _ in rows),
+            key=lambda row: row["cumulative_ms"],
+            reverse=True,
+        ),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API 프로세스의 import 시간/RSS 예산을 검사합니다.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    parser.add_argument("--allow-heavy", action="store_true", help="무거운 패키지가 import되어도 실패로 보지 않음")
+    args = parser.parse_args(argv)
+
+    report = measure_imports(args.module)
+    print(f"{report['module']}: {report['import_seconds']}s import, {report['rss_mb']} MB RSS")
+    for row in report["slowest"][:args.top]:
+        print(f"  {row['cumulative_ms']:>9.1f} ms  {row['module']}")
+
+    failures = []
+    if report["heavy_loaded"] and not args.allow_heavy:
+        failures.append(f"import 시점에 무거운 패키지가 로드됨: {', '.join(report['heavy_loaded'])}")
+    if args.max_seconds is not None and report["import_seconds"] > args.max_seconds:
+        failures.append(f"import 시간 {report['import_seconds']}s > 예산 {args.max_seconds}s")
+    if args.max_rss_mb is not None and report["rss_mb"] > args.max_rss_mb:
+        failures.append(f"RSS {report['rss_mb']} MB > 예산 {args.max_rss_mb} MB")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
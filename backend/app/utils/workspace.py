@@ -0,0 +1,70 @@
+import os
+import shutil
+import uuid
+from glob import escape, glob
+from typing import Optional
+
+from app.core.config import settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_WORKSPACE_ROOT = os.path.join(BACKEND_DIR, "video")
+
+
+class JobWorkspace:
+    """
+    파이프라인 실행 한 번에 사용되는 독립 작업 디렉토리.
+
+    다운로드한 영상, 추출한 오디오, 전사 결과 등 모든 중간 산출물은 이 디렉토리 안에만 저장되므로
+    동시에 실행되는 요청끼리 파일이 섞이지 않습니다. with 문으로 사용하면 종료 시 자동으로 삭제됩니다.
+    """
+
+    def __init__(self, root: Optional[str] = None, job_id: Optional[str] = None, keep: Optional[bool] = None):
+        self.root = root or settings.WORKSPACE_ROOT or DEFAULT_WORKSPACE_ROOT
+        self.job_id = job_id or uuid.uuid4().hex
+        self.path = os.path.join(self.root, self.job_id)
+        self.keep = settings.KEEP_WORKSPACE if keep is None else keep
+        os.makedirs(self.path, exist_ok=True)
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @property
+    def pcm_path(self) -> str:
+        return self.file("audio.f32")
+
+    @property
+    def frames_dir(self) -> str:
+        return self.file("frames")
+
+    @property
+    def segments_path(self) -> str:
+        return self.file("segments.csv")
+
+    @property
+    def original_text_path(self) -> str:
+        return self.file("all_text_original.txt")
+
+    @property
+    def refined_text_path(self) -> str:
+        return self.file("all_text_refined.txt")
+
+    def find_video(self) -> str:
+        """다운로드된 영상 파일 경로를 반환합니다."""
+        video_files = glob(os.path.join(escape(self.path), "*.mp4"))
+        if not video_files:
+            raise FileNotFoundError(f"No video file found in workspace {self.path}")
+        return video_files[0]
+
+    def cleanup(self):
+        if not self.keep:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> "JobWorkspace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+    def __repr__(self) -> str:
+        return f"JobWorkspace({self.path!r})"
+
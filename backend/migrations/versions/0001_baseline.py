@@ -0,0 +1,52 @@
+"""baseline: videos and analysis tables as they existed before migrations
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+
+마이그레이션 도입 전에 이미 이 테이블들이 있는 DB는 `alembic stamp 0001_baseline`으로 표시만 합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ANALYSIS_TYPES = ("wordcloud", "sentiment", "tree")
+
+
+def upgrade():
+    op.create_table(
+        "videos",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("youtube_link", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("simple_summary", sa.Text()),
+        sa.Column("core_summary", sa.Text()),
+        sa.Column("point_summary", sa.Text()),
+    )
+    op.create_index("ix_videos_id", "videos", ["id"])
+    op.create_index("ix_videos_youtube_link", "videos", ["youtube_link"], unique=True)
+    op.create_index("ix_videos_created_at", "videos", ["created_at"])
+
+    op.create_table(
+        "analysis",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("video_id", sa.Integer(), sa.ForeignKey("videos.id"), nullable=False),
+        sa.Column("analysis_type", sa.Enum(*ANALYSIS_TYPES, name="analysistype"), nullable=False),
+        sa.Column("image_data", sa.LargeBinary(), nullable=False),
+        sa.Column("image_format", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_analysis_id", "analysis", ["id"])
+    op.create_index("ix_analysis_created_at", "analysis", ["created_at"])
+    op.create_index("idx_video_analysis", "analysis", ["video_id", "analysis_type"])
+
+
+def downgrade():
+    op.drop_table("analysis")
+    op.drop_table("videos")
+    sa.Enum(name="analysistype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""videos.youtube_id and videos.updated_at for the result cache
+
+Revision ID: 0002_video_youtube_id
+Revises: 0001_baseline
+Create Date: 2026-10-18
+
+기존 행의 youtube_id는 비워 둡니다. 같은 영상을 다시 요청하면 get_or_reset_video가 링크로 행을 찾아 채웁니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_video_youtube_id"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("youtube_id", sa.String(11), nullable=True))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+        batch.create_index("ix_videos_youtube_id", ["youtube_id"], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_index("ix_videos_youtube_id")
+        batch.drop_column("updated_at")
+        batch.drop_column("youtube_id")
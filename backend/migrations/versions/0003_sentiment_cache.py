@@ -0,0 +1,28 @@
+"""sentiment_cache table for comment sentiment results
+
+Revision ID: 0003_sentiment_cache
+Revises: 0002_video_youtube_id
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_sentiment_cache"
+down_revision = "0002_video_youtube_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sentiment_cache",
+        sa.Column("text_hash", sa.String(64), primary_key=True),
+        sa.Column("model_version", sa.String(), primary_key=True),
+        sa.Column("sentiment", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("sentiment_cache")
@@ -0,0 +1,42 @@
+"""comments table and per-video comment aggregates for incremental refresh
+
+Revision ID: 0004_comments
+Revises: 0003_sentiment_cache
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_comments"
+down_revision = "0003_sentiment_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("sentiment_counts", sa.JSON(), nullable=True))
+        batch.add_column(sa.Column("comments_refreshed_at", sa.DateTime(), nullable=True))
+
+    op.create_table(
+        "comments",
+        sa.Column("comment_id", sa.String(), primary_key=True),
+        sa.Column("video_id", sa.Integer(), sa.ForeignKey("videos.id"), nullable=False),
+        sa.Column("parent_id", sa.String()),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("likes", sa.Integer()),
+        sa.Column("author", sa.String()),
+        sa.Column("published_at", sa.DateTime(), nullable=False),
+        sa.Column("sentiment", sa.String()),
+        sa.Column("fetched_at", sa.DateTime()),
+    )
+    op.create_index("idx_comment_video_published", "comments", ["video_id", "published_at"])
+
+
+def downgrade():
+    op.drop_index("idx_comment_video_published", table_name="comments")
+    op.drop_table("comments")
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("comments_refreshed_at")
+        batch.drop_column("sentiment_counts")
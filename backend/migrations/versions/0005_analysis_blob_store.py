@@ -0,0 +1,43 @@
+"""analysis images move to the content-addressed blob store
+
+Revision ID: 0005_analysis_blob_store
+Revises: 0004_comments
+Create Date: 2026-10-18
+
+새 행은 이미지를 blob 저장소에 두고 content_hash/size만 가지므로 image_data는 NULL을 허용합니다.
+스키마를 올린 뒤 기존 행의 이미지는 다음 명령으로 옮깁니다 (여러 번 실행해도 안전합니다).
+
+    alembic upgrade head
+    python -m app.services.blob_store
+
+옮기기 전의 행도 image_data에서 그대로 읽히므로 두 단계 사이에 서비스를 멈출 필요는 없습니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_analysis_blob_store"
+down_revision = "0004_comments"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("analysis") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("size", sa.Integer(), nullable=True))
+        batch.alter_column("image_data", existing_type=sa.LargeBinary(), nullable=True)
+        batch.create_index("ix_analysis_content_hash", ["content_hash"])
+
+
+def downgrade():
+    blob_only = op.get_bind().execute(sa.text("SELECT COUNT(*) FROM analysis WHERE image_data IS NULL")).scalar()
+    if blob_only:
+        raise RuntimeError(
+            f"{blob_only}개 analysis 행의 이미지가 blob 저장소에만 있어 image_data를 NOT NULL로 되돌릴 수 없습니다."
+        )
+    with op.batch_alter_table("analysis") as batch:
+        batch.drop_index("ix_analysis_content_hash")
+        batch.alter_column("image_data", existing_type=sa.LargeBinary(), nullable=False)
+        batch.drop_column("size")
+        batch.drop_column("content_hash")
@@ -0,0 +1,26 @@
+"""videos.noun_counts: stored noun frequency table for on-demand charts
+
+Revision ID: 0006_video_noun_counts
+Revises: 0005_analysis_blob_store
+Create Date: 2026-10-18
+
+기존 영상은 다시 분석할 때까지 값이 비어 있고, 그동안 /videos/{id}/wordcloud, /treemap은 404를 반환합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_video_noun_counts"
+down_revision = "0005_analysis_blob_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("noun_counts", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("noun_counts")
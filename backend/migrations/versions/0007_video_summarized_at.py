@@ -0,0 +1,28 @@
+"""videos.summarized_at: result cache TTL independent of comment refreshes
+
+Revision ID: 0007_video_summarized_at
+Revises: 0006_video_noun_counts
+Create Date: 2026-10-18
+
+기존 행은 updated_at(없으면 created_at)으로 채웁니다. 그 전에 댓글을 갱신한 행은 실제 요약 시각보다 늦게 잡힐 수 있지만,
+다음 재분석부터는 요약 시각이 정확히 기록됩니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_video_summarized_at"
+down_revision = "0006_video_noun_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("summarized_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE videos SET summarized_at = COALESCE(updated_at, created_at)")
+
+
+def downgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("summarized_at")
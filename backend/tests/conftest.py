@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+# app.core.config의 settings는 import 시점에 환경 변수를 읽으므로 app을 import하기 전에 테스트 환경을 준비합니다
+TEST_ROOT = tempfile.mkdtemp(prefix="sumclip-tests-")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", f"sqlite:///{os.path.join(TEST_ROOT, 'test.db')}")
+os.environ.setdefault("DATABASE_URL", os.environ["SQLALCHEMY_DATABASE_URL"])
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("BLOB_STORE_ROOT", os.path.join(TEST_ROOT, "blobs"))
+os.environ.setdefault("WORKSPACE_ROOT", os.path.join(TEST_ROOT, "video"))
+os.environ.setdefault("RENDER_WORKERS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.core.database import engine
+from app.models.models import Base
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    """테스트마다 빈 스키마에서 시작합니다."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client():
+    """API 라우터만 올린 TestClient. 시작 시 모델 워밍업은 하지 않습니다."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.endpoints import router
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,91 @@
+"""googleapiclient의 YouTube Data API 리소스를 흉내 내는 테스트용 가짜 객체."""
+
+
+class HttpError(Exception):
+    pass
+
+
+def snippet(text, likes=0, published_at="2025-01-01T00:00:00Z", author="user"):
+    return {
+        "textDisplay": text,
+        "likeCount": likes,
+        "authorDisplayName": author,
+        "publishedAt": published_at,
+    }
+
+
+def reply(reply_id, text, published_at="2025-01-01T00:00:00Z", **kwargs):
+    """comments().list 응답 또는 스레드에 함께 실린 답글 항목 하나."""
+    return {"id": reply_id, "snippet": snippet(text, published_at=published_at, **kwargs)}
+
+
+def thread(comment_id, text, replies=(), total_replies=None, **kwargs):
+    """commentThreads 응답의 항목 하나. replies는 응답에 함께 실린 (id, text, published_at) 답글입니다."""
+    item = {
+        "snippet": {
+            "topLevelComment": {"id": comment_id, "snippet": snippet(text, **kwargs)},
+            "totalReplyCount": len(replies) if total_replies is None else total_replies,
+        },
+    }
+    if replies:
+        item["replies"] = {"comments": [reply(*args) for args in replies]}
+    return item
+
+
+class _Request:
+    def __init__(self, execute):
+        self._execute = execute
+
+    def execute(self):
+        return self._execute()
+
+
+class _Pages:
+    def __init__(self, owner, kind):
+        self.owner = owner
+        self.kind = kind
+
+    def list(self, **kwargs):
+        self.owner.calls.append((self.kind, kwargs))
+        return _Request(lambda: self.owner.respond(self.kind, kwargs))
+
+
+class FakeYouTube:
+    """
+    pages: commentThreads 페이지 목록(각 페이지는 thread() 항목 리스트).
+    reply_pages: {parent_id: [페이지, ...]} comments().list(parentId=...)용 답글 페이지.
+    fail_on_page: 이 번호(0부터)의 commentThreads 페이지를 요청하면 HttpError를 냅니다.
+    """
+
+    def __init__(self, pages, reply_pages=None, fail_on_page=None):
+        self.pages = pages
+        self.reply_pages = reply_pages or {}
+        self.fail_on_page = fail_on_page
+        self.calls = []
+
+    def commentThreads(self):
+        return _Pages(self, "threads")
+
+    def comments(self):
+        return _Pages(self, "replies")
+
+    def respond(self, kind, kwargs):
+        index = int(kwargs.get("pageToken") or 0)
+        if kind == "threads":
+            if index == self.fail_on_page:
+                raise HttpError("quotaExceeded")
+            pages = self.pages
+        else:
+            pages = self.reply_pages.get(kwargs["parentId"], [[]])
+        response = {"items": pages[index] if index < len(pages) else []}
+        if index + 1 < len(pages):
+            response["nextPageToken"] = str(index + 1)
+        return response
+
+
+class FakeSentimentBackend:
+    name = "fake"
+    version = "fake-1"
+
+    def classify(self, texts):
+        return ["부정" if "싫" in text else "긍정" for text in texts]
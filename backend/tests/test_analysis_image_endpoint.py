@@ -0,0 +1,90 @@
+import base64
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.models import Analysis, Video
+from app.services.analysis_store import PNG_SIGNATURE, content_hash, replace_analyses
+
+IMAGE = PNG_SIGNATURE + b"wordcloud-image"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def add_video(images=None, legacy_rows=()):
+    """blob 저장소 행(images)과 image_data를 직접 담은 예전 행(legacy_rows: (타입, 바이트))을 가진 영상을 만듭니다."""
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.flush()
+        replace_analyses(db, video.id, images or {})
+        for analysis_type, image_data in legacy_rows:
+            db.add(Analysis(video_id=video.id, analysis_type=analysis_type, image_data=image_data, image_format="png"))
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+def test_blob_image_is_served_with_etag(client):
+    video_id = add_video({"wordcloud": IMAGE})
+
+    response = client.get(f"/videos/{video_id}/analysis/wordcloud.png")
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{content_hash(IMAGE)}"'
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_matching_if_none_match_returns_304(client):
+    video_id = add_video({"wordcloud": IMAGE})
+    etag = f'"{content_hash(IMAGE)}"'
+
+    response = client.get(f"/videos/{video_id}/analysis/wordcloud.png", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    stale = client.get(f"/videos/{video_id}/analysis/wordcloud.png", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+@pytest.mark.parametrize("version, cache_control", [
+    (content_hash(IMAGE), IMMUTABLE),
+    # 이미지가 다시 생성된 뒤 남아 있는 예전 ?v= URL은 새 이미지를 immutable로 고정하면 안 됩니다
+    (content_hash(b"previous image"), "no-cache"),
+    ("", "no-cache"),
+])
+def test_immutable_only_when_version_matches(client, version, cache_control):
+    video_id = add_video({"wordcloud": IMAGE})
+
+    response = client.get(f"/videos/{video_id}/analysis/wordcloud.png", params={"v": version})
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["cache-control"] == cache_control
+
+
+@pytest.mark.parametrize("stored", [IMAGE, base64.b64encode(IMAGE)], ids=["raw", "base64"])
+def test_legacy_row_is_served_from_image_data(client, stored):
+    video_id = add_video(legacy_rows=[("tree", stored)])
+    etag = f'"{content_hash(IMAGE)}"'
+
+    response = client.get(f"/videos/{video_id}/analysis/tree.png", params={"v": content_hash(IMAGE)})
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == IMMUTABLE
+    revalidated = client.get(f"/videos/{video_id}/analysis/tree.png", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+
+def test_unknown_type_and_missing_image(client):
+    video_id = add_video({"wordcloud": IMAGE})
+
+    assert client.get(f"/videos/{video_id}/analysis/pie.png").status_code == 400
+    assert client.get(f"/videos/{video_id}/analysis/sentiment.png").status_code == 404
+    assert client.get("/videos/999/analysis/wordcloud.png").status_code == 404
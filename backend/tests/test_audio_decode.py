@@ -0,0 +1,127 @@
+import os
+import shutil
+import stat
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+from app.services.audio_decode import decode_audio
+
+HAS_FFMPEG = shutil.which("ffmpeg") is not None
+
+# 입력 파일을 raw float32 PCM으로 간주해 그대로 stdout에 쓰는 가짜 ffmpeg.
+# FAKE_FFMPEG_STDERR_BYTES만큼 stderr에 먼저 쓰고, FAKE_FFMPEG_EXIT / FAKE_FFMPEG_SLEEP으로 실패와 지연을 흉내 냅니다.
+FAKE_FFMPEG = """#!{python}
+import os, sys, time
+path = sys.argv[sys.argv.index("-i") + 1]
+sys.stderr.write("x" * int(os.environ.get("FAKE_FFMPEG_STDERR_BYTES", "0")))
+sys.stderr.flush()
+time.sleep(float(os.environ.get("FAKE_FFMPEG_SLEEP", "0")))
+with open(path, "rb") as f:
+    sys.stdout.buffer.write(f.read())
+sys.exit(int(os.environ.get("FAKE_FFMPEG_EXIT", "0")))
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def raw_pcm(samples):
+        path = tmp_path / "input.f32"
+        np.asarray(samples, dtype=np.float32).tofile(path)
+        return str(path)
+
+    return raw_pcm
+
+
+def test_in_memory_decode_wraps_the_buffer(fake_ffmpeg):
+    samples = np.linspace(-1, 1, 1000, dtype=np.float32)
+
+    decoded = decode_audio(fake_ffmpeg(samples))
+
+    assert not isinstance(decoded, np.memmap)
+    np.testing.assert_array_equal(decoded, samples)
+
+
+def test_long_input_spills_to_a_memory_mapped_file(fake_ffmpeg, tmp_path):
+    samples = np.arange(5000, dtype=np.float32)
+    spill_path = str(tmp_path / "spill.f32")
+
+    decoded = decode_audio(fake_ffmpeg(samples), sample_rate=1000, spill_path=spill_path, spill_after_seconds=1)
+
+    assert isinstance(decoded, np.memmap)
+    assert os.path.getsize(spill_path) == samples.nbytes
+    np.testing.assert_array_equal(decoded, samples)
+
+
+def test_noisy_stderr_does_not_block_decoding(fake_ffmpeg, monkeypatch):
+    # 파이프 버퍼(보통 64 KiB)보다 훨씬 많은 stderr 출력
+    monkeypatch.setenv("FAKE_FFMPEG_STDERR_BYTES", str(4 << 20))
+    samples = np.ones(100, dtype=np.float32)
+
+    np.testing.assert_array_equal(decode_audio(fake_ffmpeg(samples), timeout=30), samples)
+
+
+def test_failed_decode_reports_stderr(fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_STDERR_BYTES", "10")
+    monkeypatch.setenv("FAKE_FFMPEG_EXIT", "1")
+
+    with pytest.raises(RuntimeError, match="x" * 10):
+        decode_audio(fake_ffmpeg([0.0]))
+
+
+def test_decode_times_out(fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_SLEEP", "30")
+
+    with pytest.raises(TimeoutError):
+        decode_audio(fake_ffmpeg([0.0]), timeout=0.5)
+
+
+def write_wav(path, seconds=1.5, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pcm = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+    return str(path), len(pcm)
+
+
+@pytest.mark.skipif(not HAS_FFMPEG, reason="ffmpeg가 설치되어 있지 않음")
+def test_real_ffmpeg_decodes_wav_in_memory(tmp_path):
+    path, count = write_wav(tmp_path / "tone.wav")
+
+    decoded = decode_audio(path, timeout=60)
+
+    assert decoded.dtype == np.float32
+    assert abs(len(decoded) - count) <= 16
+    assert 0.45 < np.abs(decoded).max() < 0.55
+
+
+@pytest.mark.skipif(not HAS_FFMPEG, reason="ffmpeg가 설치되어 있지 않음")
+def test_real_ffmpeg_spills_long_audio(tmp_path):
+    path, count = write_wav(tmp_path / "tone.wav")
+    spill_path = str(tmp_path / "spill.f32")
+
+    decoded = decode_audio(path, spill_path=spill_path, spill_after_seconds=0.5, timeout=60)
+
+    assert isinstance(decoded, np.memmap)
+    assert abs(len(decoded) - count) <= 16
+
+
+@pytest.mark.skipif(not HAS_FFMPEG, reason="ffmpeg가 설치되어 있지 않음")
+def test_real_ffmpeg_rejects_non_audio(tmp_path):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"not audio at all")
+
+    with pytest.raises(RuntimeError, match="오디오 디코딩 실패"):
+        decode_audio(str(path), timeout=60)
@@ -0,0 +1,121 @@
+import base64
+import os
+import time
+
+from app.core.database import SessionLocal
+from app.models.models import Analysis, Video
+from app.services import blob_store as blob_store_module
+from app.services.analysis_store import PNG_SIGNATURE, content_hash, read_analysis_image, replace_analyses
+from app.services.blob_store import LocalBlobStore, migrate_inline_images, sweep_if_due, sweep_unreferenced_blobs
+
+IMAGE = PNG_SIGNATURE + b"legacy-image"
+
+
+def test_migrate_inline_images_moves_raw_and_base64_rows(tmp_path):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.flush()
+        db.add_all([
+            Analysis(video_id=video.id, analysis_type="wordcloud", image_format="png", image_data=IMAGE),
+            Analysis(video_id=video.id, analysis_type="tree", image_format="png",
+                     image_data=base64.b64encode(IMAGE)),
+        ])
+        db.commit()
+
+        assert migrate_inline_images(db, store, batch_size=1) == 2
+        assert migrate_inline_images(db, store) == 0
+
+        for analysis in db.query(Analysis):
+            assert analysis.image_data is None
+            assert analysis.content_hash == content_hash(IMAGE)
+            assert analysis.size == len(IMAGE)
+            assert read_analysis_image(analysis, store) == IMAGE
+    finally:
+        db.close()
+
+
+def age(store, digest, seconds=7200):
+    past = time.time() - seconds
+    os.utime(store.path_for(digest), (past, past))
+
+
+def test_sweep_removes_only_old_unreferenced_blobs(tmp_path):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.flush()
+        old_rows = replace_analyses(db, video.id, {"sentiment": IMAGE + b"v1", "tree": IMAGE + b"tree"}, store=store)
+        db.commit()
+        old_sentiment, tree = old_rows[0].content_hash, old_rows[1].content_hash
+
+        # 댓글 갱신으로 감정 차트가 바뀌면 이전 차트는 어떤 행도 참조하지 않습니다
+        new_sentiment = replace_analyses(db, video.id, {"sentiment": IMAGE + b"v2"}, store=store)[0].content_hash
+        db.commit()
+        fresh_orphan, _ = store.put(IMAGE + b"not committed yet")
+        for digest in (old_sentiment, tree, new_sentiment):
+            age(store, digest)
+
+        assert sweep_unreferenced_blobs(db, store, grace_seconds=3600) == 1
+
+        assert not store.exists(old_sentiment)
+        assert store.exists(tree) and store.exists(new_sentiment)
+        # grace 기간 안에 쓰인 파일은 커밋 전 행의 것일 수 있으므로 남깁니다
+        assert store.exists(fresh_orphan)
+        assert db.query(Analysis).count() == 2
+    finally:
+        db.close()
+
+
+def test_put_of_existing_blob_protects_it_from_the_sweep(tmp_path):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    digest, _ = store.put(IMAGE)
+    age(store, digest)
+
+    assert store.put(IMAGE) == (digest, len(IMAGE))
+
+    db = SessionLocal()
+    try:
+        assert sweep_unreferenced_blobs(db, store, grace_seconds=3600) == 0
+        assert store.exists(digest)
+    finally:
+        db.close()
+
+
+def test_sweep_if_due_is_throttled(tmp_path, monkeypatch):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(blob_store_module, "_last_sweep", 0.0)
+    monkeypatch.setattr(blob_store_module.settings, "BLOB_GC_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(blob_store_module.settings, "BLOB_GC_GRACE_SECONDS", 0)
+    first, _ = store.put(IMAGE + b"first")
+    age(store, first)
+
+    assert sweep_if_due(store) == 1
+
+    second, _ = store.put(IMAGE + b"second")
+    age(store, second)
+    assert sweep_if_due(store) == 0
+    assert store.exists(second)
+
+
+def test_replace_analyses_keeps_one_row_per_type(tmp_path):
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.flush()
+        replace_analyses(db, video.id, {"wordcloud": IMAGE + b"a", "tree": IMAGE + b"b"}, store=store)
+        replace_analyses(db, video.id, {"wordcloud": IMAGE + b"c"}, store=store)
+        db.commit()
+
+        rows = {row.analysis_type.value: row for row in db.query(Analysis)}
+        assert sorted(rows) == ["tree", "wordcloud"]
+        assert read_analysis_image(rows["wordcloud"], store) == IMAGE + b"c"
+        assert read_analysis_image(rows["tree"], store) == IMAGE + b"b"
+    finally:
+        db.close()
@@ -0,0 +1,90 @@
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.models.models import Analysis, Video
+from app.services.analysis_store import PNG_SIGNATURE, replace_analyses
+
+
+def add_video(youtube_id, summary, images):
+    db = SessionLocal()
+    try:
+        video = Video(
+            youtube_link=f"https://youtu.be/{youtube_id}", youtube_id=youtube_id,
+            simple_summary=f"[간단 요약] {summary}", core_summary=f"[핵심 내용] {summary}",
+            point_summary=f"[중요 포인트] {summary}", sentiment_counts={"긍정": 1},
+        )
+        db.add(video)
+        db.flush()
+        rows = replace_analyses(db, video.id, images)
+        db.commit()
+        return video.id, {row.analysis_type: row.content_hash for row in rows}
+    finally:
+        db.close()
+
+
+def test_bundle_of_unknown_video_is_404(client):
+    assert client.get("/videos/999/bundle").status_code == 404
+
+
+def test_bundle_returns_each_videos_own_results(client):
+    first_id, first_hashes = add_video("aaaaaaaaaaa", "첫 영상", {
+        "wordcloud": PNG_SIGNATURE + b"first-wordcloud", "tree": PNG_SIGNATURE + b"first-tree",
+    })
+    second_id, second_hashes = add_video("bbbbbbbbbbb", "둘째 영상", {
+        "wordcloud": PNG_SIGNATURE + b"second-wordcloud", "sentiment": PNG_SIGNATURE + b"second-sentiment",
+    })
+
+    first = client.get(f"/videos/{first_id}/bundle").json()
+    second = client.get(f"/videos/{second_id}/bundle").json()
+
+    assert first["youtube_id"] == "aaaaaaaaaaa"
+    assert first["summaries"] == {
+        "simple": "[간단 요약] 첫 영상", "core": "[핵심 내용] 첫 영상", "point": "[중요 포인트] 첫 영상",
+    }
+    assert sorted(first["analysis"]) == ["tree", "wordcloud"]
+    assert first["analysis"]["wordcloud"]["url"] == \
+        f"/videos/{first_id}/analysis/wordcloud.png?v={first_hashes['wordcloud']}"
+    assert first["analysis"]["wordcloud"]["size"] == len(PNG_SIGNATURE + b"first-wordcloud")
+
+    assert second["summaries"]["simple"] == "[간단 요약] 둘째 영상"
+    assert sorted(second["analysis"]) == ["sentiment", "wordcloud"]
+    assert second["analysis"]["sentiment"]["content_hash"] == second_hashes["sentiment"]
+    assert second["sentiment_counts"] == {"긍정": 1}
+
+    image = client.get(second["analysis"]["wordcloud"]["url"])
+    assert image.status_code == 200
+    assert image.content == PNG_SIGNATURE + b"second-wordcloud"
+
+
+def test_bundle_does_not_load_image_data(client):
+    video_id, _ = add_video("aaaaaaaaaaa", "예전 영상", {})
+    db = SessionLocal()
+    db.add(Analysis(video_id=video_id, analysis_type="tree", image_format="png", image_data=b"x" * 1024))
+    db.commit()
+    db.close()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        bundle = client.get(f"/videos/{video_id}/bundle").json()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert bundle["analysis"]["tree"]["url"] == f"/videos/{video_id}/analysis/tree.png"
+    selects = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+    assert selects
+    assert not any("image_data" in statement for statement in selects)
+
+
+def test_summarize_returns_the_video_id_for_the_bundle(client):
+    video_id, _ = add_video("aaaaaaaaaaa", "캐시된 영상", {})
+
+    result = client.get("/summarize", params={"url": "https://www.youtube.com/watch?v=aaaaaaaaaaa"}).json()
+
+    assert result["video_id"] == video_id
+    assert result["cached"] is True
+    assert client.get(f"/videos/{result['video_id']}/bundle").json()["summaries"]["simple"] == result["simple"]
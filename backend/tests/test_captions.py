@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from app.services import captions
+from app.services.captions import is_usable_caption, parse_caption_file, parse_cues, parse_timestamp
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "captions")
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES, name)
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("00:00:00.000", 0.0),
+    ("00:01:02.345", 62.345),
+    ("01:02,345", 62.345),
+    ("1:00:00,500", 3600.5),
+])
+def test_parse_timestamp(value, seconds):
+    assert parse_timestamp(value) == pytest.approx(seconds)
+
+
+def test_parse_timestamp_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_timestamp("not a timestamp")
+
+
+def test_youtube_auto_captions_keep_first_cue_and_drop_rolling_duplicates():
+    segments = parse_caption_file(fixture_path("youtube_auto.ko.vtt"))
+
+    assert [(segment["start"], segment["end"]) for segment in segments] == [
+        (0.0, 2.5), (2.51, 5.0), (5.01, 8.0),
+    ]
+    assert [segment["text"] for segment in segments] == ["안녕하세요 여러분", "오늘은 날씨가 좋네요", "[음악]"]
+    assert [segment["id"] for segment in segments] == [0, 1, 2]
+
+
+def test_whitespace_only_line_does_not_split_a_cue():
+    content = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n \n첫 줄\n\n00:00:01.000 --> 00:00:02.000\n둘째 줄\n"
+
+    assert parse_cues(content) == [
+        {"id": 0, "start": 0.0, "end": 1.0, "text": "첫 줄"},
+        {"id": 1, "start": 1.0, "end": 2.0, "text": "둘째 줄"},
+    ]
+
+
+def test_srt_with_crlf_and_markup():
+    segments = parse_caption_file(fixture_path("manual.ko.srt"))
+
+    assert segments == [
+        {"id": 0, "start": 1.0, "end": 3.2, "text": "첫 번째 & 자막"},
+        {"id": 1, "start": 3.2, "end": 6.0, "text": "두 번째 자막 줄바꿈된 문장"},
+        {"id": 2, "start": 60.0, "end": 62.5, "text": "세 번째 자막"},
+    ]
+
+
+def test_manual_captions_keep_repeated_lines():
+    segments = parse_caption_file(fixture_path("manual_repeated.ko.srt"))
+
+    assert [segment["text"] for segment in segments] == ["네", "네", "사랑해요 사랑해요", "사랑해요"]
+
+
+def test_overlapping_cues_drop_the_carried_over_line():
+    content = (
+        "1\n00:00:01,000 --> 00:00:03,000\n첫 줄\n\n"
+        "2\n00:00:02,000 --> 00:00:04,000\n첫 줄\n둘째 줄\n\n"
+        "3\n00:00:04,000 --> 00:00:05,000\n둘째 줄\n"
+    )
+
+    assert [segment["text"] for segment in parse_cues(content)] == ["첫 줄", "둘째 줄", "둘째 줄"]
+
+
+def test_rolling_dedupe_can_be_forced():
+    content = "1\n00:00:01,000 --> 00:00:02,000\n네\n\n2\n00:00:02,000 --> 00:00:03,000\n네\n"
+
+    assert [segment["text"] for segment in parse_cues(content, rolling=True)] == ["네"]
+    assert [segment["text"] for segment in parse_cues(content)] == ["네", "네"]
+
+
+def test_is_usable_caption():
+    speech = parse_caption_file(fixture_path("youtube_auto.ko.vtt"))
+    music = parse_caption_file(fixture_path("music_only.ko.vtt"))
+
+    assert is_usable_caption(speech, min_chars_per_minute=10)
+    assert not is_usable_caption(speech, min_chars_per_minute=300)
+    assert not is_usable_caption(speech[:2], min_chars_per_minute=0)
+    assert not is_usable_caption(music, min_chars_per_minute=0)
+
+
+def test_fetch_caption_transcript_uses_downloaded_file(monkeypatch, tmp_path):
+    requested = {}
+
+    def download_captions(url, output_dir, languages):
+        requested.update(url=url, output_dir=output_dir, languages=languages)
+        return fixture_path("youtube_auto.ko.vtt")
+
+    monkeypatch.setattr(captions, "download_captions", download_captions)
+    monkeypatch.setattr(captions.settings, "CAPTION_LANGUAGES", "ko, en")
+    monkeypatch.setattr(captions.settings, "CAPTION_MIN_CHARS_PER_MINUTE", 10)
+
+    transcript = captions.fetch_caption_transcript("https://youtu.be/abcdefghijk", str(tmp_path))
+
+    assert requested["languages"] == ["ko", "en"]
+    assert transcript["text"] == "안녕하세요 여러분 오늘은 날씨가 좋네요 [음악]"
+    assert transcript["segments"][0]["start"] == 0.0
+    assert transcript["language"] == "ko"
+    assert transcript["source"] == "captions"
+
+
+@pytest.mark.parametrize("download", [
+    lambda url, output_dir, languages: None,
+    lambda url, output_dir, languages: fixture_path("music_only.ko.vtt"),
+])
+def test_fetch_caption_transcript_falls_back_without_usable_captions(monkeypatch, tmp_path, download):
+    monkeypatch.setattr(captions, "download_captions", download)
+
+    assert captions.fetch_caption_transcript("https://youtu.be/abcdefghijk", str(tmp_path)) is None
+
+
+def test_fetch_caption_transcript_swallows_download_errors(monkeypatch, tmp_path):
+    def download_captions(url, output_dir, languages):
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(captions, "download_captions", download_captions)
+
+    assert captions.fetch_caption_transcript("https://youtu.be/abcdefghijk", str(tmp_path)) is None
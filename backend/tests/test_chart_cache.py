@@ -0,0 +1,138 @@
+import pytest
+
+from app.api import endpoints
+from app.core.database import SessionLocal
+from app.models.models import Video
+from app.services.chart_cache import RenderedChartCache
+
+
+def test_evicts_least_recently_used_entry_by_count():
+    cache = RenderedChartCache(max_entries=2, max_bytes=1000)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert cache.get("a") == b"1"
+
+    cache.put("c", b"3")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (b"1", b"3")
+    assert cache.stats() == {"entries": 2, "bytes": 2, "hits": 3, "misses": 1, "hit_rate": 0.75}
+
+
+def test_evicts_by_total_bytes():
+    cache = RenderedChartCache(max_entries=10, max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"x" * 4)
+    cache.put("c", b"x" * 4)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    # 같은 키를 다시 넣으면 이전 크기를 빼고 계산합니다
+    cache.put("c", b"x" * 6)
+    assert cache.stats()["bytes"] == 10
+    cache.put("c", b"x" * 7)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 7
+    assert cache.get("b") is None
+
+
+def test_image_larger_than_the_budget_is_not_cached():
+    cache = RenderedChartCache(max_entries=10, max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("big", b"x" * 11)
+
+    assert cache.get("big") is None
+    assert cache.get("a") == b"x" * 4
+
+
+class RecordingRenderer:
+    """render_charts 대역. 호출된 작업을 기록하고 파라미터가 드러나는 가짜 이미지를 반환합니다."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tasks):
+        self.calls.append(tasks)
+        return {name: repr(args[1:]).encode() for name, (render, *args) in tasks.items()}
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    recording = RecordingRenderer()
+    monkeypatch.setattr(endpoints, "render_charts", recording)
+    monkeypatch.setattr(endpoints, "chart_cache", RenderedChartCache(max_entries=8, max_bytes=1 << 20))
+    return recording
+
+
+def add_video(noun_counts=(("요약", 3), ("테스트", 1))):
+    db = SessionLocal()
+    try:
+        video = Video(
+            youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk",
+            noun_counts=[list(row) for row in noun_counts],
+        )
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("path, params", [
+    ("wordcloud", {"w": 640, "h": 320, "top": 50}),
+    ("treemap", {"top": 10}),
+])
+def test_second_request_is_served_from_the_cache(client, renderer, path, params):
+    video_id = add_video()
+
+    first = client.get(f"/videos/{video_id}/{path}", params=params)
+    second = client.get(f"/videos/{video_id}/{path}", params=params)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert len(renderer.calls) == 1
+    assert endpoints.chart_cache.stats()["hits"] == 1
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_different_parameters_render_separately(client, renderer):
+    video_id = add_video()
+
+    client.get(f"/videos/{video_id}/wordcloud", params={"w": 640})
+    client.get(f"/videos/{video_id}/wordcloud", params={"w": 800})
+
+    assert len(renderer.calls) == 2
+    (render, counts, w, h, top), = renderer.calls[1].values()
+    assert (counts, w, h, top) == ({"요약": 3, "테스트": 1}, 800, 480, 100)
+
+
+@pytest.mark.parametrize("path, params", [
+    ("wordcloud", {"w": 63}),
+    ("wordcloud", {"w": 2049}),
+    ("wordcloud", {"h": 0}),
+    ("wordcloud", {"h": 4096}),
+    ("wordcloud", {"top": 0}),
+    ("wordcloud", {"top": 501}),
+    ("treemap", {"top": 0}),
+    ("treemap", {"top": 101}),
+])
+def test_out_of_range_parameters_are_rejected_before_rendering(client, renderer, path, params):
+    video_id = add_video()
+
+    assert client.get(f"/videos/{video_id}/{path}", params=params).status_code == 422
+    assert renderer.calls == []
+
+
+@pytest.mark.parametrize("path, params", [
+    ("wordcloud", {"w": 64, "h": 2048, "top": 500}),
+    ("treemap", {"top": 100}),
+])
+def test_boundary_parameters_are_accepted(client, renderer, path, params):
+    assert client.get(f"/videos/{add_video()}/{path}", params=params).status_code == 200
+
+
+def test_missing_video_or_noun_counts_is_404(client, renderer):
+    assert client.get("/videos/999/wordcloud").status_code == 404
+    assert client.get(f"/videos/{add_video(noun_counts=())}/treemap").status_code == 404
+    assert renderer.calls == []
@@ -0,0 +1,222 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import summarize
+from app.services.comment_analyzer import (
+    BATCH_SENTIMENT_PROMPT,
+    SENTIMENT_FAILED,
+    analyze_sentiments,
+    get_comments,
+    iter_comments,
+    make_sentiment_batches,
+    parse_batch_response,
+)
+from tests.fake_youtube import FakeYouTube, HttpError, reply, thread
+
+
+def ids(rows):
+    return [row["comment_id"] for row in rows]
+
+
+def thread_calls(youtube):
+    return [kwargs for kind, kwargs in youtube.calls if kind == "threads"]
+
+
+def test_iter_comments_follows_page_tokens():
+    youtube = FakeYouTube([
+        [thread("a", "첫째"), thread("b", "둘째")],
+        [thread("c", "셋째")],
+        [thread("d", "넷째")],
+    ])
+
+    rows = list(iter_comments(youtube, "abcdefghijk", page_size=2))
+
+    assert ids(rows) == ["a", "b", "c", "d"]
+    assert rows[0] == {
+        "comment_id": "a", "parent_id": None, "text": "첫째", "likes": 0, "author": "user",
+        "published_at": "2025-01-01T00:00:00Z",
+    }
+    calls = thread_calls(youtube)
+    assert [call["pageToken"] for call in calls] == [None, "1", "2"]
+    assert all(call["videoId"] == "abcdefghijk" and call["maxResults"] == 2 for call in calls)
+    assert calls[0]["part"] == "snippet"
+
+
+def test_iter_comments_stops_at_limit_without_fetching_more_pages():
+    youtube = FakeYouTube([
+        [thread("a", "첫째"), thread("b", "둘째")],
+        [thread("c", "셋째"), thread("d", "넷째")],
+        [thread("e", "다섯째")],
+    ])
+
+    assert ids(iter_comments(youtube, "abcdefghijk", limit=3)) == ["a", "b", "c"]
+    assert len(thread_calls(youtube)) == 2
+
+
+def test_iter_comments_skips_replies_unless_requested():
+    youtube = FakeYouTube([[thread("a", "부모", replies=[("a.1", "답글", "2025-01-02T00:00:00Z")])]])
+
+    assert ids(iter_comments(youtube, "abcdefghijk")) == ["a"]
+    assert [kind for kind, _ in youtube.calls] == ["threads"]
+
+
+def test_iter_comments_uses_inline_replies_when_complete():
+    youtube = FakeYouTube([[
+        thread("a", "부모", replies=[("a.1", "답글 1", "2025-01-02T00:00:00Z"), ("a.2", "답글 2", "2025-01-03T00:00:00Z")]),
+        thread("b", "답글 없음"),
+    ]])
+
+    rows = list(iter_comments(youtube, "abcdefghijk", include_replies=True))
+
+    assert ids(rows) == ["a", "a.1", "a.2", "b"]
+    assert [row["parent_id"] for row in rows] == [None, "a", "a", None]
+    assert rows[1]["published_at"] == "2025-01-02T00:00:00Z"
+    assert thread_calls(youtube)[0]["part"] == "snippet,replies"
+    assert [kind for kind, _ in youtube.calls] == ["threads"]
+
+
+def test_iter_comments_pages_through_replies_when_inline_is_truncated():
+    youtube = FakeYouTube(
+        [[thread("a", "부모", replies=[("a.1", "답글 1", "2025-01-02T00:00:00Z")], total_replies=3), thread("b", "다음")]],
+        reply_pages={"a": [[reply("a.1", "답글 1"), reply("a.2", "답글 2")], [reply("a.3", "답글 3")]]},
+    )
+
+    rows = list(iter_comments(youtube, "abcdefghijk", include_replies=True, page_size=2))
+
+    assert ids(rows) == ["a", "a.1", "a.2", "a.3", "b"]
+    assert all(row["parent_id"] == "a" for row in rows[1:4])
+    reply_calls = [kwargs for kind, kwargs in youtube.calls if kind == "replies"]
+    assert [(call["parentId"], call["pageToken"]) for call in reply_calls] == [("a", None), ("a", "1")]
+
+
+def test_iter_comments_limit_counts_replies():
+    youtube = FakeYouTube(
+        [[thread("a", "부모", total_replies=5), thread("b", "다음")]],
+        reply_pages={"a": [[reply(f"a.{i}", "답글") for i in range(5)]]},
+    )
+
+    assert ids(iter_comments(youtube, "abcdefghijk", limit=3, include_replies=True)) == ["a", "a.0", "a.1"]
+
+
+def test_iter_comments_propagates_api_errors():
+    youtube = FakeYouTube([[thread("a", "첫째")], [thread("b", "둘째")]], fail_on_page=1)
+    comments = iter_comments(youtube, "abcdefghijk")
+
+    assert ids([next(comments)]) == ["a"]
+    with pytest.raises(HttpError):
+        next(comments)
+
+
+def test_get_comments_returns_empty_list_on_error():
+    youtube = FakeYouTube([[thread("a", "첫째")], [thread("b", "둘째")]], fail_on_page=1)
+
+    assert get_comments(youtube, "abcdefghijk", max_results=10) == []
+    assert ids(get_comments(FakeYouTube([[thread("a", "첫째"), thread("b", "둘째")]]), "abcdefghijk", 1)) == ["a"]
+
+
+class StubSentimentClient:
+    """배치 요청마다 respond(요청 댓글 dict, 시도 번호)로 응답 문자열을 만들거나 예외를 내는 가짜 LLM 클라이언트."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.batches = []
+
+    async def chat(self, messages, **kwargs):
+        assert messages[0]["content"] == BATCH_SENTIMENT_PROMPT
+        assert kwargs["response_format"] == {"type": "json_object"}
+        comments = json.loads(messages[1]["content"])
+        self.batches.append(comments)
+        return self.respond(comments, len(self.batches))
+
+
+def results(labels):
+    return json.dumps({"results": labels}, ensure_ascii=False)
+
+
+@pytest.fixture
+def byte_token_count(monkeypatch):
+    monkeypatch.setattr(summarize, "get_encoding", lambda: None)
+
+
+def test_make_sentiment_batches_respects_tokens_and_item_count(byte_token_count):
+    items = list(enumerate(["가" * 9] * 5))  # 댓글 하나당 10 + 8 토큰
+
+    assert [[index for index, _ in batch] for batch in make_sentiment_batches(items, 40, 10)] == [[0, 1], [2, 3], [4]]
+    assert [[index for index, _ in batch] for batch in make_sentiment_batches(items, 1000, 3)] == [[0, 1, 2], [3, 4]]
+    # 예산보다 큰 댓글도 혼자서 배치 하나가 됩니다
+    assert make_sentiment_batches([(0, "가" * 100)], 10, 10) == [[(0, "가" * 100)]]
+
+
+@pytest.mark.parametrize("content, parsed", [
+    (results({"0": "긍정", "1": " 부정 ", "2": "중립"}), {0: "긍정", 1: "부정", 2: "중립"}),
+    # 요청하지 않은 번호와 알 수 없는 라벨은 버립니다
+    (results({"0": "긍정", "7": "부정", "-1": "중립", "1": "행복", "2": 3}), {0: "긍정"}),
+    # 같은 번호가 두 번 나오면 JSON 파서가 마지막 값을 남기며, 결과는 번호당 하나입니다
+    ('{"results": {"0": "긍정", "0": "부정", "1": "중립"}}', {0: "부정", 1: "중립"}),
+    ('{"0": "긍정", "2": "중립"}', {0: "긍정", 2: "중립"}),
+    ("긍정, 부정, 중립", {}),
+    ("", {}),
+    (None, {}),
+    ('["긍정", "부정"]', {}),
+    ('{"results": ["긍정"]}', {}),
+])
+def test_parse_batch_response(content, parsed):
+    assert parse_batch_response(content, [0, 1, 2]) == parsed
+
+
+def test_analyze_sentiments_batches_requests():
+    client = StubSentimentClient(lambda comments, attempt: results({index: "긍정" for index in comments}))
+
+    labels = asyncio.run(analyze_sentiments(client, [f"댓글 {i}" for i in range(5)], batch_tokens=10000, batch_size=2))
+
+    assert labels == ["긍정"] * 5
+    assert [sorted(batch) for batch in client.batches] == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_analyze_sentiments_retries_only_missing_items_in_smaller_batches():
+    def respond(comments, attempt):
+        # 첫 배치는 '1'과 '2'를 빠뜨리고, '3'은 잘못된 라벨로 답합니다
+        if attempt == 1:
+            return results({"0": "긍정", "3": "모름"})
+        return results({index: "부정" for index in comments})
+
+    client = StubSentimentClient(respond)
+
+    labels = asyncio.run(analyze_sentiments(client, ["a", "b", "c", "d"], batch_tokens=10000, batch_size=4))
+
+    assert labels == ["긍정", "부정", "부정", "부정"]
+    assert client.batches[0] == {"0": "a", "1": "b", "2": "c", "3": "d"}
+    assert [sorted(batch) for batch in client.batches[1:]] == [["1", "2"], ["3"]]
+
+
+def test_analyze_sentiments_retries_after_non_json_response():
+    client = StubSentimentClient(
+        lambda comments, attempt: "죄송합니다" if attempt == 1 else results({index: "중립" for index in comments})
+    )
+
+    assert asyncio.run(analyze_sentiments(client, ["a", "b"], max_retries=1)) == ["중립", "중립"]
+    assert len(client.batches) == 2
+
+
+def test_analyze_sentiments_marks_failures_after_final_attempt():
+    def respond(comments, attempt):
+        if attempt == 2:
+            raise RuntimeError("rate limited")
+        return results({"0": "긍정"}) if "0" in comments else "not json"
+
+    client = StubSentimentClient(respond)
+
+    labels = asyncio.run(analyze_sentiments(client, ["a", "b"], batch_size=2, max_retries=2))
+
+    assert labels == ["긍정", SENTIMENT_FAILED]
+    assert [sorted(batch) for batch in client.batches] == [["0", "1"], ["1"], ["1"]]
+
+
+def test_analyze_sentiments_truncates_long_comments():
+    client = StubSentimentClient(lambda comments, attempt: results({index: "긍정" for index in comments}))
+
+    asyncio.run(analyze_sentiments(client, ["가" * 2000]))
+
+    assert len(client.batches[0]["0"]) == 500
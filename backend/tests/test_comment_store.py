@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.models import Comment, Video
+from app.services import comment_store, pipeline
+from tests.fake_youtube import FakeSentimentBackend, FakeYouTube, HttpError, thread
+
+
+@pytest.fixture
+def video_id():
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def youtube(monkeypatch):
+    fake = FakeYouTube([])
+    monkeypatch.setattr(comment_store, "build_youtube_client", lambda: fake)
+    monkeypatch.setattr(comment_store, "default_sentiment_backend", FakeSentimentBackend)
+    monkeypatch.setattr(pipeline, "render_charts", lambda tasks: {name: b"png" for name in tasks})
+    return fake
+
+
+def stored(video_id):
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).one()
+        ids = {comment_id for (comment_id,) in db.query(Comment.comment_id).filter(Comment.video_id == video_id)}
+        return ids, video.sentiment_counts, video.comments_refreshed_at
+    finally:
+        db.close()
+
+
+def test_refresh_stores_comments_and_counts(youtube, video_id):
+    youtube.pages = [[thread("c1", "좋다"), thread("c2", "싫다")], [thread("c3", "좋아요")]]
+
+    result = pipeline.run_comment_refresh(video_id)
+
+    assert result["new_comments"] == 3
+    assert stored(video_id)[:2] == ({"c1", "c2", "c3"}, {"긍정": 2, "부정": 1})
+
+
+def test_failed_refresh_commits_nothing(youtube, video_id):
+    youtube.pages = [[thread("c1", "좋다")], [thread("c2", "좋다")]]
+    youtube.fail_on_page = 1
+
+    with pytest.raises(HttpError):
+        pipeline.run_comment_refresh(video_id)
+
+    # 일부만 저장되고 refreshed_at이 앞으로 가면 다음 갱신에서 빠진 구간을 다시 가져오지 못합니다
+    assert stored(video_id) == (set(), None, None)
+
+
+def test_incremental_refresh_includes_replies(youtube, video_id, monkeypatch):
+    monkeypatch.setattr(comment_store.settings, "COMMENT_INCLUDE_REPLIES", True)
+    youtube.pages = [[thread("c1", "좋다", published_at="2025-01-01T00:00:00Z")]]
+    pipeline.run_comment_refresh(video_id)
+
+    youtube.pages = [[
+        thread("c2", "새 댓글", published_at="2025-01-02T00:00:00Z",
+               replies=[("c2.r1", "답글", "2025-01-02T01:00:00Z")]),
+        thread("c1", "좋다", published_at="2025-01-01T00:00:00Z"),
+    ]]
+    youtube.calls.clear()
+    result = pipeline.run_comment_refresh(video_id)
+
+    assert result["new_comments"] == 2
+    assert stored(video_id)[0] == {"c1", "c2", "c2.r1"}
+    assert youtube.calls[0][1]["order"] == "time"
+    assert youtube.calls[0][1]["part"] == "snippet,replies"
+
+
+def test_storing_the_same_comments_twice_does_not_conflict(video_id):
+    rows = [{
+        "comment_id": "c1", "parent_id": None, "text": "좋다", "likes": 1, "author": "a",
+        "published_at": "2025-01-01T00:00:00Z", "sentiment": "긍정",
+    }]
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        # 두 갱신이 같은 댓글을 가져와 차례로 커밋하는 경우
+        assert comment_store.store_comments(first, first.get(Video, video_id), rows) == 1
+        first.commit()
+        assert comment_store.store_comments(second, second.get(Video, video_id), rows) == 0
+        second.commit()
+    finally:
+        first.close()
+        second.close()
+
+    assert stored(video_id)[:2] == ({"c1"}, {"긍정": 1})
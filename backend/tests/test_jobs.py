@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pytest
+
+from app.api import endpoints
+from app.services import jobs
+from app.services.jobs import JobManager, QueueFullError
+
+
+def watch_url(youtube_id):
+    return f"https://www.youtube.com/watch?v={youtube_id}"
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "조건을 기다리다 시간 초과"
+        time.sleep(0.01)
+
+
+class StubPipeline:
+    """run_summary_pipeline 대역. 'download' 단계를 보고한 뒤 release()될 때까지 워커 스레드를 붙잡습니다."""
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.started = []
+        self.failures = {}
+
+    def __call__(self, url, youtube_id, report):
+        report("download")
+        self.started.append(youtube_id)
+        assert self.released.wait(10)
+        report("summarize")
+        if youtube_id in self.failures:
+            raise self.failures[youtube_id]
+        return {"video": youtube_id, "url": url}
+
+    def release(self):
+        self.released.set()
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    stub = StubPipeline()
+    monkeypatch.setattr(jobs, "run_summary_pipeline", stub)
+    yield stub
+    stub.release()
+
+
+@pytest.fixture
+def manager(monkeypatch, pipeline):
+    job_manager = JobManager("thread", workers=1, queue_size=1, retention_seconds=60, cached_retention_seconds=5)
+    monkeypatch.setattr(endpoints, "job_manager", job_manager)
+    yield job_manager
+    pipeline.release()
+    job_manager.shutdown(wait=True)
+
+
+def test_post_jobs_returns_429_beyond_workers_plus_queue(client, manager, pipeline):
+    first = client.post("/jobs", json={"url": watch_url("aaaaaaaaaaa")})
+    second = client.post("/jobs", json={"url": watch_url("bbbbbbbbbbb")})
+    rejected = client.post("/jobs", json={"url": watch_url("ccccccccccc")})
+
+    assert (first.status_code, second.status_code) == (202, 202)
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "30"
+    wait_until(lambda: pipeline.started == ["aaaaaaaaaaa"])
+    assert client.get(f"/jobs/{second.json()['job_id']}").json()["status"] == "queued"
+
+    pipeline.release()
+    wait_until(lambda: client.get(f"/jobs/{second.json()['job_id']}").json()["status"] == "succeeded")
+    assert client.post("/jobs", json={"url": watch_url("ccccccccccc")}).status_code == 202
+
+
+def test_post_jobs_rejects_invalid_url(client, manager):
+    assert client.post("/jobs", json={"url": "https://example.com/watch?v=aaaaaaaaaaa"}).status_code == 400
+
+
+def test_same_video_is_deduplicated_while_active(manager, pipeline):
+    job = manager.submit(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa")
+
+    assert manager.submit("https://youtu.be/aaaaaaaaaaa", "aaaaaaaaaaa") is job
+
+    pipeline.release()
+    wait_until(lambda: job.done)
+    again = manager.submit(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa")
+    assert again is not job
+    assert manager.get(job.id) is job
+
+
+def test_get_reports_stages_while_running_and_result_when_done(client, manager, pipeline):
+    job_id = client.post("/jobs", json={"url": watch_url("aaaaaaaaaaa")}).json()["job_id"]
+    wait_until(lambda: pipeline.started)
+
+    running = client.get(f"/jobs/{job_id}").json()
+    assert running["status"] == "running"
+    assert running["stage"] == "download"
+    assert running["finished_at"] is None
+
+    pipeline.release()
+    wait_until(lambda: client.get(f"/jobs/{job_id}").json()["status"] == "succeeded")
+    done = client.get(f"/jobs/{job_id}").json()
+    assert [stage["name"] for stage in done["stages"]] == ["download", "summarize"]
+    assert done["stage"] == "summarize"
+    assert done["result"] == {"video": "aaaaaaaaaaa", "url": watch_url("aaaaaaaaaaa")}
+    assert done["created_at"] <= done["stages"][0]["started_at"] <= done["finished_at"]
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_failed_pipeline_marks_job_failed_and_frees_the_slot(manager, pipeline):
+    pipeline.failures["aaaaaaaaaaa"] = RuntimeError("다운로드 실패")
+    job = manager.submit(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa")
+    manager.submit(watch_url("bbbbbbbbbbb"), "bbbbbbbbbbb")
+    with pytest.raises(QueueFullError):
+        manager.submit(watch_url("ccccccccccc"), "ccccccccccc")
+
+    pipeline.release()
+    wait_until(lambda: job.done)
+
+    assert (job.status, job.error, job.result) == ("failed", "다운로드 실패", None)
+    wait_until(lambda: not manager._active)
+    manager.submit(watch_url("ccccccccccc"), "ccccccccccc")
+
+
+def test_completed_cache_hit_has_one_timestamp():
+    job = JobManager().complete(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa", {"cached": True})
+
+    assert job.status == "succeeded" and job.future is None
+    assert job.created_at == job.finished_at
+
+
+def test_prune_uses_shorter_retention_for_cache_hits(manager, pipeline):
+    cached = manager.complete(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa", {"cached": True})
+    ran = manager.submit(watch_url("bbbbbbbbbbb"), "bbbbbbbbbbb")
+    pipeline.release()
+    wait_until(lambda: ran.done)
+
+    # 캐시 적중 보존 기간(5초)은 지났지만 일반 보존 기간(60초)은 지나지 않은 시점
+    cached.finished_at -= 10
+    ran.finished_at -= 10
+    manager.complete(watch_url("ccccccccccc"), "ccccccccccc", {"cached": True})
+    assert manager.get(cached.id) is None
+    assert manager.get(ran.id) is ran
+
+    ran.finished_at -= 60
+    manager.submit(watch_url("ddddddddddd"), "ddddddddddd")
+    assert manager.get(ran.id) is None
+
+
+def test_prune_keeps_active_jobs(manager, pipeline):
+    job = manager.submit(watch_url("aaaaaaaaaaa"), "aaaaaaaaaaa")
+    job.created_at -= 3600
+
+    manager.complete(watch_url("bbbbbbbbbbb"), "bbbbbbbbbbb", {"cached": True})
+
+    assert manager.get(job.id) is job
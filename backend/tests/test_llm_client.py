@@ -0,0 +1,68 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from app.services import llm_client as llm_client_module
+from tests.stub_openai import StubOpenAIServer
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with StubOpenAIServer(reply=lambda messages: f"echo: {messages[-1]['content']}") as server:
+        monkeypatch.setattr(llm_client_module.settings, "OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setattr(llm_client_module.settings, "OPENAI_API_KEY", "test-key")
+        yield server
+
+
+@pytest.fixture
+def client(stub):
+    client = llm_client_module.create_llm_client()
+    yield client
+    client.close()
+
+
+def test_chat_sync_uses_configured_base_url(stub, client):
+    assert client.chat_sync([{"role": "user", "content": "안녕"}]) == "echo: 안녕"
+    assert stub.requests[0]["messages"] == [{"role": "user", "content": "안녕"}]
+
+
+def test_async_chat_limits_concurrency(stub, monkeypatch):
+    stub.delay = 0.05
+    monkeypatch.setattr(llm_client_module.settings, "LLM_MAX_CONCURRENCY", 2)
+    client = llm_client_module.create_llm_client()
+
+    async def run():
+        return await asyncio.gather(*(client.chat([{"role": "user", "content": str(i)}]) for i in range(6)))
+
+    try:
+        assert asyncio.run(run()) == [f"echo: {i}" for i in range(6)]
+    finally:
+        client.close()
+    assert stub.max_in_flight <= 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork가 없는 플랫폼")
+def test_forked_child_recreates_the_loop(stub, client):
+    # 부모가 먼저 호출해 루프 스레드를 만든 뒤 fork해도 자식의 첫 호출이 멈추지 않아야 합니다
+    assert client.chat_sync([{"role": "user", "content": "parent"}]) == "echo: parent"
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        # 예전처럼 죽은 루프에 제출하면 영원히 기다리므로, 그 경우 자식을 종료시켜 테스트가 실패하게 합니다
+        signal.alarm(10)
+        try:
+            answer = client.chat_sync([{"role": "user", "content": "child"}], timeout=5)
+        except BaseException as e:
+            answer = f"error: {e!r}"
+        os.write(write_fd, answer.encode("utf-8"))
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        answer = pipe.read().decode("utf-8")
+    os.waitpid(pid, 0)
+    assert answer == "echo: child"
@@ -0,0 +1,84 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+
+from app.models.models import Base
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(url: str) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def columns(url: str, table: str) -> set:
+    engine = create_engine(url)
+    try:
+        return {column["name"] for column in inspect(engine).get_columns(table)}
+    finally:
+        engine.dispose()
+
+
+def test_upgrade_and_downgrade_round_trip(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = alembic_config(url)
+
+    command.upgrade(config, "head")
+    assert {"youtube_id", "updated_at"} <= columns(url, "videos")
+    assert {"text_hash", "model_version", "sentiment"} <= columns(url, "sentiment_cache")
+    assert {"sentiment_counts", "comments_refreshed_at"} <= columns(url, "videos")
+    assert {"comment_id", "video_id", "published_at", "sentiment"} <= columns(url, "comments")
+    assert {"content_hash", "size"} <= columns(url, "analysis")
+    assert {"noun_counts", "summarized_at"} <= columns(url, "videos")
+
+    command.downgrade(config, "base")
+    command.upgrade(config, "head")
+
+
+def test_existing_deployment_upgrades_from_baseline(tmp_path):
+    url = f"sqlite:///{tmp_path / 'existing.db'}"
+    config = alembic_config(url)
+
+    command.upgrade(config, "0001_baseline")
+    assert "youtube_id" not in columns(url, "videos")
+
+    command.upgrade(config, "head")
+    assert "youtube_id" in columns(url, "videos")
+
+
+def test_summarized_at_is_backfilled_from_existing_timestamps(tmp_path):
+    url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0006_video_noun_counts")
+    engine = create_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO videos (youtube_link, created_at, updated_at) VALUES "
+                "('https://youtu.be/a', '2026-01-01 00:00:00', '2026-02-01 00:00:00'), "
+                "('https://youtu.be/b', '2026-03-01 00:00:00', NULL)"
+            ))
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT youtube_link, summarized_at FROM videos ORDER BY youtube_link"))
+            assert [tuple(row) for row in rows] == [
+                ("https://youtu.be/a", "2026-02-01 00:00:00"), ("https://youtu.be/b", "2026-03-01 00:00:00"),
+            ]
+    finally:
+        engine.dispose()
+
+
+def test_migrations_match_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'parity.db'}"
+    command.upgrade(alembic_config(url), "head")
+
+    for table in Base.metadata.sorted_tables:
+        assert columns(url, table.name) == {column.name for column in table.columns}, table.name
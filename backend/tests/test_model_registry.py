@@ -0,0 +1,97 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from app.services.model_registry import WhisperModelRegistry
+
+
+class FakeWhisper(types.ModuleType):
+    """whisper 모듈 대역. 앞의 fail_first번 로드는 release될 때까지 기다렸다가 실패합니다."""
+
+    def __init__(self, fail_first=0):
+        super().__init__("whisper")
+        self.fail_first = fail_first
+        self.loads = 0
+        self.loading = threading.Event()
+        self.release = threading.Event()
+
+    def load_model(self, name, device=None):
+        self.loads += 1
+        if self.loads <= self.fail_first:
+            self.loading.set()
+            assert self.release.wait(10)
+            raise RuntimeError("모델 다운로드 실패")
+        return object()
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    def install(**kwargs):
+        module = FakeWhisper(**kwargs)
+        monkeypatch.setitem(sys.modules, "whisper", module)
+        return module
+    return install
+
+
+def test_models_are_loaded_once_and_reused(fake_whisper):
+    whisper = fake_whisper()
+    registry = WhisperModelRegistry(pool_size=1)
+
+    with registry.acquire("base") as first:
+        pass
+    with registry.acquire("base") as second:
+        pass
+
+    assert first is second
+    assert whisper.loads == 1
+    assert registry.metrics()["base"]["acquires"] == 2
+    assert registry.metrics()["base"]["idle"] == 1
+
+
+def test_waiter_loads_the_model_when_the_loading_thread_fails(fake_whisper):
+    whisper = fake_whisper(fail_first=1)
+    registry = WhisperModelRegistry(pool_size=1, wait_poll_seconds=0.05)
+    errors, models = [], []
+
+    def loader():
+        try:
+            with registry.acquire("base"):
+                pass
+        except RuntimeError as e:
+            errors.append(e)
+
+    def waiter():
+        with registry.acquire("base") as model:
+            models.append(model)
+
+    first = threading.Thread(target=loader)
+    first.start()
+    assert whisper.loading.wait(5)
+    second = threading.Thread(target=waiter)
+    second.start()
+
+    whisper.release.set()
+    first.join(5)
+    second.join(5)
+
+    assert not second.is_alive(), "로드 실패 후 대기 중인 스레드가 멈춰 있음"
+    assert [str(e) for e in errors] == ["모델 다운로드 실패"]
+    assert len(models) == 1
+    assert whisper.loads == 2
+    assert registry.metrics()["base"]["instances"] == 1
+
+
+def test_failed_load_frees_the_slot_for_the_next_acquire(fake_whisper):
+    whisper = fake_whisper(fail_first=1)
+    whisper.release.set()
+    registry = WhisperModelRegistry(pool_size=1)
+
+    with pytest.raises(RuntimeError):
+        with registry.acquire("base"):
+            pass
+    with registry.acquire("base") as model:
+        assert model is not None
+
+    assert whisper.loads == 2
@@ -0,0 +1,127 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.core.database import SessionLocal, run_read
+from app.models.models import Analysis, AnalysisType, Comment, SentimentCache, Video
+from app.services import pipeline
+from app.services.analysis_store import PNG_SIGNATURE, replace_analyses
+
+FAKE_PNG = PNG_SIGNATURE + b"fake-image"
+
+
+def test_analysis_type_is_stored_by_value_and_queryable_as_string():
+    db = SessionLocal()
+    try:
+        video = Video(youtube_link="https://youtu.be/abcdefghijk", youtube_id="abcdefghijk")
+        db.add(video)
+        db.flush()
+        replace_analyses(db, video.id, {"wordcloud": FAKE_PNG, "tree": FAKE_PNG})
+        db.commit()
+        video_id = video.id
+    finally:
+        db.close()
+
+    def load(db):
+        return [
+            row.analysis_type
+            for row in db.query(Analysis).filter(Analysis.video_id == video_id, Analysis.analysis_type == "tree")
+        ]
+
+    assert asyncio.run(run_read(load)) == [AnalysisType.TREE]
+
+
+@pytest.fixture
+def stub_stages(monkeypatch):
+    """느린 단계를 가짜로 바꾸고, 댓글 수집 중에 다른 세션이 DB에 쓸 수 있는지 기록합니다."""
+    observed = {}
+
+    def save_transcription(transcript, workspace):
+        with open(workspace.refined_text_path, "w", encoding="utf-8") as f:
+            f.write(transcript["text"])
+
+    class FakeSummarizer:
+        def generate(self, text, query, segments=None):
+            return "[간단 요약] a", "[핵심 내용] b", "[중요 포인트] c"
+
+    def fetch_new_comments(youtube_id, newest, known_ids, youtube=None, backend=None):
+        # 작업이 쓰기 트랜잭션을 열어 둔 상태라면 SQLite에서는 여기서 "database is locked"가 납니다
+        db = SessionLocal()
+        try:
+            db.add(SentimentCache(text_hash="h" * 64, model_version="test", sentiment="긍정"))
+            db.commit()
+            observed["concurrent_write"] = True
+        finally:
+            db.close()
+        return [{
+            "comment_id": "c1", "parent_id": None, "text": "좋아요", "likes": 3, "author": "a",
+            "published_at": "2025-01-01T00:00:00Z", "sentiment": "긍정",
+        }]
+
+    monkeypatch.setattr(pipeline.settings, "CAPTIONS_ENABLED", True)
+    monkeypatch.setattr(pipeline.settings, "EXTRACT_FRAMES", False)
+    monkeypatch.setattr(pipeline, "fetch_caption_transcript", lambda url, path: {"text": "요약 테스트", "segments": []})
+    monkeypatch.setattr(pipeline, "save_transcription", save_transcription)
+    monkeypatch.setattr(pipeline, "load_segments", lambda workspace: [])
+    monkeypatch.setattr(pipeline, "summarizer", FakeSummarizer)
+    monkeypatch.setattr(pipeline, "count_nouns", lambda text: Counter({"요약": 2, "테스트": 1}))
+    monkeypatch.setattr(pipeline, "fetch_new_comments", fetch_new_comments)
+    monkeypatch.setattr(pipeline, "render_charts", lambda tasks: {name: FAKE_PNG for name in tasks})
+    return observed
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_pipeline_writes_in_one_short_transaction(stub_stages, existing):
+    url = "https://www.youtube.com/watch?v=abcdefghijk"
+    if existing:
+        db = SessionLocal()
+        db.add(Video(youtube_link=url, youtube_id="abcdefghijk"))
+        db.commit()
+        db.close()
+
+    result = pipeline.run_summary_pipeline(url, "abcdefghijk")
+
+    assert stub_stages["concurrent_write"]
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == result["video_id"]).one()
+        assert video.simple_summary == "[간단 요약] a"
+        assert video.noun_counts == [["요약", 2], ["테스트", 1]]
+        assert video.sentiment_counts == {"긍정": 1}
+        assert db.query(Comment).filter(Comment.video_id == video.id).count() == 1
+        assert {row.analysis_type for row in video.analysis} == {
+            AnalysisType.WORDCLOUD, AnalysisType.TREE, AnalysisType.SENTIMENT,
+        }
+    finally:
+        db.close()
+
+
+def no_comments(youtube_id, newest, known_ids, youtube=None, backend=None):
+    return []
+
+
+def comments_disabled(youtube_id, newest, known_ids, youtube=None, backend=None):
+    raise RuntimeError("commentsDisabled")
+
+
+@pytest.mark.parametrize("fetch_new_comments", [no_comments, comments_disabled])
+def test_pipeline_saves_summary_without_comments(stub_stages, monkeypatch, fetch_new_comments):
+    monkeypatch.setattr(pipeline, "fetch_new_comments", fetch_new_comments)
+    rendered = []
+    monkeypatch.setattr(
+        pipeline, "render_charts", lambda tasks: rendered.extend(tasks) or {name: FAKE_PNG for name in tasks},
+    )
+
+    result = pipeline.run_summary_pipeline("https://youtu.be/abcdefghijk", "abcdefghijk")
+
+    assert sorted(rendered) == ["tree", "wordcloud"]
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == result["video_id"]).one()
+        assert video.core_summary == "[핵심 내용] b"
+        assert video.noun_counts == [["요약", 2], ["테스트", 1]]
+        assert video.sentiment_counts is None
+        assert {row.analysis_type for row in video.analysis} == {AnalysisType.WORDCLOUD, AnalysisType.TREE}
+    finally:
+        db.close()
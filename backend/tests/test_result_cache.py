@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api import endpoints
+from app.core.database import SessionLocal
+from app.models.models import Video
+from app.services import pipeline
+from app.services.comment_analyzer import get_video_id
+from app.services.jobs import JobManager
+from app.services.result_cache import get_or_reset_video, is_stale, lookup_cached_result
+
+TTL = 3600
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/watch?v=abcdefghijk",
+    "https://youtube.com/watch?v=abcdefghijk&t=42s&list=PL123",
+    "https://m.youtube.com/watch?feature=share&v=abcdefghijk",
+    "https://music.youtube.com/watch?v=abcdefghijk",
+    "https://youtu.be/abcdefghijk",
+    "https://youtu.be/abcdefghijk?si=tracking&t=10",
+    "https://www.youtube.com/shorts/abcdefghijk",
+    "https://www.youtube.com/shorts/abcdefghijk?feature=share",
+    "https://www.youtube.com/embed/abcdefghijk",
+    "https://www.youtube.com/live/abcdefghijk?si=x",
+    "https://www.youtube.com/v/abcdefghijk",
+    "  https://WWW.YOUTUBE.COM/watch?v=abcdefghijk  ",
+])
+def test_get_video_id_supported_forms(url):
+    assert get_video_id(url) == "abcdefghijk"
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    "https://example.com/watch?v=abcdefghijk",
+    "https://www.youtube.com/watch?v=short",
+    "https://www.youtube.com/watch?list=PL123",
+    "https://www.youtube.com/channel/abcdefghijk",
+    "https://youtu.be/",
+    "https://www.youtube.com/shorts/abcdefghij!",
+])
+def test_get_video_id_rejects_other_urls(url):
+    assert get_video_id(url) is None
+
+
+@pytest.mark.parametrize("ttl, age, stale", [
+    (TTL, timedelta(seconds=TTL - 1), False),
+    (TTL, timedelta(seconds=TTL + 1), True),
+    (0, timedelta(days=365), False),
+    (-1, timedelta(days=365), False),
+])
+def test_is_stale_compares_summary_age_with_ttl(ttl, age, stale):
+    video = Video(created_at=NOW - timedelta(days=400), summarized_at=NOW - age)
+
+    assert is_stale(video, ttl, now=NOW) is stale
+
+
+def test_is_stale_ignores_updated_at():
+    video = Video(summarized_at=NOW - timedelta(seconds=TTL + 1), updated_at=NOW)
+
+    assert is_stale(video, TTL, now=NOW)
+    assert is_stale(Video(updated_at=NOW), TTL, now=NOW)
+
+
+def add_video(youtube_id="abcdefghijk", age=timedelta(0)):
+    db = SessionLocal()
+    try:
+        video = Video(
+            youtube_link=f"https://youtu.be/{youtube_id}", youtube_id=youtube_id,
+            simple_summary="[간단 요약] a", core_summary="[핵심 내용] b", point_summary="[중요 포인트] c",
+            summarized_at=datetime.now() - age,
+        )
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+def lookup(youtube_id="abcdefghijk", ttl=TTL):
+    db = SessionLocal()
+    try:
+        video = lookup_cached_result(db, youtube_id, ttl)
+        return video.id if video is not None else None
+    finally:
+        db.close()
+
+
+def test_lookup_cached_result_honours_ttl():
+    fresh = add_video("aaaaaaaaaaa")
+    add_video("bbbbbbbbbbb", age=timedelta(seconds=TTL + 60))
+
+    assert lookup("aaaaaaaaaaa") == fresh
+    assert lookup("bbbbbbbbbbb") is None
+    assert lookup("bbbbbbbbbbb", ttl=0) is not None
+    assert lookup("ccccccccccc") is None
+
+
+def test_get_or_reset_video_restarts_the_ttl():
+    add_video(age=timedelta(seconds=TTL + 60))
+    db = SessionLocal()
+    try:
+        get_or_reset_video(db, "abcdefghijk", "https://youtu.be/abcdefghijk")
+        db.commit()
+    finally:
+        db.close()
+
+    assert lookup() is not None
+
+
+def test_comment_refresh_bumps_updated_at_but_not_the_ttl(monkeypatch):
+    video_id = add_video(age=timedelta(seconds=TTL + 60))
+    monkeypatch.setattr(pipeline, "fetch_new_comments", lambda youtube_id, newest, known_ids: [{
+        "comment_id": "c1", "parent_id": None, "text": "좋아요", "likes": 0, "author": "a",
+        "published_at": "2025-01-01T00:00:00Z", "sentiment": "긍정",
+    }])
+    monkeypatch.setattr(pipeline, "render_charts", lambda tasks: {name: None for name in tasks})
+
+    assert pipeline.run_comment_refresh(video_id)["new_comments"] == 1
+
+    db = SessionLocal()
+    try:
+        video = db.get(Video, video_id)
+        assert datetime.now() - video.updated_at < timedelta(seconds=60)
+        assert video.sentiment_counts == {"긍정": 1}
+    finally:
+        db.close()
+    assert lookup() is None
+
+
+class RecordingJobManager(JobManager):
+    """작업을 실행하지 않고 submit/complete 호출만 기록합니다."""
+
+    def __init__(self):
+        super().__init__()
+        self.submitted = []
+
+    def submit(self, url, youtube_id):
+        self.submitted.append(youtube_id)
+        return self.complete(url, youtube_id, {"cached": False})
+
+
+@pytest.mark.parametrize("force, age, cached", [
+    (False, timedelta(0), True),
+    (True, timedelta(0), False),
+    (False, timedelta(seconds=TTL + 60), False),
+])
+def test_post_jobs_uses_cache_unless_forced_or_stale(client, monkeypatch, force, age, cached):
+    monkeypatch.setattr(endpoints.settings, "RESULT_CACHE_TTL_SECONDS", TTL)
+    manager = RecordingJobManager()
+    monkeypatch.setattr(endpoints, "job_manager", manager)
+    video_id = add_video(age=age)
+
+    job = client.post("/jobs", json={"url": "https://youtu.be/abcdefghijk", "force": force}).json()
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["cached"] is cached
+    assert manager.submitted == ([] if cached else ["abcdefghijk"])
+    if cached:
+        assert job["result"]["video_id"] == video_id
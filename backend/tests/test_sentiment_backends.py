@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.services.comment_analyzer import SENTIMENT_FAILED
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys
+from app.services.sentiment_backends import LLMSentimentBackend, get_sentiment_backend
+assert isinstance(get_sentiment_backend().backend, LLMSentimentBackend)
+print(sorted(name for name in ("sklearn", "joblib", "pandas", "numpy") if name in sys.modules))
+"""
+
+
+def test_llm_backend_does_not_import_local_model_dependencies():
+    env = {**os.environ, "SENTIMENT_BACKEND": "llm", "SENTIMENT_CACHE_ENABLED": "true"}
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"
+
+
+TRAINING_ROWS = [
+    ("좋아요 최고예요", "긍정"), ("정말 좋아요", "긍정"), ("최고 최고", "긍정"), ("좋은 영상 감사합니다", "긍정"),
+    ("싫어요 최악", "부정"), ("정말 싫어요", "부정"), ("최악 최악", "부정"), ("별로고 싫네요", "부정"),
+    ("그냥 그래요", "중립"), ("보통이에요", "중립"), ("그냥 보통", "중립"), ("그저 그래요", "중립"),
+]
+
+
+@pytest.fixture
+def labeled_csv(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("sklearn")
+    rows = TRAINING_ROWS + [("학습에서 빠져야 하는 행", "분석 실패"), (None, "긍정")]
+    path = tmp_path / "labeled.csv"
+    pd.DataFrame(rows, columns=["text", "sentiment"]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_train_from_csv_save_and_load_round_trip(labeled_csv, tmp_path):
+    from app.services.sentiment_backends import LocalSentimentBackend
+
+    trained = LocalSentimentBackend.train_from_csv(labeled_csv)
+    assert sorted(trained.model.classes_) == ["긍정", "부정", "중립"]
+    texts = ["좋아요 최고", "싫어요 최악", "그냥 그래요"]
+    expected = trained.classify(texts)
+    assert expected == ["긍정", "부정", "중립"]
+
+    model_path = str(tmp_path / "models" / "sentiment.joblib")
+    trained.save(model_path)
+    loaded = LocalSentimentBackend.load(model_path)
+
+    assert loaded.classify(texts) == expected
+    assert loaded.version.startswith("local:") and loaded.version == LocalSentimentBackend.load(model_path).version
+    labels, confidences = loaded.predict_with_confidence(texts)
+    assert labels == expected
+    assert all(0 < confidence <= 1 for confidence in confidences)
+    assert loaded.predict_with_confidence([])[0] == []
+
+
+class FixedLocalBackend:
+    """정해진 라벨과 신뢰도를 돌려주는 로컬 모델 대역."""
+
+    version = "local:fixed"
+
+    def __init__(self, predictions):
+        self.predictions = predictions
+
+    def predict_with_confidence(self, texts):
+        np = pytest.importorskip("numpy")
+        labels, confidences = zip(*(self.predictions[text] for text in texts))
+        return list(labels), np.array(confidences)
+
+
+class RecordingBackend:
+    version = "llm:test"
+
+    def __init__(self, labels=None, error=None):
+        self.labels = labels or {}
+        self.error = error
+        self.calls = []
+
+    def classify(self, texts):
+        self.calls.append(list(texts))
+        if self.error:
+            raise self.error
+        return [self.labels.get(text, SENTIMENT_FAILED) for text in texts]
+
+
+LOCAL_PREDICTIONS = {"확실한 칭찬": ("긍정", 0.95), "애매한 말": ("긍정", 0.4), "애매한 불만": ("중립", 0.55)}
+
+
+def test_hybrid_sends_only_low_confidence_comments_to_the_fallback():
+    from app.services.sentiment_backends import HybridSentimentBackend
+
+    fallback = RecordingBackend({"애매한 말": "중립"})
+    hybrid = HybridSentimentBackend(FixedLocalBackend(LOCAL_PREDICTIONS), fallback, threshold=0.6)
+
+    labels = hybrid.classify(["확실한 칭찬", "애매한 말", "애매한 불만"])
+
+    assert fallback.calls == [["애매한 말", "애매한 불만"]]
+    # LLM이 '분석 실패'로 답한 댓글은 로컬 예측을 유지합니다
+    assert labels == ["긍정", "중립", "중립"]
+    assert hybrid.version == "hybrid:local:fixed:llm:test:0.6"
+
+
+def test_hybrid_keeps_local_predictions_when_fallback_fails():
+    from app.services.sentiment_backends import HybridSentimentBackend
+
+    fallback = RecordingBackend(error=RuntimeError("LLM down"))
+    hybrid = HybridSentimentBackend(FixedLocalBackend(LOCAL_PREDICTIONS), fallback, threshold=0.6)
+
+    assert hybrid.classify(["확실한 칭찬", "애매한 말"]) == ["긍정", "긍정"]
+    assert HybridSentimentBackend(FixedLocalBackend(LOCAL_PREDICTIONS), fallback, 0.3).classify(["애매한 말"]) == ["긍정"]
+    assert len(fallback.calls) == 1
+
+
+@pytest.fixture
+def fresh_backend(monkeypatch):
+    from app.services import sentiment_backends
+
+    monkeypatch.setattr(sentiment_backends, "_backend", None)
+    monkeypatch.setattr(sentiment_backends.settings, "SENTIMENT_CACHE_ENABLED", False)
+    return sentiment_backends
+
+
+@pytest.mark.parametrize("kind", ["local", "hybrid"])
+def test_missing_model_falls_back_to_llm(fresh_backend, monkeypatch, tmp_path, kind):
+    monkeypatch.setattr(fresh_backend.settings, "SENTIMENT_BACKEND", kind)
+    monkeypatch.setattr(fresh_backend.settings, "SENTIMENT_MODEL_PATH", str(tmp_path / "missing.joblib"))
+
+    backend = fresh_backend.get_sentiment_backend()
+
+    assert isinstance(backend, fresh_backend.LLMSentimentBackend)
+    assert fresh_backend.get_sentiment_backend() is backend
+
+
+@pytest.mark.parametrize("kind", ["local", "hybrid"])
+def test_saved_model_is_used_for_local_and_hybrid(fresh_backend, monkeypatch, tmp_path, labeled_csv, kind):
+    model_path = str(tmp_path / "sentiment.joblib")
+    fresh_backend.LocalSentimentBackend.train_from_csv(labeled_csv).save(model_path)
+    monkeypatch.setattr(fresh_backend.settings, "SENTIMENT_BACKEND", kind)
+    monkeypatch.setattr(fresh_backend.settings, "SENTIMENT_MODEL_PATH", model_path)
+
+    backend = fresh_backend.get_sentiment_backend()
+
+    expected = fresh_backend.LocalSentimentBackend if kind == "local" else fresh_backend.HybridSentimentBackend
+    assert isinstance(backend, expected)
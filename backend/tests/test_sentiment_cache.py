@@ -0,0 +1,122 @@
+from app.core.database import SessionLocal
+from app.models.models import SentimentCache
+from app.services.comment_analyzer import SENTIMENT_FAILED
+from app.services.sentiment_backends import CachedSentimentBackend, SentimentBackend
+from app.services.sentiment_cache import SentimentResultCache, comment_hash, normalize_comment
+
+VERSION = "llm:test"
+
+
+class RecordingBackend(SentimentBackend):
+    """분류 요청을 기록하고 정해진 라벨을 돌려주는 백엔드 대역. 없는 댓글은 '분석 실패'로 답합니다."""
+
+    name = "recording"
+    version = VERSION
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.calls = []
+
+    def classify(self, texts):
+        self.calls.append(list(texts))
+        return [self.labels.get(text, SENTIMENT_FAILED) for text in texts]
+
+
+def stored_rows():
+    db = SessionLocal()
+    try:
+        return {
+            (row.text_hash, row.model_version): row.sentiment for row in db.query(SentimentCache).all()
+        }
+    finally:
+        db.close()
+
+
+def test_normalization_ignores_width_case_and_whitespace():
+    assert normalize_comment("  ＡＢＣ   좋아요\n\t최고 ") == "abc 좋아요 최고"
+    assert comment_hash("좋아요  최고") == comment_hash(" 좋아요 최고\n") == comment_hash("좋아요　최고")
+    assert comment_hash("좋아요 최고") != comment_hash("좋아요최고")
+
+
+def test_memory_hit_then_db_hit_after_restart():
+    cache = SentimentResultCache()
+    cache.put_many({"h1": "긍정", "h2": "부정"}, VERSION)
+
+    assert cache.get_many(["h1", "h2", "h3"], VERSION) == {"h1": "긍정", "h2": "부정"}
+    assert cache.stats() == {"entries": 2, "memory_hits": 2, "db_hits": 0, "misses": 1, "hit_rate": 0.6667}
+
+    # 새 프로세스처럼 LRU가 빈 캐시는 DB에서 찾고, 찾은 값을 LRU에 올립니다
+    restarted = SentimentResultCache()
+    assert restarted.get_many(["h1", "h3"], VERSION) == {"h1": "긍정"}
+    assert restarted.get_many(["h1"], VERSION) == {"h1": "긍정"}
+    assert restarted.stats() == {"entries": 1, "memory_hits": 1, "db_hits": 1, "misses": 1, "hit_rate": 0.6667}
+
+
+def test_versions_do_not_share_entries():
+    cache = SentimentResultCache()
+    cache.put_many({"h1": "긍정"}, VERSION)
+
+    assert cache.get_many(["h1"], "llm:other") == {}
+    assert SentimentResultCache().get_many(["h1"], "llm:other") == {}
+
+
+def test_lru_evicts_oldest_entry_but_db_still_answers():
+    cache = SentimentResultCache(max_entries=2)
+    cache.put_many({"h1": "긍정"}, VERSION)
+    cache.put_many({"h2": "부정"}, VERSION)
+    cache.get_many(["h1"], VERSION)
+    cache.put_many({"h3": "중립"}, VERSION)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get_many(["h2"], VERSION) == {"h2": "부정"}
+    assert cache.stats()["db_hits"] == 1
+
+
+def test_put_many_skips_rows_already_stored():
+    SentimentResultCache().put_many({"h1": "긍정"}, VERSION)
+    SentimentResultCache().put_many({"h1": "긍정", "h2": "부정"}, VERSION)
+
+    assert stored_rows() == {("h1", VERSION): "긍정", ("h2", VERSION): "부정"}
+
+
+def test_cached_backend_classifies_normalized_duplicates_once():
+    backend = RecordingBackend({"좋아요 최고": "긍정", "별로": "부정"})
+    cached = CachedSentimentBackend(backend, SentimentResultCache())
+
+    labels = cached.classify(["좋아요 최고", " 좋아요   최고 ", "별로", "좋아요\u3000최고"])
+
+    assert labels == ["긍정", "긍정", "부정", "긍정"]
+    assert backend.calls == [["좋아요 최고", "별로"]]
+    assert cached.name == "cached-recording" and cached.version == VERSION
+
+
+def test_cached_backend_serves_repeat_requests_from_cache():
+    backend = RecordingBackend({"좋아요": "긍정", "별로": "부정"})
+    cache = SentimentResultCache()
+    cached = CachedSentimentBackend(backend, cache)
+
+    cached.classify(["좋아요", "별로"])
+    assert cached.classify(["별로", "좋아요", "새 댓글"]) == ["부정", "긍정", SENTIMENT_FAILED]
+
+    assert backend.calls == [["좋아요", "별로"], ["새 댓글"]]
+    assert cache.stats()["memory_hits"] == 2
+
+    # 다른 프로세스의 캐시도 DB를 통해 같은 결과를 씁니다
+    other = RecordingBackend({})
+    assert CachedSentimentBackend(other, SentimentResultCache()).classify(["좋아요"]) == ["긍정"]
+    assert other.calls == []
+
+
+def test_failed_results_are_never_cached():
+    backend = RecordingBackend({"좋아요": "긍정"})
+    cache = SentimentResultCache()
+    cached = CachedSentimentBackend(backend, cache)
+
+    assert cached.classify(["좋아요", "실패할 댓글"]) == ["긍정", SENTIMENT_FAILED]
+    assert stored_rows() == {(comment_hash("좋아요"), VERSION): "긍정"}
+    assert cache.stats()["entries"] == 1
+
+    # '분석 실패'였던 댓글은 다음 요청에서 다시 분류됩니다
+    backend.labels["실패할 댓글"] = "부정"
+    assert cached.classify(["실패할 댓글"]) == ["부정"]
+    assert backend.calls == [["좋아요", "실패할 댓글"], ["실패할 댓글"]]
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.services import summarize
+from app.services.summarize import CHUNK_QUERY, REDUCE_PREFIX, chunk_segments, split_sentences, summarizer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERY = "요약하세요"
+RESPONSE = "[간단 요약] 짧게 [핵심 내용] 핵심 [중요 포인트] 포인트"
+
+
+class StubLLMClient:
+    """LLMClient 대신 요청을 기록하고 정해진 응답을 돌려주는 클라이언트."""
+
+    def __init__(self, reply=RESPONSE, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _respond(self, messages):
+        self.requests.append(messages)
+        return self.reply(messages) if callable(self.reply) else self.reply
+
+    def chat_sync(self, messages, **kwargs):
+        return self._respond(messages)
+
+    async def chat(self, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._respond(messages)
+        finally:
+            self.in_flight -= 1
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def byte_token_count(monkeypatch):
+    # tiktoken 설치 여부와 관계없이 같은 결과가 나오도록 바이트 수 근사를 씁니다
+    monkeypatch.setattr(summarize, "get_encoding", lambda: None)
+
+
+def test_count_tokens_falls_back_to_byte_estimate():
+    assert summarize.count_tokens("가나다") == 4
+    assert summarize.count_tokens("") == 1
+
+
+def test_importing_summarize_does_not_load_tiktoken():
+    completed = subprocess.run(
+        [sys.executable, "-c", "import sys, app.services.summarize; print('tiktoken' in sys.modules)"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "False"
+
+
+def test_split_sentences():
+    assert split_sentences("첫 문장입니다. 둘째 문장? 셋째!\n넷째") == [
+        {"text": "첫 문장입니다."}, {"text": "둘째 문장?"}, {"text": "셋째!"}, {"text": "넷째"},
+    ]
+
+
+def test_chunk_segments_respects_token_budget():
+    segments = [{"text": "가" * 9}, {"text": " "}, {"text": "나" * 9}, {"text": "다" * 30}, {"text": "라"}]
+
+    # 가*9, 나*9 는 각각 10토큰, 다*30 은 31토큰, 라는 2토큰
+    assert chunk_segments(segments, max_tokens=20) == ["가" * 9 + " " + "나" * 9, "다" * 30, "라"]
+
+
+def test_generate_short_text_makes_one_request(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 1000)
+    client = StubLLMClient()
+
+    simple, core, point = summarizer(client=client).generate("짧은 스크립트", QUERY)
+
+    assert (simple, core, point) == ("[간단 요약] 짧게 ", "[핵심 내용] 핵심 ", "[중요 포인트] 포인트")
+    assert len(client.requests) == 1
+    system, user = client.requests[0]
+    assert system == {"role": "system", "content": QUERY}
+    assert user["content"].strip() == "짧은 스크립트"
+
+
+def test_generate_reports_missing_sections(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 1000)
+
+    _, core, point = summarizer(client=StubLLMClient(reply="[간단 요약] 만")).generate("짧은 스크립트", QUERY)
+
+    assert core == "[핵심 내용] 없음"
+    assert point == "[중요 포인트] 없음"
+
+
+def test_generate_long_text_map_reduces_segments_concurrently(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 20)
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CONCURRENCY", 2)
+
+    def reply(messages):
+        if messages[0]["content"] == CHUNK_QUERY:
+            return f"부분 요약 {messages[1]['content'].strip()[0]}"
+        return RESPONSE
+
+    client = StubLLMClient(reply=reply, delay=0.05)
+    segments = [{"text": character * 15} for character in "가나다라"]
+    text = " ".join(segment["text"] for segment in segments)
+
+    simple, _, _ = summarizer(client=client).generate(text, QUERY, segments=segments)
+
+    assert simple == "[간단 요약] 짧게 "
+    chunk_requests, reduce_request = client.requests[:-1], client.requests[-1]
+    assert sorted(request[1]["content"].strip() for request in chunk_requests) == [
+        segment["text"] for segment in segments
+    ]
+    assert client.max_in_flight == 2
+    assert reduce_request[0]["content"] == QUERY
+    assert reduce_request[1]["content"].strip() == REDUCE_PREFIX + "\n\n".join(
+        f"[구간 {i + 1}]\n부분 요약 {character}" for i, character in enumerate("가나다라")
+    )
+
+
+def test_generate_without_segments_chunks_by_sentence(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 20)
+    client = StubLLMClient()
+    text = ("가" * 15 + ". ") * 3
+
+    summarizer(client=client).generate(text, QUERY)
+
+    assert [request[1]["content"].strip() for request in client.requests[:-1]] == ["가" * 15 + "."] * 3
+
+
+def test_refine_corrects_each_chunk_separately(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 20)
+    client = StubLLMClient(reply=lambda messages: "교정 " + messages[1]["content"].strip()[0])
+    segments = [{"text": character * 15} for character in "가나다"]
+
+    refined = summarizer(client=client).refine("", segments)
+
+    assert refined == ["교정 가", "교정 나", "교정 다"]
+    assert all(request[0]["content"] == summarize.REFINE_QUERY for request in client.requests)
+    assert sorted(request[1]["content"].strip() for request in client.requests) == [
+        segment["text"] for segment in segments
+    ]
+
+
+def test_refine_short_text_makes_one_request(monkeypatch):
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 1000)
+    client = StubLLMClient(reply="교정된 문장.")
+
+    assert summarizer(client=client).refine("교정 전 문장. 두번째 문장.") == ["교정된 문장."]
+    assert len(client.requests) == 1
+    assert summarizer(client=client).refine("   ") == []
+
+
+def test_save_transcription_writes_refined_chunks_per_line(monkeypatch, tmp_path):
+    from app.services import audio2text
+    from app.utils.workspace import JobWorkspace
+
+    monkeypatch.setattr(summarize.settings, "SUMMARY_CHUNK_TOKENS", 20)
+    client = StubLLMClient(reply=lambda messages: f" 교정 {messages[1]['content'].strip()[0]}\n")
+    monkeypatch.setattr(audio2text, "summarizer", lambda: summarizer(client=client))
+    segments = [{"id": i, "start": i, "end": i + 1, "text": character * 15} for i, character in enumerate("가나")]
+    workspace = JobWorkspace(root=str(tmp_path), keep=True)
+
+    audio2text.save_transcription({"text": "가" * 15 + " " + "나" * 15, "segments": segments}, workspace)
+
+    with open(workspace.refined_text_path, encoding="utf-8") as f:
+        assert f.read() == "교정 가\n교정 나"
+    assert [segment["text"] for segment in audio2text.load_segments(workspace)] == ["가" * 15, "나" * 15]
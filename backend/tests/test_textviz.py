@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+import pytest
+
+from app.services import TextViz
+from app.services.TextViz import count_nouns, iter_texts
+
+Token = namedtuple("Token", "form tag")
+
+
+class FakeKiwi:
+    """입력 문자열마다 미리 정한 형태소를 돌려주고, tokenize에 넘어온 입력을 기록합니다."""
+
+    def __init__(self, analyses):
+        self.analyses = analyses
+        self.calls = []
+
+    def tokenize(self, texts, stopwords=None):
+        assert not isinstance(texts, str)
+        texts = list(texts)
+        self.calls.append(texts)
+        return iter([self.analyses[text] for text in texts])
+
+    def split_into_sents(self, text):
+        raise AssertionError("count_nouns는 별도의 문장 분리 패스를 거치지 않아야 합니다")
+
+
+@pytest.fixture
+def kiwi(monkeypatch):
+    fake = FakeKiwi({
+        "강과 산이 있다": [Token("강", "NNG"), Token("과", "JC"), Token("산", "NNG"), Token("있", "VA")],
+        "서울의 강": [Token("서울", "NNP"), Token("의", "JKG"), Token("강", "NNG")],
+    })
+    monkeypatch.setattr(TextViz, "get_kiwi", lambda: fake)
+    monkeypatch.setattr(TextViz, "get_stopwords", lambda: None)
+    return fake
+
+
+def test_iter_texts_splits_text_by_line_and_segments_by_item():
+    assert list(iter_texts(" 첫 줄\n\n둘째 줄 \r\n")) == ["첫 줄", "둘째 줄"]
+    assert list(iter_texts([{"text": "하나"}, {"text": " "}, "둘", {"text": 3}])) == ["하나", "둘", "3"]
+
+
+def test_count_nouns_keeps_single_syllable_nouns(kiwi):
+    assert count_nouns("강과 산이 있다\n서울의 강") == {"강": 2, "산": 1, "서울": 1}
+
+
+def test_count_nouns_tokenizes_segments_in_one_batch(kiwi):
+    counts = count_nouns([{"text": "강과 산이 있다"}, {"text": "서울의 강"}])
+
+    assert counts == {"강": 2, "산": 1, "서울": 1}
+    assert kiwi.calls == [["강과 산이 있다", "서울의 강"]]
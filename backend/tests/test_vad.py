@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from app.services.audio2text import stitch_segments
+from app.services.vad import split_on_silence
+
+SAMPLE_RATE = 1000
+FRAME = 30  # frame_ms=30 에서 프레임 하나의 샘플 수
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 50 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def audio(*parts):
+    """('tone', 초) / ('silence', 초) 조각을 이어 붙인 오디오."""
+    return np.concatenate([tone(seconds) if kind == "tone" else silence(seconds) for kind, seconds in parts])
+
+
+def assert_contiguous(chunks, total):
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == total
+    assert all(end == next_start for (_, end), (next_start, _) in zip(chunks, chunks[1:]))
+
+
+def test_empty_audio_has_no_chunks():
+    assert split_on_silence(np.zeros(0, dtype=np.float32), SAMPLE_RATE) == []
+
+
+def test_cuts_in_the_middle_of_silences_after_target_length():
+    samples = audio(("tone", 45), ("silence", 1), ("tone", 45), ("silence", 1), ("tone", 45))
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, target_chunk_seconds=40, max_chunk_seconds=120)
+
+    assert_contiguous(chunks, len(samples))
+    assert len(chunks) == 3
+    assert chunks[0][1] == pytest.approx(45_500, abs=FRAME)
+    assert chunks[1][1] == pytest.approx(91_500, abs=FRAME)
+
+
+def test_silence_before_target_length_is_not_a_cut():
+    samples = audio(("tone", 20), ("silence", 1), ("tone", 30))
+
+    assert split_on_silence(samples, SAMPLE_RATE, target_chunk_seconds=40) == [(0, len(samples))]
+
+
+def test_short_trailing_silence_is_not_its_own_chunk():
+    samples = audio(("tone", 45), ("silence", 1), ("tone", 45), ("silence", 0.5))
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, target_chunk_seconds=40, min_chunk_seconds=5)
+
+    assert_contiguous(chunks, len(samples))
+    assert len(chunks) == 2
+    assert chunks[-1][1] - chunks[-1][0] > 45 * SAMPLE_RATE
+
+
+def test_forces_cuts_at_max_length_without_silence():
+    samples = tone(250)
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, max_chunk_seconds=120, min_chunk_seconds=5)
+
+    assert chunks == [(0, 120_000), (120_000, 240_000), (240_000, 250_000)]
+
+
+def test_short_tail_after_forced_cut_merges_into_previous_chunk():
+    samples = tone(242)
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, max_chunk_seconds=120, min_chunk_seconds=5)
+
+    assert chunks == [(0, 120_000), (120_000, 242_000)]
+
+
+def test_stitch_segments_offsets_times_and_renumbers_ids():
+    results = [
+        {"text": " 첫 청크 ", "language": "ko", "segments": [
+            {"id": 0, "start": 0.0, "end": 2.0, "text": "첫"},
+            {"id": 1, "start": 2.0, "end": 4.0, "text": "청크"},
+        ]},
+        {"text": "", "language": "ko", "segments": []},
+        {"text": "둘째 청크", "language": "en", "segments": [
+            {"id": 0, "start": 1.0, "end": 3.5, "text": "둘째 청크", "avg_logprob": -0.2},
+        ]},
+    ]
+
+    stitched = stitch_segments(results, [0.0, 45.5, 91.5])
+
+    assert stitched["text"] == "첫 청크 둘째 청크"
+    assert stitched["language"] == "ko"
+    assert stitched["segments"] == [
+        {"id": 0, "start": 0.0, "end": 2.0, "text": "첫"},
+        {"id": 1, "start": 2.0, "end": 4.0, "text": "청크"},
+        {"id": 2, "start": 92.5, "end": 95.0, "text": "둘째 청크", "avg_logprob": -0.2},
+    ]
+
+
+def test_stitch_segments_of_nothing():
+    assert stitch_segments([], []) == {"text": "", "segments": [], "language": None}
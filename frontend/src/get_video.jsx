@@ -9,6 +9,7 @@ function GetVideo() {
   const [simpleSummary, setSimpleSummary] = useState("");
   const [coreSummary, setCoreSummary] = useState("");
   const [pointSummary, setPointSummary] = useState("");
+  const [resultId, setResultId] = useState(null); // 백엔드 Video.id (/summarize 응답의 video_id)
   const [loading, setLoading] = useState(true);
   const [processing, setProcessing] = useState(false);
   const [error, setError] = useState(null);
@@ -86,6 +87,7 @@ function GetVideo() {
       }
 
       setSimpleSummary(data.simple);
+      setResultId(data.video_id);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -118,7 +120,10 @@ function GetVideo() {
               className="youtube-thumbnail"
             />
           )}
-          <div className="action-container" onClick={() => navigate("/more")}>
+          <div
+            className="action-container"
+            onClick={() => resultId && navigate(`/more?video=${resultId}`)}
+          >
             <img src="src\image3.png" alt="자세히 보러가기" className="action-image" />
             <span className="action-text">자세히 보러가기</span>
           </div>
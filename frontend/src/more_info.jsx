@@ -1,21 +1,19 @@
-import React, { useState } from "react";
-import { Link } from "react-router-dom";
+import React, { useEffect, useState } from "react";
+import { Link, useLocation } from "react-router-dom";
 import "./more_info.css";
 
 const Moreinfo = () => {
+  const location = useLocation();
   const [activeTab, setActiveTab] = useState("간단 요약");
   const [activeMenuItem, setActiveMenuItem] = useState("Summary");
   const [showTab, setShowTab] = useState(true);
-  const [wordCloudImg, setWordCloudImg] = useState(null);
-  const [simpleText, setSimpleText] = useState("");
-  const [coreText, setCoreText] = useState("");
-  const [pointText, setPointText] = useState("");
-  const [treeImg, setTreeImg] = useState(null);
-  const [responseImg, setResponseImg] = useState(null);
+  const [bundle, setBundle] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
 
   const BACKEND_URL = "http://localhost:8000";
+  // /summarize 응답의 video_id (get_video에서 ?video=<id>로 넘겨줌)
+  const videoDbId = new URLSearchParams(location.search).get("video");
 
   const handleTabClick = (tabName) => {
     setActiveTab(tabName);
@@ -46,39 +44,21 @@ const Moreinfo = () => {
     }
   };
 
+  // 탭마다 따로 요청하지 않고, 요약 3종과 이미지 URL을 한 번에 받아 옵니다
   useEffect(() => {
-    const fetchData = async () => {
+    if (!videoDbId) {
+      setError("영상 정보가 없습니다. 먼저 영상을 요약해 주세요.");
+      return;
+    }
+
+    const fetchBundle = async () => {
       setLoading(true);
       setError(null);
 
       try {
-        let response;
-        if (activeMenuItem === "Response") {
-          response = await fetch(`${BACKEND_URL}/more/sentiment`);
-        } else {
-          const endpoints = {
-            "간단 요약": "/summary/simple",
-            "핵심 내용": "/summary/core",
-            "중요 포인트": "/summary/point",
-            "키워드 클라우드": "/more/wordcloud",
-            "트리맵": "/more/tree",
-          };
-          response = await fetch(`${BACKEND_URL}${endpoints[activeTab]}`);
-        }
-
-        if (!response.ok) throw new Error(`Failed to fetch ${activeTab}`);
-
-        if (activeTab === "키워드 클라우드" || activeTab === "트리맵" || activeMenuItem === "Response") {
-          const blob = await response.blob();
-          if (activeTab === "키워드 클라우드") setWordCloudImg(blob);
-          else if (activeTab === "트리맵") setTreeImg(blob);
-          else if (activeMenuItem === "Response") setResponseImg(blob);
-        } else {
-          const text = await response.text();
-          if (activeTab === "간단 요약") setSimpleText(text);
-          else if (activeTab === "핵심 내용") setCoreText(text);
-          else if (activeTab === "중요 포인트") setPointText(text);
-        }
+        const response = await fetch(`${BACKEND_URL}/videos/${videoDbId}/bundle`);
+        if (!response.ok) throw new Error("Failed to fetch video results");
+        setBundle(await response.json());
       } catch (err) {
         console.error(err);
         setError(err.message);
@@ -87,30 +67,18 @@ const Moreinfo = () => {
       }
     };
 
-    fetchData();
-  }, [activeTab, activeMenuItem]);
+    fetchBundle();
+  }, [videoDbId]);
+
+  const summaries = bundle ? bundle.summaries : {};
 
-  const renderImage = (imageData) => {
-    if (!imageData) return null;
-    const url = URL.createObjectURL(blob);
-    // useEffect(() => {
-    //   return () => URL.revokeObjectURL(url);
-    // }, [blob]);
-    // return (
-    //   <img
-    //     src={url}
-    //     alt="Rendered"
-    //     style={{
-    //       maxWidth: "100%",
-    //       maxHeight: "100%",
-    //       display: "block",
-    //       margin: "0 auto",
-    //     }}
-    //   />
-    // );
+  const renderImage = (analysisType) => {
+    const analysis = bundle && bundle.analysis[analysisType];
+    if (!analysis) return null;
+    // ?v=<content hash>가 붙은 URL이라 브라우저가 그대로 캐시합니다
     return (
       <img
-          src={`data:image/png;base64,${imageData}`}
+          src={`${BACKEND_URL}${analysis.url}`}
           alt="Rendered"
           style={{
               maxWidth: "100%",
@@ -161,18 +129,18 @@ const Moreinfo = () => {
           {loading && <div className="loading">Loading...</div>}
           {error && <div className="error">{error}</div>}
           {activeTab === "간단 요약" && !loading && !error && (
-            <div className="simple-text">{simpleText}</div>
+            <div className="simple-text">{summaries.simple}</div>
             
           )}
           {activeTab === "핵심 내용" && !loading && !error && (
-            <div className="core-text">{coreText}</div>
+            <div className="core-text">{summaries.core}</div>
           )}
           {activeTab === "중요 포인트" && !loading && !error && (
-            <div className="point-text">{pointText}</div>
+            <div className="point-text">{summaries.point}</div>
           )}
-          {activeTab === "키워드 클라우드" && renderImageFromBlob(wordCloudImg)}
-          {activeTab === "트리맵" && renderImageFromBlob(treeImg)}
-          {activeMenuItem === "Response" && renderImageFromBlob(responseImg)}
+          {activeMenuItem === "Infographic" && activeTab === "키워드 클라우드" && renderImage("wordcloud")}
+          {activeMenuItem === "Infographic" && activeTab === "트리 다이어그램" && renderImage("tree")}
+          {activeMenuItem === "Response" && renderImage("sentiment")}
         </div>
       </div>
     </div>